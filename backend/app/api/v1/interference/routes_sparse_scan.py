@@ -13,8 +13,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_async_session
 from app.domains.simulation.services.sionna_service import generate_iss_map
 from app.core.config import ISS_MAP_IMAGE_PATH
-from app.domains.coordinates.services.coordinate_service import CoordinateService
-from app.domains.coordinates.models.coordinate_model import CartesianCoordinate, GeoCoordinate
+from app.domains.coordinates.services.coordinate_service import (
+    CoordinateService,
+    frontend_coords_to_gps,
+)
+from app.domains.coordinates.models.coordinate_model import CartesianCoordinate
 
 logger = logging.getLogger(__name__)
 
@@ -24,54 +27,6 @@ router = APIRouter(prefix="/interference", tags=["Sparse ISS Sampling"])
 # 座標轉換服務實例
 coordinate_service = CoordinateService()
 
-def frontend_coords_to_gps(x_m: float, y_m: float, z_m: float = 0.0, scene: str = "potou") -> GeoCoordinate:
-    """
-    將前端座標系統轉換為GPS座標，支持不同場景
-    
-    支援的場景：
-    - potou: 破斗山場景
-    - poto: 坡頭漁港場景
-    """
-    from app.domains.coordinates.services.coordinate_service import (
-        ORIGIN_LATITUDE_POTOU, ORIGIN_LONGITUDE_POTOU,
-        ORIGIN_FRONTEND_X_POTOU, ORIGIN_FRONTEND_Y_POTOU,
-        LATITUDE_SCALE_PER_METER_Y, LONGITUDE_SCALE_PER_METER_X,
-        ORIGIN_LATITUDE_POTO, ORIGIN_LONGITUDE_POTO,
-        ORIGIN_FRONTEND_X_POTO, ORIGIN_FRONTEND_Y_POTO,
-        LATITUDE_SCALE_PER_METER_Y_POTO, LONGITUDE_SCALE_PER_METER_X_POTO
-    )
-    
-    # 根據場景選擇對應的參數
-    if scene.lower() == "poto":
-        origin_lat = ORIGIN_LATITUDE_POTO
-        origin_lon = ORIGIN_LONGITUDE_POTO
-        origin_x = ORIGIN_FRONTEND_X_POTO
-        origin_y = ORIGIN_FRONTEND_Y_POTO
-        lat_scale = LATITUDE_SCALE_PER_METER_Y_POTO
-        lon_scale = LONGITUDE_SCALE_PER_METER_X_POTO
-    else:  # 默認使用potou參數
-        origin_lat = ORIGIN_LATITUDE_POTOU
-        origin_lon = ORIGIN_LONGITUDE_POTOU
-        origin_x = ORIGIN_FRONTEND_X_POTOU
-        origin_y = ORIGIN_FRONTEND_Y_POTOU
-        lat_scale = LATITUDE_SCALE_PER_METER_Y
-        lon_scale = LONGITUDE_SCALE_PER_METER_X
-    
-    # 計算相對於基準點的偏移（前端座標米為單位）
-    delta_x = x_m - origin_x  # 相對於基準點的X偏移
-    delta_y = y_m - origin_y  # 相對於基準點的Y偏移
-    
-    # 轉換為GPS座標
-    latitude = origin_lat + (delta_y * lat_scale)
-    longitude = origin_lon + (delta_x * lon_scale)
-    
-    return GeoCoordinate(
-        latitude=latitude,
-        longitude=longitude,
-        altitude=z_m if z_m > 0.1 else None
-    )
-
-
 def snake_indices(h: int, w: int, step_y: int = 4, step_x: int = 4):
     """Generate snake-path indices for sparse sampling"""
     for y in range(0, h, step_y):
@@ -26,6 +26,18 @@ if not DATABASE_URL.startswith("postgresql+asyncpg"):
         f"DATABASE_URL does not start with 'postgresql+asyncpg://'. Received: {DATABASE_URL}. Ensure it's correctly configured for async."
     )
 
+# --- Database Pool Configuration ---
+# SQLAlchemy async engine 連線池參數 (每個 worker 行程各自一個連線池)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "15"))  # 尖峰時最多 pool_size + max_overflow 條連線
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_COMMAND_TIMEOUT = float(os.getenv("DB_COMMAND_TIMEOUT", "30"))
+
+# --- Static File Cache ---
+# /rendered_images 記憶體快取容量 (MiB)；每個 worker 行程各自一份，總用量隨 worker 數倍增
+STATIC_CACHE_MAX_BYTES = int(os.getenv("STATIC_CACHE_MAX_MB", "64")) * 1024 * 1024
+
 # --- Path Configuration (using pathlib) ---
 # 在容器內，/app 就是 backend 目錄的根
 # config.py 位於 /app/app/core
@@ -97,6 +109,11 @@ logger.info(f"TSS Map Image Path (in container): {TSS_MAP_IMAGE_PATH}")
 UAV_SPARSE_MAP_IMAGE_PATH = OUTPUT_DIR / "uav_sparse_map.png"  # UAV Sparse 地圖路徑
 logger.info(f"UAV Sparse Map Image Path (in container): {UAV_SPARSE_MAP_IMAGE_PATH}")
 
+# 計算結果快取目錄 (ISS 地圖等，跨程序重啟保留)
+CACHE_DIR = APP_DIR / "cache"
+ISS_CACHE_DIR = CACHE_DIR / "iss"  # 目錄在 lifespan 啟動時由 ensure_static_dirs 建立
+logger.info(f"ISS Cache Directory (in container): {ISS_CACHE_DIR}")
+
 # logger.info(f"Project Root (estimated): {PROJECT_ROOT}") # 不再需要
 logger.info(f"Static Directory (in container): {STATIC_DIR}")
 logger.info(f"Models Directory (in container): {MODELS_DIR}")
@@ -0,0 +1,97 @@
+"""
+輕量 CORS ASGI 中介層
+允許的來源與回應標頭在建立時預先編碼，每個請求只做一次集合查詢
+"""
+
+from typing import Iterable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CORS_ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+CORS_MAX_AGE = b"600"
+
+
+class FastCORS:
+    """允許固定來源清單、帶憑證、任意方法與標頭的 CORS 中介層
+
+    行為對應原先的 CORSMiddleware(allow_credentials=True, allow_methods=["*"],
+    allow_headers=["*"])：預檢請求直接回應，一般請求在回應標頭附加 CORS 標頭。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allow_origins: Iterable[str],
+        expose_headers: Iterable[str] = (),
+    ):
+        self.app = app
+        self.allow_origins = frozenset(origin.encode("latin-1") for origin in allow_origins)
+        self._simple_headers = [
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+        expose_headers = ", ".join(expose_headers)
+        if expose_headers:
+            self._simple_headers.append(
+                (b"access-control-expose-headers", expose_headers.encode("latin-1"))
+            )
+        self._preflight_headers = [
+            (b"access-control-allow-credentials", b"true"),
+            (b"access-control-allow-methods", CORS_ALLOW_METHODS),
+            (b"access-control-max-age", CORS_MAX_AGE),
+            (b"vary", b"Origin"),
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        allowed = origin in self.allow_origins
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self._preflight_response(send, origin, allowed, request_headers)
+            return
+
+        if not allowed:
+            await self.app(scope, receive, send)
+            return
+
+        cors_headers = self._simple_headers + [(b"access-control-allow-origin", origin)]
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", ())) + cors_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _preflight_response(
+        self, send: Send, origin: bytes, allowed: bool, request_headers
+    ) -> None:
+        headers = list(self._preflight_headers)
+        if allowed:
+            headers.append((b"access-control-allow-origin", origin))
+            status, body = 200, b"OK"
+        else:
+            status, body = 400, b"Disallowed CORS origin"
+        if request_headers:
+            headers.append((b"access-control-allow-headers", request_headers))
+        headers.append((b"content-type", b"text/plain; charset=utf-8"))
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,136 @@
+"""
+靜態檔案記憶體快取
+保存近期回傳的小型檔案內容 (如模擬輸出的 PNG)，以 mtime/大小 判斷是否過期
+"""
+
+import logging
+import os
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import STATIC_CACHE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+# 單一檔案上限，超過的檔案不快取，交由 FileResponse 傳送
+STATIC_CACHE_MAX_ENTRY_BYTES = 4 * 1024 * 1024
+
+# 小於此大小的檔案直接在事件迴圈上一次讀完 (單次 read)，較大的檔案改在執行緒池讀取
+SMALL_FILE_THRESHOLD = 256 * 1024
+
+
+def read_file(full_path: str) -> bytes:
+    """單次同步讀取整個檔案"""
+    with open(full_path, "rb") as f:
+        return f.read()
+
+
+def make_etag(stat_result: os.stat_result) -> str:
+    """以 mtime 與大小產生弱 ETag，檔案被覆寫後即改變"""
+    return f'W/"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 弱比對 (忽略 W/ 前綴，支援多值與 *)"""
+    if not if_none_match:
+        return False
+    target = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == target:
+            return True
+    return False
+
+
+class StaticFileCache:
+    """以總位元組數為上限的 LRU 檔案內容快取"""
+
+    def __init__(
+        self,
+        max_bytes: int = STATIC_CACHE_MAX_BYTES,
+        max_entry_bytes: int = STATIC_CACHE_MAX_ENTRY_BYTES,
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        # 實體路徑 -> (內容, mtime_ns, 大小)
+        self._entries: "OrderedDict[str, Tuple[bytes, int, int]]" = OrderedDict()
+        self._total_bytes = 0
+
+    def get(self, full_path: str, stat_result: os.stat_result) -> Optional[bytes]:
+        """取得快取內容；檔案已變更時移除舊項目並回傳 None"""
+        entry = self._entries.get(full_path)
+        if entry is None:
+            return None
+        content, mtime_ns, size = entry
+        if mtime_ns != stat_result.st_mtime_ns or size != stat_result.st_size:
+            self._remove(full_path)
+            return None
+        self._entries.move_to_end(full_path)
+        return content
+
+    def load(self, full_path: str, stat_result: os.stat_result) -> Optional[bytes]:
+        """同步讀取檔案並放入快取 (啟動預載用)；超過單筆上限時回傳 None"""
+        if stat_result.st_size > self.max_entry_bytes:
+            return None
+        content = read_file(full_path)
+        self._store(full_path, stat_result, content)
+        return content
+
+    async def aload(
+        self, full_path: str, stat_result: os.stat_result
+    ) -> Optional[bytes]:
+        """請求處理中讀取檔案並放入快取；超過單筆上限時回傳 None
+
+        小檔案直接讀取，SMALL_FILE_THRESHOLD 以上的檔案在執行緒池讀取，
+        避免阻塞事件迴圈；快取本身只在事件迴圈執行緒上修改
+        """
+        if stat_result.st_size > self.max_entry_bytes:
+            return None
+        if stat_result.st_size < SMALL_FILE_THRESHOLD:
+            content = read_file(full_path)
+        else:
+            content = await run_in_threadpool(read_file, full_path)
+        self._store(full_path, stat_result, content)
+        return content
+
+    def _store(self, full_path: str, stat_result: os.stat_result, content: bytes):
+        # 讀取期間檔案可能正被覆寫，大小不符時只回傳內容不快取
+        if len(content) == stat_result.st_size:
+            self._put(full_path, content, stat_result.st_mtime_ns)
+
+    def preload(self, root: str) -> int:
+        """預先載入 root 下的檔案直到快取滿，回傳載入數量"""
+        loaded = 0
+        try:
+            entries = list(os.scandir(root))
+        except OSError as e:
+            logger.warning("無法預載靜態檔案快取 %s: %s", root, e)
+            return 0
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            stat_result = entry.stat()
+            if self._total_bytes + stat_result.st_size > self.max_bytes:
+                break
+            full_path = os.path.realpath(entry.path)
+            if self.load(full_path, stat_result) is not None:
+                loaded += 1
+        return loaded
+
+    def _put(self, full_path: str, content: bytes, mtime_ns: int):
+        self._remove(full_path)
+        self._entries[full_path] = (content, mtime_ns, len(content))
+        self._total_bytes += len(content)
+        while self._total_bytes > self.max_bytes:
+            _, (evicted, _, _) = self._entries.popitem(last=False)
+            self._total_bytes -= len(evicted)
+
+    def _remove(self, full_path: str):
+        entry = self._entries.pop(full_path, None)
+        if entry is not None:
+            self._total_bytes -= len(entry[0])
+
+
+rendered_image_cache = StaticFileCache()
@@ -0,0 +1,160 @@
+"""
+靜態檔案路由
+以 FileResponse (sendfile) 直接回傳模擬輸出圖片，取代 StaticFiles 掛載；
+常用的小圖片由記憶體快取回傳，並支援 ETag 304；/static 優先回傳預先壓縮的 .br/.gz
+"""
+
+import mimetypes
+import os
+import stat
+from functools import lru_cache
+from typing import FrozenSet, Optional, Tuple
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+
+from app.core.config import OUTPUT_DIR, STATIC_DIR
+from app.core.static_cache import (
+    SMALL_FILE_THRESHOLD,
+    etag_matches,
+    make_etag,
+    read_file,
+    rendered_image_cache,
+)
+
+router = APIRouter(include_in_schema=False)
+
+RENDERED_IMAGES_CACHE_CONTROL = "public, max-age=60"
+
+RENDERED_IMAGES_ROOT = os.path.realpath(OUTPUT_DIR)
+STATIC_ROOT = os.path.realpath(STATIC_DIR)
+
+# 依偏好順序探測的預壓縮檔 (Content-Encoding, 副檔名)
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+@lru_cache(maxsize=512)
+def _resolve_path(root: str, path: str) -> Optional[str]:
+    """將 URL 路徑解析為 root 下的實體路徑，越界 (如 ../) 時回傳 None"""
+    full_path = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath((root, full_path)) != root:
+        return None
+    return full_path
+
+
+@lru_cache(maxsize=512)
+def _guess_media_type(full_path: str) -> str:
+    return mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+
+
+def _stat_file(root: str, path: str):
+    """解析並 stat 檔案，回傳 (實體路徑, stat 結果)，不存在時拋出 404
+
+    路徑解析與 MIME 類型走快取；stat 每次都重新取得，檔案被模擬覆寫後
+    mtime/大小改變，FileResponse 產生的 ETag 與 Last-Modified 隨之更新。
+    """
+    full_path = _resolve_path(root, path)
+    if full_path is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    try:
+        stat_result = os.stat(full_path)
+    except OSError:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(status_code=404, detail="Not Found")
+    return full_path, stat_result
+
+
+@lru_cache(maxsize=64)
+def _accepted_encodings(accept_encoding: str) -> FrozenSet[str]:
+    """解析 Accept-Encoding，排除 q=0 的編碼"""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return frozenset(accepted)
+
+
+def _find_precompressed(
+    full_path: str, accept_encoding: Optional[str]
+) -> Optional[Tuple[str, str, os.stat_result]]:
+    """尋找客戶端可接受的預壓縮同名檔，回傳 (編碼, 路徑, stat 結果)"""
+    if not accept_encoding:
+        return None
+    accepted = _accepted_encodings(accept_encoding)
+    for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+        if encoding not in accepted:
+            continue
+        compressed_path = full_path + suffix
+        try:
+            stat_result = os.stat(compressed_path)
+        except OSError:
+            continue
+        if stat.S_ISREG(stat_result.st_mode):
+            return encoding, compressed_path, stat_result
+    return None
+
+
+@router.api_route("/rendered_images/{path:path}", methods=["GET", "HEAD"])
+async def get_rendered_image(path: str, request: Request):
+    """回傳模擬輸出圖片
+
+    客戶端 ETag 相符時直接回 304；快取未命中時讀檔 (較大的檔案在執行緒池讀取)
+    並放入記憶體快取，超過快取單筆上限的檔案由 FileResponse 透過 sendfile 傳送。
+    """
+    full_path, stat_result = _stat_file(RENDERED_IMAGES_ROOT, path)
+    etag = make_etag(stat_result)
+    headers = {"ETag": etag, "Cache-Control": RENDERED_IMAGES_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    media_type = _guess_media_type(full_path)
+    content = rendered_image_cache.get(full_path, stat_result)
+    if content is None:
+        content = await rendered_image_cache.aload(full_path, stat_result)
+    if content is None:
+        return FileResponse(
+            full_path,
+            stat_result=stat_result,
+            media_type=media_type,
+            headers=headers,
+        )
+    return Response(content, media_type=media_type, headers=headers)
+
+
+@router.api_route("/static/{path:path}", methods=["GET", "HEAD"])
+async def get_static_file(path: str, request: Request):
+    """回傳 /static 下的檔案
+
+    客戶端接受 br/gzip 且存在對應的 .br/.gz 同名檔時，直接回傳壓縮檔並設定
+    Content-Encoding；MIME 類型仍依原始檔名判斷。小於 SMALL_FILE_THRESHOLD 的
+    檔案直接在事件迴圈上同步讀取回傳，避免 FileResponse 逐塊 await 的開銷。
+    """
+    full_path, stat_result = _stat_file(STATIC_ROOT, path)
+    media_type = _guess_media_type(full_path)
+    headers = {"Vary": "Accept-Encoding"}
+    compressed = _find_precompressed(full_path, request.headers.get("accept-encoding"))
+    if compressed is not None:
+        encoding, full_path, stat_result = compressed
+        headers["Content-Encoding"] = encoding
+
+    etag = make_etag(stat_result)
+    headers["ETag"] = etag
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if stat_result.st_size < SMALL_FILE_THRESHOLD:
+        return Response(read_file(full_path), media_type=media_type, headers=headers)
+    return FileResponse(
+        full_path,
+        stat_result=stat_result,
+        media_type=media_type,
+        headers=headers,
+    )
@@ -0,0 +1,17 @@
+"""
+靜態檔案與快取目錄初始化
+於 lifespan 啟動時建立一次，取代 main.py / config.py 匯入時的 os.makedirs
+"""
+
+import os
+from functools import lru_cache
+
+from app.core.config import ISS_CACHE_DIR, OUTPUT_DIR, STATIC_DIR
+
+
+@lru_cache(maxsize=1)
+def ensure_static_dirs() -> None:
+    """建立 /rendered_images、/static 與 ISS 磁碟快取目錄，重複呼叫不會再觸發系統呼叫"""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    os.makedirs(ISS_CACHE_DIR, exist_ok=True)
@@ -1,6 +1,13 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from app.core.config import DATABASE_URL
+from app.core.config import (
+    DATABASE_URL,
+    DB_COMMAND_TIMEOUT,
+    DB_MAX_OVERFLOW,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+)
 from app.db.base_class import Base  # noqa
 
 # 重構後的領域模型引用
@@ -8,7 +15,19 @@ from app.db.base_class import Base  # noqa
 
 # 使用 async engine
 # echo=False 可避免印出 SQL 指令，設為 True 可用於除錯
-engine = create_async_engine(DATABASE_URL, echo=False, future=True)
+# 連線池大小明確設定 (預設 5 + 15 溢出)，pre_ping 丟棄失效連線，
+# command_timeout 由 asyncpg 限制單一查詢時間
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=False,
+    future=True,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    connect_args={"command_timeout": DB_COMMAND_TIMEOUT},
+)
 
 # Async session maker
 # expire_on_commit=False 可讓你在 commit 後仍能存取 session 中的物件
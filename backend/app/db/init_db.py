@@ -0,0 +1,29 @@
+"""
+一次性資料庫初始化
+建立資料表、寫入預設資料並同步 TLE，供多 worker 部署在啟動 worker 前執行：
+
+    python -m app.db.init_db
+"""
+
+import asyncio
+import logging
+
+from app.db.base import engine
+from app.db.lifespan import create_redis_client, initialize_database
+
+logger = logging.getLogger(__name__)
+
+
+async def run_init() -> None:
+    redis_client = await create_redis_client()
+    try:
+        await initialize_database(redis_client)
+    finally:
+        if redis_client is not None:
+            await redis_client.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_init())
+    logger.info("Database initialization complete.")
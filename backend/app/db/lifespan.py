@@ -26,10 +26,12 @@ from app.domains.satellite.models.ground_station_model import (
 from app.domains.satellite.models.dto import GroundStationCreate  # 新的 DTO 路徑
 
 from app.core.config import (
-    OUTPUT_DIR,
     configure_gpu_cpu,
     configure_matplotlib,
 )
+from app.core.static_init import ensure_static_dirs
+from app.core.static_files import RENDERED_IMAGES_ROOT
+from app.core.static_cache import rendered_image_cache
 import os
 
 # import numpy as np # numpy seems unused directly in this file now
@@ -42,6 +44,9 @@ import redis.asyncio as aioredis
 
 logger = logging.getLogger(__name__)
 
+# 資料庫初始化已由啟動流程 (gunicorn on_starting / start.sh) 事先完成時設為 "1"
+DB_INIT_DONE_ENV = "SIMWORLD_DB_INIT_DONE"
+
 
 async def create_db_and_tables():
     """Creates database tables if they don't exist."""
@@ -221,7 +226,8 @@ async def seed_initial_device_data(session: AsyncSession):
         logger.error(f"Error seeding initial Device data: {e}", exc_info=True)
 
 
-async def initialize_redis_client(app: FastAPI):
+async def create_redis_client():
+    """建立並測試 Redis 連線，失敗時回傳 None"""
     redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     logger.info(f"Attempting to connect to Redis at {redis_url}")
     try:
@@ -230,15 +236,48 @@ async def initialize_redis_client(app: FastAPI):
             redis_url, encoding="utf-8", decode_responses=False
         )
         await redis_client.ping()
-        app.state.redis = redis_client
-        logger.info(
-            "Successfully connected to Redis and stored client in app.state.redis"
-        )
+        logger.info("Successfully connected to Redis")
+        return redis_client
     except Exception as e:
-        app.state.redis = None
         logger.error(
             f"Failed to connect to Redis: {e}. TLE sync and other Redis features will be unavailable."
         )
+        return None
+
+
+async def initialize_redis_client(app: FastAPI):
+    app.state.redis = await create_redis_client()
+    if app.state.redis is not None:
+        logger.info("Stored Redis client in app.state.redis")
+
+
+async def initialize_database(redis_client) -> None:
+    """建立資料表、寫入預設設備與地面站並同步 TLE
+
+    每次部署只需執行一次：多 worker 部署時由 gunicorn master (on_starting)
+    或 start.sh 透過 `python -m app.db.init_db` 事先執行，
+    並設定 DB_INIT_DONE_ENV，讓各 worker 的 lifespan 略過這一步。
+    """
+    logger.info("Database initialization sequence...")
+    await create_db_and_tables()
+
+    # 異步初始化資料庫
+    async with async_session_maker() as db_session:
+        # 初始化設備資料
+        await seed_initial_device_data(db_session)
+        # 恢復地面站相關初始化
+        await seed_default_ground_station(db_session)
+
+    # 恢復 TLE 相關同步
+    if redis_client:
+        try:
+            # 自動同步 OneWeb TLE 資料
+            logger.info("Synchronizing OneWeb TLE data in the background...")
+            await synchronize_oneweb_tles(async_session_maker, redis_client)
+        except Exception as e:
+            logger.error(f"Error during OneWeb TLE synchronization: {e}", exc_info=True)
+    else:
+        logger.warning("Redis unavailable, skipping OneWeb TLE synchronization")
 
 
 @asynccontextmanager
@@ -255,35 +294,24 @@ async def lifespan(app: FastAPI):
         configure_matplotlib()
         logger.info("Matplotlib configuration completed.")
         
-        logger.info("Creating output directory...")
-        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        logger.info("Creating static directories...")
+        ensure_static_dirs()
+        preloaded = rendered_image_cache.preload(RENDERED_IMAGES_ROOT)
+        logger.info(f"Preloaded {preloaded} rendered images into memory cache.")
         logger.info("Environment configured.")
     except Exception as e:
         logger.error(f"Error during environment configuration: {e}", exc_info=True)
         raise
 
-    logger.info("Database initialization sequence...")
-    await create_db_and_tables()
+    # 共用的 engine (含連線池) 掛在 app.state，供需要直接取連線的處理器使用
+    app.state.db_engine = engine
 
     await initialize_redis_client(app)
 
-    # 異步初始化資料庫
-    async with async_session_maker() as db_session:
-        # 初始化設備資料
-        await seed_initial_device_data(db_session)
-        # 恢復地面站相關初始化
-        await seed_default_ground_station(db_session)
-
-    # 恢復 TLE 相關同步
-    if hasattr(app.state, "redis") and app.state.redis:
-        try:
-            # 自動同步 OneWeb TLE 資料
-            logger.info("Synchronizing OneWeb TLE data in the background...")
-            await synchronize_oneweb_tles(async_session_maker, app.state.redis)
-        except Exception as e:
-            logger.error(f"Error during OneWeb TLE synchronization: {e}", exc_info=True)
+    if os.getenv(DB_INIT_DONE_ENV) == "1":
+        logger.info("Database already initialized before workers started, skipping.")
     else:
-        logger.warning("Redis unavailable, skipping OneWeb TLE synchronization")
+        await initialize_database(app.state.redis)
 
     logger.info("Application startup complete.")
 
@@ -294,4 +322,7 @@ async def lifespan(app: FastAPI):
         logger.info("Closing Redis connection...")
         await app.state.redis.close()
 
+    logger.info("Disposing database connection pool...")
+    await engine.dispose()
+
     logger.info("Application shutdown complete.")
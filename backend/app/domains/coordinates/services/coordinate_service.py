@@ -1,5 +1,6 @@
 import logging
 import math
+from functools import lru_cache
 from typing import Tuple, Dict, Any, Optional
 
 from skyfield.api import load, wgs84, Distance
@@ -62,6 +63,74 @@ except Exception as e:
     ts = None
 
 
+class _SceneGpsTransform:
+    """單一場景的前端座標 -> GPS 線性轉換，純量與陣列輸入皆可"""
+
+    __slots__ = ("origin_lat", "origin_lon", "origin_x", "origin_y", "lat_scale", "lon_scale")
+
+    def __init__(self, origin_lat, origin_lon, origin_x, origin_y, lat_scale, lon_scale):
+        self.origin_lat = origin_lat
+        self.origin_lon = origin_lon
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.lat_scale = lat_scale
+        self.lon_scale = lon_scale
+
+    def __call__(self, x_m, y_m, z_m: float = 0.0) -> GeoCoordinate:
+        latitude, longitude = self.to_lat_lon(x_m, y_m)
+        return GeoCoordinate(
+            latitude=latitude,
+            longitude=longitude,
+            altitude=z_m if z_m > 0.1 else None
+        )
+
+    def to_lat_lon(self, x_m, y_m):
+        # 計算相對於基準點的偏移（前端座標米為單位），再轉換為GPS座標
+        latitude = self.origin_lat + (y_m - self.origin_y) * self.lat_scale
+        longitude = self.origin_lon + (x_m - self.origin_x) * self.lon_scale
+        return latitude, longitude
+
+
+@lru_cache(maxsize=16)
+def _get_scene_transform(scene: str) -> _SceneGpsTransform:
+    """依場景名稱建立並快取前端->GPS 轉換"""
+    if scene.lower() == "poto":
+        return _SceneGpsTransform(
+            ORIGIN_LATITUDE_POTO, ORIGIN_LONGITUDE_POTO,
+            ORIGIN_FRONTEND_X_POTO, ORIGIN_FRONTEND_Y_POTO,
+            LATITUDE_SCALE_PER_METER_Y_POTO, LONGITUDE_SCALE_PER_METER_X_POTO,
+        )
+    # 默認使用potou參數
+    return _SceneGpsTransform(
+        ORIGIN_LATITUDE_POTOU, ORIGIN_LONGITUDE_POTOU,
+        ORIGIN_FRONTEND_X_POTOU, ORIGIN_FRONTEND_Y_POTOU,
+        LATITUDE_SCALE_PER_METER_Y, LONGITUDE_SCALE_PER_METER_X,
+    )
+
+
+def frontend_coords_to_gps(x_m: float, y_m: float, z_m: float = 0.0, scene: str = "potou") -> GeoCoordinate:
+    """
+    將前端座標系統轉換為GPS座標，支持不同場景
+    
+    支援的場景：
+    - potou: 破斗山場景
+    - poto: 坡頭漁港場景
+    """
+    return _get_scene_transform(scene)(x_m, y_m, z_m)
+
+
+def frontend_coords_to_gps_batch(
+    xs_m: np.ndarray, ys_m: np.ndarray, scene: str = "potou"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    frontend_coords_to_gps 的批次版本：一次轉換多個前端座標點
+    回傳 (latitudes, longitudes) 兩個 float64 陣列
+    """
+    return _get_scene_transform(scene).to_lat_lon(
+        np.asarray(xs_m, dtype=np.float64), np.asarray(ys_m, dtype=np.float64)
+    )
+
+
 class CoordinateService(CoordinateServiceInterface):
     """座標轉換服務實現"""
 
@@ -19,7 +19,13 @@ from app.domains.simulation.models.simulation_model import (
     SimulationParameters,
     SimulationImageRequest,
 )
-from app.domains.simulation.services.sionna_service import sionna_service
+from app.domains.simulation.services.sionna_service import (
+    generate_iss_map,
+    sionna_service,
+)
+from app.domains.coordinates.services.coordinate_service import (
+    frontend_coords_to_gps_batch,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -302,7 +308,6 @@ async def get_iss_map(
                 raise HTTPException(status_code=400, detail="地圖尺寸過大，請限制在1600萬像素以內")
                 
         # 直接調用全域generate_iss_map函數以獲取峰值數據
-        from app.domains.simulation.services.sionna_service import generate_iss_map
         import time
         
         result = await generate_iss_map(
@@ -355,12 +360,6 @@ async def get_iss_map_cfar_peaks(
 ):
     """獲取ISS地圖的CFAR峰值GPS座標"""
     try:
-        from app.domains.simulation.services.sionna_service import SionnaSimulationService
-        from app.api.v1.interference.routes_sparse_scan import frontend_coords_to_gps
-        
-        # 獲取SionnaSimulationService實例
-        sionna_service = SionnaSimulationService()
-        
         cfar_peaks_gps = []
         
         # 如果需要強制刷新或沒有快取數據，重新生成ISS地圖
@@ -368,7 +367,6 @@ async def get_iss_map_cfar_peaks(
         
         if not should_regenerate:
             # 檢查是否有有效的快取數據
-            from app.domains.simulation.services.sionna_service import generate_iss_map
             if hasattr(generate_iss_map, '_iss_cache') and generate_iss_map._iss_cache:
                 # 有快取數據，但檢查是否為當前場景相關
                 found_valid_cache = False
@@ -389,18 +387,18 @@ async def get_iss_map_cfar_peaks(
             logger.info(f"重新生成ISS地圖以獲取最新CFAR峰值，場景: {scene}")
             from app.core.config import ISS_MAP_IMAGE_PATH
             
-            # 使用默認參數重新生成ISS地圖
+            # 使用默認參數重新生成ISS地圖 (只需峰值資料，不需繪圖)
             success = await sionna_service.generate_iss_map(
                 session=session,
                 output_path=str(ISS_MAP_IMAGE_PATH),
-                scene_name=scene
+                scene_name=scene,
+                render=False,
             )
             
             if not success:
                 logger.warning("重新生成ISS地圖失敗，嘗試使用現有快取數據")
         
         # 從快取中獲取峰值數據並轉換GPS座標
-        from app.domains.simulation.services.sionna_service import generate_iss_map
         if hasattr(generate_iss_map, '_iss_cache') and generate_iss_map._iss_cache:
             # 找到最新的快取條目（基於時間戳）
             latest_cache_data = None
@@ -420,21 +418,25 @@ async def get_iss_map_cfar_peaks(
                 cached_peaks = latest_cache_data['peak_locations_gps']
                 logger.info(f"從最新ISS地圖快取獲取到 {len(cached_peaks)} 個CFAR峰值 (時間戳: {latest_timestamp:.0f}, key: {latest_cache_key[:16]}...)，重新計算GPS位置使用場景: {scene}")
                 
-                for peak_data in cached_peaks:
-                    # 獲取前端座標
-                    frontend_coords = peak_data.get('frontend_coords', {})
-                    x_frontend = frontend_coords.get('x', 0)
-                    y_frontend = frontend_coords.get('y', 0)
-                    
-                    # 使用當前場景參數重新計算GPS座標
-                    gps_coord = frontend_coords_to_gps(x_frontend, y_frontend, 0.0, scene)
-                    
+                # 獲取前端座標
+                frontend_xy = [
+                    (peak_data.get('frontend_coords', {}).get('x', 0),
+                     peak_data.get('frontend_coords', {}).get('y', 0))
+                    for peak_data in cached_peaks
+                ]
+                
+                # 使用當前場景參數一次重新計算所有峰值的GPS座標
+                latitudes, longitudes = frontend_coords_to_gps_batch(
+                    [xy[0] for xy in frontend_xy], [xy[1] for xy in frontend_xy], scene
+                )
+                
+                for peak_data, lat, lon in zip(cached_peaks, latitudes.tolist(), longitudes.tolist()):
                     # 構建新的峰值數據，保留其他信息但更新GPS座標
                     updated_peak = peak_data.copy()
                     updated_peak['gps_coords'] = {
-                        "latitude": gps_coord.latitude,
-                        "longitude": gps_coord.longitude,
-                        "altitude": gps_coord.altitude
+                        "latitude": lat,
+                        "longitude": lon,
+                        "altitude": None
                     }
                     cfar_peaks_gps.append(updated_peak)
             else:
@@ -1,8 +1,18 @@
 # backend/app/services/sionna_simulation.py
+import asyncio
+import hashlib
+import json
 import logging
+import math
 import os
+import stat
+import struct
 import traceback
+from collections import OrderedDict
 import matplotlib.pyplot as plt
+from matplotlib import colormaps
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import Normalize
 import numpy as np
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field as PydanticField  # Use Pydantic BaseModel
@@ -34,6 +44,10 @@ from app.core.config import (
 
 # 從設備領域中導入設備服務和儲存庫
 from app.domains.device.services.device_service import DeviceService
+from app.db.base import async_session_maker
+from app.domains.coordinates.services.coordinate_service import (
+    frontend_coords_to_gps_batch,
+)
 from app.domains.device.adapters.sqlmodel_device_repository import (
     SQLModelDeviceRepository,
 )
@@ -52,11 +66,12 @@ import io
 import tensorflow as tf
 
 # ISS Map 相關導入
-from scipy.ndimage import gaussian_filter, maximum_filter
+from scipy.ndimage import gaussian_filter, map_coordinates
 from scipy.interpolate import RegularGridInterpolator
 
 # 從 config 導入
 from app.core.config import NYCU_GLB_PATH, OUTPUT_DIR  # 確保導入 NYCU_GLB_PATH
+from app.core.config import ISS_CACHE_DIR
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +86,13 @@ except ImportError:
         logger.warning("Warning: skimage not available, using custom implementation")
         peak_local_max = None
 
+# 嘗試導入 numba，如果失敗則使用 NumPy 實作
+try:
+    from numba import njit
+except ImportError:
+    logger.warning("Warning: numba not available, using NumPy implementation")
+    njit = None
+
 # --- 新增：場景背景顏色常數 ---
 SCENE_BACKGROUND_COLOR_RGB = [0.5, 0.5, 0.5]
 # --- End Constant ---
@@ -84,6 +106,10 @@ def to_frontend_coords(p):
     """Sionna座標 -> DB/前端座標 (y 還原)"""
     return [p[0], -p[1], p[2]]
 
+# Sionna -> 前端座標的平面仿射係數 (a, b, c, d, e, f)：
+# x' = a*x + b*y + c, y' = d*x + e*y + f (即 y 取負)
+_SIONNA_TO_FRONTEND_AFFINE = (1.0, 0.0, 0.0, 0.0, -1.0, 0.0)
+
 def to_sionna_xy_from_frontend(xy: tuple[float, float]) -> tuple[float, float]:
     """(x, y) from DB/Frontend → Sionna (x, -y)"""
     return (xy[0], -xy[1])
@@ -99,29 +125,261 @@ def build_iss_interpolator(x_unique: np.ndarray, y_unique: np.ndarray, iss_dbm:
 
 def sample_iss_at_points(
     x_unique: np.ndarray, y_unique: np.ndarray, iss_dbm: np.ndarray,
-    pts_frontend_xy: List[tuple[float, float]],
+    pts_frontend_xy,
     noise_std_db: float = 0.0
 ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
     在指定的前端/DB座標點取樣 ISS (dBm)。
+    pts_frontend_xy 可為 (x, y) 序列或 (N, 2) ndarray。
     回傳: (xs, ys, vals_dbm) 皆為 Sionna 座標平面上的 x/y 與 dBm
     """
     if len(pts_frontend_xy) == 0:
         return np.array([]), np.array([]), np.array([])
 
-    # 轉成 Sionna 平面座標
-    pts_sionna = [to_sionna_xy_from_frontend(p) for p in pts_frontend_xy]
-    interp = build_iss_interpolator(x_unique, y_unique, iss_dbm)
-    # RegularGridInterpolator 要求點為 (y, x) 順序
-    query = np.array([[py, px] for (px, py) in pts_sionna], dtype=np.float64)
-    vals = interp(query)
+    # 轉成 Sionna 平面座標 (y 取負)，整批一次運算
+    pts_sionna = np.asarray(pts_frontend_xy, dtype=np.float64).reshape(-1, 2)
+    pts_sionna = pts_sionna * np.array([1.0, -1.0])
+    xs = pts_sionna[:, 0]
+    ys = pts_sionna[:, 1]
+
+    if len(x_unique) > 1 and len(y_unique) > 1:
+        # cell 中心為等距網格：直接換算成分數索引後做雙線性內插，
+        # 超出範圍的點與 NaN 混合後為 NaN (與 RegularGridInterpolator 行為一致)
+        col_idx = (xs - x_unique[0]) / (x_unique[1] - x_unique[0])
+        row_idx = (ys - y_unique[0]) / (y_unique[1] - y_unique[0])
+        vals = map_coordinates(
+            iss_dbm, [row_idx, col_idx],
+            order=1, mode="constant", cval=np.nan,
+        )
+    else:
+        interp = build_iss_interpolator(x_unique, y_unique, iss_dbm)
+        # RegularGridInterpolator 要求點為 (y, x) 順序
+        vals = interp(pts_sionna[:, ::-1])
 
     if noise_std_db > 0:
         vals = vals + np.random.normal(0.0, noise_std_db, size=vals.shape)
 
-    xs = np.array([p[0] for p in pts_sionna])
-    ys = np.array([p[1] for p in pts_sionna])
     return xs, ys, vals
+
+# 依 (shape, dtype, 用途) 重用的暫存陣列，避免每次請求重新配置整張地圖大小的緩衝區；
+# 以 LRU 限制數量，地圖解析度變動時舊 shape 的緩衝區會被淘汰
+SCRATCH_MAX_ENTRIES = 4
+_scratch: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+
+
+def _scratch_like(ref: np.ndarray, name: str) -> np.ndarray:
+    """
+    取得與 ref 同 shape/dtype 的模組層級暫存陣列。
+    內容不保證清空，且只能用於當次計算中的中間結果 (不可存入快取或回傳)。
+    """
+    key = (ref.shape, ref.dtype, name)
+    buf = _scratch.get(key)
+    if buf is None:
+        buf = np.empty_like(ref)
+        _scratch[key] = buf
+        while len(_scratch) > SCRATCH_MAX_ENTRIES:
+            _scratch.popitem(last=False)
+    else:
+        _scratch.move_to_end(key)
+    return buf
+
+
+def _cfar_stats_numpy(grid: np.ndarray):
+    """回傳 (最大值, 最大值列索引, 最大值行索引, 平均, 標準差)"""
+    row, col = np.unravel_index(np.argmax(grid), grid.shape)
+    return grid[row, col], row, col, grid.mean(), grid.std()
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _cfar_stats_jit(grid):
+        """_cfar_stats_numpy 的單次走訪版本：一次掃描同時求得最大值位置、平均與標準差"""
+        height, width = grid.shape
+        total = 0.0
+        total_sq = 0.0
+        max_val = grid[0, 0]
+        max_row = 0
+        max_col = 0
+        for i in range(height):
+            for j in range(width):
+                v = grid[i, j]
+                total += v
+                total_sq += v * v
+                if v > max_val:
+                    max_val = v
+                    max_row = i
+                    max_col = j
+        n = height * width
+        mean = total / n
+        var = max(total_sq / n - mean * mean, 0.0)
+        return max_val, max_row, max_col, mean, var ** 0.5
+
+    _cfar_stats = _cfar_stats_jit
+else:
+    _cfar_stats = _cfar_stats_numpy
+
+
+def _color_range_dbm(finite_vals: np.ndarray, default: tuple = (-80, -20)) -> tuple:
+    """
+    以 np.partition (O(n) 選擇) 取得有限值的第 5 / 95 百分位作為顏色範圍，
+    避免 np.percentile 的完整排序；無有限值時回傳 default
+    """
+    n = finite_vals.size
+    if n == 0:
+        return default
+    k_lo = int(0.05 * (n - 1))
+    k_hi = int(0.95 * (n - 1))
+    part = np.partition(finite_vals, (k_lo, k_hi))
+    return float(part[k_lo]), float(part[k_hi])
+
+
+def _to_tf_tensor(value) -> tf.Tensor:
+    """Dr.Jit 張量 (如 rm.rss) 經 DLPack 零拷貝轉為 TF 張量，資料留在原裝置上"""
+    if isinstance(value, tf.Tensor):
+        return value
+    return value.tf()
+
+
+def _watts_to_dbm_tf(power_w: tf.Tensor) -> tf.Tensor:
+    """
+    W -> dBm：10*log10(P/1e-3) = 10*ln(P)/ln(10) + 30，於 TF 所在裝置 (GPU) 上計算。
+    先截斷於 1e-12 以避免 log(0)。全程維持 float32。
+    """
+    power_w = tf.cast(power_w, tf.float32)
+    return tf.math.log(tf.maximum(power_w, 1e-12)) * (10.0 / math.log(10.0)) + 30.0
+
+
+def _device_xy_by_role(all_txs_info: List[Dict[str, Any]], role: str) -> np.ndarray:
+    """取出指定角色設備的 Sionna 平面座標，回傳 (N, 2) 陣列"""
+    xy = [
+        np.asarray(tx_info["position"], dtype=float).ravel()[:2]
+        for tx_info in all_txs_info
+        if tx_info["role"] == role
+    ]
+    return np.array(xy, dtype=float).reshape(-1, 2)
+
+
+def _peaks_to_frontend_numpy(rows, cols, x_unique, y_unique, iss_dbm, a, b, c, d, e, f):
+    """
+    CFAR 峰值 grid 索引 -> Sionna / 前端座標與 ISS 強度
+    回傳 (x_sionna, y_sionna, x_front, y_front, iss_vals, valid)，
+    前五個陣列只包含 valid (索引在座標軸範圍內) 的峰值
+    """
+    Ny, Nx = iss_dbm.shape
+    valid = (rows >= 0) & (rows < y_unique.size) & (cols >= 0) & (cols < x_unique.size)
+    rows, cols = rows[valid], cols[valid]
+    xs = x_unique.take(cols)
+    ys = y_unique.take(rows)
+    # 座標軸比地圖大時，超出地圖的峰值 ISS 強度以 0.0 表示
+    in_map = (rows < Ny) & (cols < Nx)
+    iss_vals = np.zeros(rows.size, dtype=np.float64)
+    iss_vals[in_map] = iss_dbm[rows[in_map], cols[in_map]]
+    return xs, ys, a * xs + b * ys + c, d * xs + e * ys + f, iss_vals, valid
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _peaks_to_frontend_jit(rows, cols, x_unique, y_unique, iss_dbm, a, b, c, d, e, f):
+        """_peaks_to_frontend_numpy 的融合版本：邊界檢查、取值與仿射轉換在同一次走訪完成"""
+        Ny, Nx = iss_dbm.shape
+        ny_u = y_unique.shape[0]
+        nx_u = x_unique.shape[0]
+        n = rows.shape[0]
+        valid = np.zeros(n, dtype=np.bool_)
+        n_valid = 0
+        for i in range(n):
+            if 0 <= rows[i] < ny_u and 0 <= cols[i] < nx_u:
+                valid[i] = True
+                n_valid += 1
+        xs = np.empty(n_valid)
+        ys = np.empty(n_valid)
+        x_front = np.empty(n_valid)
+        y_front = np.empty(n_valid)
+        iss_vals = np.zeros(n_valid)
+        k = 0
+        for i in range(n):
+            if valid[i]:
+                row = rows[i]
+                col = cols[i]
+                x = x_unique[col]
+                y = y_unique[row]
+                xs[k] = x
+                ys[k] = y
+                x_front[k] = a * x + b * y + c
+                y_front[k] = d * x + e * y + f
+                if row < Ny and col < Nx:
+                    iss_vals[k] = iss_dbm[row, col]
+                k += 1
+        return xs, ys, x_front, y_front, iss_vals, valid
+
+    _peaks_to_frontend = _peaks_to_frontend_jit
+else:
+    _peaks_to_frontend = _peaks_to_frontend_numpy
+
+
+def _cfar_peaks_to_gps(
+    peak_coords, x_unique: np.ndarray, y_unique: np.ndarray,
+    iss_dbm: np.ndarray, scene_name: str
+) -> List[Dict[str, Any]]:
+    """
+    將 CFAR 峰值的 grid 索引轉換為 Sionna / 前端 / GPS 座標
+    所有峰值以 NumPy 陣列一次批次轉換
+    """
+    # SoA：行、列各為連續的 int64 陣列
+    pc = np.ascontiguousarray(peak_coords, dtype=np.int64).reshape(-1, 2)
+    rows, cols = pc[:, 0].copy(), pc[:, 1].copy()
+    
+    # Sionna座標 / 前端座標 / ISS強度 (邊界檢查、取值與仿射轉換一次完成)
+    xs, ys, x_front, y_front, iss_vals, mask = _peaks_to_frontend(
+        rows, cols,
+        np.ascontiguousarray(x_unique, dtype=np.float64),
+        np.ascontiguousarray(y_unique, dtype=np.float64),
+        iss_dbm,
+        *_SIONNA_TO_FRONTEND_AFFINE
+    )
+    if not mask.all():
+        logger.warning(f"峰值索引 {pc[~mask].tolist()} 超出grid範圍 {iss_dbm.shape}")
+    
+    peak_ids = np.flatnonzero(mask) + 1
+    rows, cols = rows[mask], cols[mask]
+    if rows.size == 0:
+        return []
+    
+    # 前端座標 -> GPS座標（批次轉換）
+    latitudes, longitudes = frontend_coords_to_gps_batch(x_front, y_front, scene_name)
+    
+    peaks_gps = [
+        {
+            "peak_id": peak_id,
+            "grid_coords": {"row": row_idx, "col": col_idx},
+            "sionna_coords": {"x": x_sionna, "y": y_sionna},
+            "frontend_coords": {"x": x_frontend, "y": y_frontend},
+            "gps_coords": {
+                "latitude": lat,
+                "longitude": lon,
+                "altitude": None
+            },
+            "iss_strength_dbm": iss_value
+        }
+        for peak_id, row_idx, col_idx, x_sionna, y_sionna, x_frontend, y_frontend, lat, lon, iss_value in zip(
+            peak_ids.tolist(), rows.tolist(), cols.tolist(), xs.tolist(), ys.tolist(),
+            x_front.tolist(), y_front.tolist(),
+            latitudes.tolist(), longitudes.tolist(), iss_vals.tolist()
+        )
+    ]
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        lines = []
+        for peak in peaks_gps:
+            grid, front, gps = peak["grid_coords"], peak["frontend_coords"], peak["gps_coords"]
+            lines.append(
+                "CFAR峰值 %d: Grid(%d, %d) -> Frontend(%.1f, %.1f) -> GPS(%.6f, %.6f), ISS: %.1f dBm" % (
+                    peak["peak_id"], grid["row"], grid["col"], front["x"], front["y"],
+                    gps["latitude"], gps["longitude"], peak["iss_strength_dbm"]
+                )
+            )
+        logger.debug("\n".join(lines))
+    return peaks_gps
 # --- End 座標轉換工具函數 ---
 
 
@@ -238,9 +496,14 @@ def _ensure_output_dir(output_path):
 
 def verify_output_file(output_path):
     """檢查輸出文件是否成功生成，可被外部調用"""
-    exists = os.path.exists(output_path)
-    size = os.path.getsize(output_path) if exists else -1
-    is_file = os.path.isfile(output_path) if exists else False
+    # 單次 stat 同時取得存在與否、大小與檔案類型
+    try:
+        st = os.stat(output_path)
+    except OSError:
+        st = None
+    exists = st is not None
+    size = st.st_size if exists else -1
+    is_file = stat.S_ISREG(st.st_mode) if exists else False
 
     if exists and is_file and size > 0:
         logger.info(
@@ -746,7 +1009,7 @@ async def generate_cfr_plot(
 
         # 繪製星座圖和 CFR，然後保存到文件
         logger.info("Plotting constellation and CFR")
-        fig, ax = plt.subplots(1, 3, figsize=(15, 4))
+        fig, ax = plt.subplots(1, 3, figsize=(15, 4), layout="constrained")
         ax[0].scatter(y_eq_no_i.real, y_eq_no_i.imag, s=4, alpha=0.25)
         ax[0].set(title="No interference", xlabel="Real", ylabel="Imag")
         ax[0].grid(True)
@@ -761,11 +1024,9 @@ async def generate_cfr_plot(
         ax[2].legend()
         ax[2].grid(True)
 
-        plt.tight_layout()
-
         # 保存圖片
         logger.info(f"Saving plot to {output_path}")
-        plt.savefig(output_path, dpi=300, bbox_inches="tight")
+        fig.savefig(output_path, dpi=300)
         plt.close(fig)
 
         # 檢查文件是否成功生成
@@ -976,7 +1237,7 @@ async def generate_radio_map(
 
         # 生成圖表
         logger.info("生成無線電地圖圖表")
-        fig, ax = plt.subplots(1, 1, figsize=(12, 10))
+        fig, ax = plt.subplots(1, 1, figsize=(12, 10), layout="constrained")
 
         # 繪製無線電地圖
         im = ax.contourf(
@@ -1030,7 +1291,7 @@ async def generate_radio_map(
         # 添加圖例
         ax.legend(bbox_to_anchor=(1.05, 1), loc="upper left")
 
-        plt.tight_layout()
+        # constrained layout 排版 (含座標軸外的圖例與顏色條)，bbox_inches="tight" 只裁切畫布留白
         plt.savefig(output_path, dpi=300, bbox_inches="tight")
         plt.close()
 
@@ -1253,7 +1514,7 @@ async def generate_sinr_map(
 
         # 繪製地圖
         logger.info("繪製 SINR 地圖")
-        fig, ax = plt.subplots(figsize=(7, 5))
+        fig, ax = plt.subplots(figsize=(7, 5), layout="constrained")
         X, Y = np.meshgrid(x_unique, y_unique)
         pcm = ax.pcolormesh(
             X, Y, sinr_db, shading="nearest", vmin=sinr_vmin + 10, vmax=sinr_vmax
@@ -1295,11 +1556,10 @@ async def generate_sinr_map(
         ax.set_ylabel("y (m)")
         ax.set_title("SINR Map")
         # Removed ax.invert_yaxis() to match frontend coordinate system
-        plt.tight_layout()
 
         # 保存圖片
         logger.info(f"保存 SINR 地圖到 {output_path}")
-        plt.savefig(output_path, dpi=300, bbox_inches="tight")
+        fig.savefig(output_path, dpi=300)
         plt.close(fig)
 
         # 檢查文件是否生成成功
@@ -1595,7 +1855,7 @@ async def generate_doppler_plots(
 
         # 繪製單一的統一圖
         logger.info(f"繪製統一的延遲多普勒圖")
-        fig = plt.figure(figsize=figsize)
+        fig = plt.figure(figsize=figsize, layout="constrained")
         fig.suptitle("Delay-Doppler Plots")  # 標題使用原始設置
 
         for idx, (Z, label) in enumerate(zip(grids, labels), start=1):
@@ -1609,7 +1869,7 @@ async def generate_doppler_plots(
             ax.set_zlim(z_min, z_max)
             # 移除自定義視角設置，使用默認視角
 
-        plt.tight_layout()
+        # 子圖間距由 constrained layout 處理，bbox_inches="tight" 只裁切畫布留白
         plt.savefig(output_path, dpi=300, bbox_inches="tight")
         plt.close(fig)
 
@@ -1837,11 +2097,12 @@ async def generate_channel_response_plots(
         T, F = H_des.shape
         t_axis = np.arange(T)
         f_axis = np.arange(F)
-        T_mesh, F_mesh = np.meshgrid(t_axis, f_axis, indexing="ij")
+        # sparse=True：僅保留 (T,1)/(1,F) 兩個廣播軸，不配置完整的 T×F 網格
+        T_mesh, F_mesh = np.meshgrid(t_axis, f_axis, indexing="ij", sparse=True)
 
         # 創建圖片並保存
         logger.info("繪製通道響應圖")
-        fig = plt.figure(figsize=(18, 5))
+        fig = plt.figure(figsize=(18, 5), layout="constrained")
 
         # 子圖 1: H_des
         ax1 = fig.add_subplot(131, projection="3d")
@@ -1870,9 +2131,7 @@ async def generate_channel_response_plots(
         ax3.set_ylabel("OFDM 符號")
         ax3.set_title("‖H_all‖")
 
-        plt.tight_layout()
-
-        # 保存圖片
+        # 保存圖片 (子圖間距由 constrained layout 處理，bbox_inches="tight" 只裁切畫布留白)
         logger.info(f"保存通道響應圖到 {output_path}")
         plt.savefig(output_path, dpi=300, bbox_inches="tight")
         plt.close(fig)
@@ -1887,6 +2146,176 @@ async def generate_channel_response_plots(
         return False
 
 
+# ISS/TSS/UAV 稀疏地圖的輸出解析度 (前端顯示用，150 dpi 已足夠)
+ISS_MAP_SAVE_DPI = 150
+# ISS 相關地圖的 PNG zlib 壓縮等級 (1 = 最快，檔案略大)
+ISS_MAP_PNG_COMPRESS_LEVEL = 1
+# UAV 稀疏點超過此數量時改用 hexbin 聚合繪製
+UAV_SPARSE_HEXBIN_THRESHOLD = 10_000
+# UAV 軌跡線最多繪製的頂點數，超過時以固定步長抽樣
+UAV_TRAJECTORY_MAX_POINTS = 5_000
+
+
+async def _save_map_figure(fig, path: str) -> None:
+    """
+    在執行緒中保存 ISS 相關地圖 (PNG 編碼不阻塞事件迴圈)，
+    使用低 zlib 壓縮等級以縮短編碼時間
+    """
+    await asyncio.to_thread(
+        fig.savefig, path, dpi=ISS_MAP_SAVE_DPI,
+        pil_kwargs={"compress_level": ISS_MAP_PNG_COMPRESS_LEVEL, "optimize": False},
+    )
+
+
+# --- ISS 地圖快取 ---
+# 記憶體中最多保留的快取項目數 (每筆含完整的 ISS/TSS 地圖)
+ISS_MEMORY_CACHE_MAX_ENTRIES = 8
+# 磁碟上最多保留的快取項目數，超過時刪除最久未使用的項目
+ISS_DISK_CACHE_MAX_ENTRIES = 32
+
+
+class _IssCache:
+    """以 OrderedDict 實作的 LRU 快取，限制記憶體中的 ISS 地圖數量"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def __contains__(self, cache_key: str) -> bool:
+        return cache_key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def items(self):
+        """遍歷所有快取項目 (不影響 LRU 順序)"""
+        return list(self._entries.items())
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """取得快取項目並標記為最近使用，不存在時回傳 None"""
+        cached_data = self._entries.get(cache_key)
+        if cached_data is not None:
+            self._entries.move_to_end(cache_key)
+        return cached_data
+
+    def put(self, cache_key: str, cached_data: Dict[str, Any]) -> None:
+        """寫入快取項目，超過上限時淘汰最久未使用的項目"""
+        self._entries[cache_key] = cached_data
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_entries:
+            evicted_key, _ = self._entries.popitem(last=False)
+            logger.info(f"淘汰 ISS 記憶體快取: {evicted_key[:16]}...")
+
+
+def _update_cache_key_hash(hasher, obj) -> None:
+    """
+    將快取參數逐段餵入雜湊 (依型別加標記與長度前綴)，
+    不需先將整個 dict 序列化成 JSON 字串。dict 依 key 排序以確保結果穩定。
+    """
+    if isinstance(obj, dict):
+        hasher.update(b"d" + struct.pack("<q", len(obj)))
+        for key in sorted(obj):
+            _update_cache_key_hash(hasher, key)
+            _update_cache_key_hash(hasher, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(b"l" + struct.pack("<q", len(obj)))
+        for item in obj:
+            _update_cache_key_hash(hasher, item)
+    elif isinstance(obj, str):
+        data = obj.encode()
+        hasher.update(b"s" + struct.pack("<q", len(data)))
+        hasher.update(data)
+    elif isinstance(obj, bool):
+        hasher.update(b"T" if obj else b"F")
+    elif isinstance(obj, (int, float, np.number)):
+        hasher.update(b"f" + struct.pack("<d", float(obj)))
+    elif obj is None:
+        hasher.update(b"N")
+    else:
+        _update_cache_key_hash(hasher, str(obj))
+
+
+def _iss_cache_paths(cache_key: str):
+    """回傳 (陣列 .npz 路徑, 中繼資料 .json 路徑)"""
+    return ISS_CACHE_DIR / f"{cache_key}.npz", ISS_CACHE_DIR / f"{cache_key}.json"
+
+
+def _json_default(obj):
+    """將 Sionna/NumPy 座標等物件轉為可 JSON 序列化的 list"""
+    return np.asarray(obj, dtype=float).ravel().tolist()
+
+
+def _load_iss_cache_from_disk(cache_key: str) -> Optional[Dict[str, Any]]:
+    """從磁碟載入 ISS 快取，不存在或損毀時回傳 None"""
+    npz_path, meta_path = _iss_cache_paths(cache_key)
+    if not (npz_path.exists() and meta_path.exists()):
+        return None
+    try:
+        with np.load(npz_path) as arrays:
+            cached_data = {name: arrays[name] for name in arrays.files}
+        with open(meta_path, "r", encoding="utf-8") as f:
+            cached_data.update(json.load(f))
+    except Exception as e:
+        logger.warning(f"讀取 ISS 磁碟快取失敗 ({cache_key[:16]}...): {e}")
+        return None
+    # 更新存取時間，作為 LRU 淘汰依據
+    for path in (npz_path, meta_path):
+        os.utime(path)
+    return cached_data
+
+
+def _save_iss_cache_to_disk(cache_key: str, cached_data: Dict[str, Any]) -> None:
+    """將 ISS 快取寫入磁碟 (陣列存 .npz，其餘存 JSON)，並淘汰過舊項目"""
+    npz_path, meta_path = _iss_cache_paths(cache_key)
+    try:
+        np.savez_compressed(
+            npz_path,
+            iss_dbm=cached_data["iss_dbm"],
+            tss_dbm=cached_data["tss_dbm"],
+            x_unique=cached_data["x_unique"],
+            y_unique=cached_data["y_unique"],
+            peak_coords=np.asarray(cached_data["peak_coords"], dtype=np.int64).reshape(-1, 2),
+        )
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "all_txs_info": cached_data["all_txs_info"],
+                    "peak_locations_gps": cached_data["peak_locations_gps"],
+                    "timestamp": cached_data["timestamp"],
+                },
+                f,
+                default=_json_default,
+            )
+    except Exception as e:
+        logger.warning(f"寫入 ISS 磁碟快取失敗 ({cache_key[:16]}...): {e}")
+        return
+    _prune_iss_disk_cache(ISS_DISK_CACHE_MAX_ENTRIES)
+
+
+def _prune_iss_disk_cache(max_entries: int) -> None:
+    """僅保留最近使用的 max_entries 筆磁碟快取"""
+    entries = sorted(
+        ISS_CACHE_DIR.glob("*.npz"), key=lambda p: p.stat().st_mtime, reverse=True
+    )
+    for npz_path in entries[max_entries:]:
+        for path in (npz_path, npz_path.with_suffix(".json")):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        logger.info(f"淘汰 ISS 磁碟快取: {npz_path.stem[:16]}...")
+# --- End ISS 地圖快取 ---
+
+
+async def _get_active_devices_by_role(role: str, limit: int = 100) -> List[Device]:
+    """以獨立的 AsyncSession 查詢單一角色的活動設備 (同一個 session 不能併發查詢，供 asyncio.gather 使用)"""
+    async with async_session_maker() as role_session:
+        device_service = DeviceService(SQLModelDeviceRepository(role_session))
+        return await device_service.get_devices(
+            skip=0, limit=limit, role=role, active_only=True
+        )
+
+
 # 新增 ISS Map 生成函數
 async def generate_iss_map(
     session: AsyncSession,
@@ -1911,50 +2340,41 @@ async def generate_iss_map(
     sparse_noise_std_db: float = 0.0, # 給稀疏量測加高斯雜訊(分貝)
     sparse_first_then_full: bool = True,  # 先顯示稀疏點，再顯示完整圖
     sparse_output_path: Optional[str] = None,  # 若要另外輸出稀疏圖
+    render: bool = True,  # False 時只計算 CFAR 峰值，不繪製/保存任何圖檔
 ) -> bool:
     """
     生成干擾信號強度 (ISS) 地圖並進行 2D-CFAR 檢測
     
     從數據庫獲取發射器和干擾器設置，計算並生成 ISS 地圖
-    基於更新後的 ISS_MAP.py 實現
+    基於更新後的 ISS_MAP.py 實現；設備查詢各自開啟 session 併發執行，
+    session 參數保留以維持呼叫介面
     """
     logger.info("開始生成 ISS 地圖...")
 
+    # 本次呼叫建立的圖表，發生錯誤時只關閉這些 (不影響其他進行中的請求)
+    open_figures = []
+
     try:
         # 準備輸出檔案
-        prepare_output_file(output_path, "ISS 地圖圖檔")
+        if render:
+            prepare_output_file(output_path, "ISS 地圖圖檔")
 
         # GPU 設置
         gpus = _setup_gpu()
 
-        # 創建設備服務和儲存庫
-        device_repository = SQLModelDeviceRepository(session)
-        device_service = DeviceService(device_repository)
-
-        # 從數據庫獲取活動的發射器 (desired)
-        logger.info("從數據庫獲取活動的發射器...")
-        active_desired = await device_service.get_devices(
-            skip=0, limit=100, role=DeviceRole.DESIRED.value, active_only=True
-        )
-
-        # 從數據庫獲取活動的干擾器 (jammer)
-        logger.info("從數據庫獲取活動的干擾器...")
-        active_jammers = await device_service.get_devices(
-            skip=0, limit=100, role=DeviceRole.JAMMER.value, active_only=True
+        # 各角色分別查詢並各自限制數量，避免單次查詢的上限截掉整個角色；
+        # 三個查詢各用獨立的 session 併發執行
+        logger.info("從數據庫獲取活動的發射器、干擾器與接收器...")
+        active_desired, active_jammers, active_receivers = await asyncio.gather(
+            _get_active_devices_by_role(DeviceRole.DESIRED.value),
+            _get_active_devices_by_role(DeviceRole.JAMMER.value),
+            _get_active_devices_by_role(DeviceRole.RECEIVER.value),
         )
         
         # 過濾掉隱藏的干擾器
         visible_jammers = [j for j in active_jammers if getattr(j, 'visible', True)]
 
-        # 從數據庫獲取活動的接收器
-        logger.info("從數據庫獲取活動的接收器...")
-        active_receivers = await device_service.get_devices(
-            skip=0, limit=100, role=DeviceRole.RECEIVER.value, active_only=True
-        )
-
         # 生成包含設備座標的快取 key
-        import hashlib
-        import json
         import time
         
         # 確定實際使用的參數值（包括覆蓋參數）
@@ -2029,18 +2449,21 @@ async def generate_iss_map(
             logger.info("強制重新生成地圖 - 跳過快取")
         
         # 生成快取 key
-        cache_key_str = json.dumps(cache_data, sort_keys=True)
-        cache_key = hashlib.md5(cache_key_str.encode()).hexdigest()
+        key_hasher = hashlib.blake2b(digest_size=16)
+        _update_cache_key_hash(key_hasher, cache_data)
+        cache_key = key_hasher.hexdigest()
         logger.info(f"生成快取 key: {cache_key[:16]}... (基於 {len(active_desired)} 發射器, {len(active_jammers)} 干擾器, {len(active_receivers)} 接收器位置)")
         
-        # 檢查全域快取 (這裡假設有一個全域的快取字典)
-        if not hasattr(generate_iss_map, '_iss_cache'):
-            generate_iss_map._iss_cache = {}
-            
         # 檢查快取 (force_refresh 會因為時間戳導致快取未命中)
-        cache_hit = cache_key in generate_iss_map._iss_cache
+        cached_data = generate_iss_map._iss_cache.get(cache_key)
+        if cached_data is None and not force_refresh:
+            # 記憶體未命中時查詢磁碟快取 (程序重啟後仍可重用)
+            cached_data = await asyncio.to_thread(_load_iss_cache_from_disk, cache_key)
+            if cached_data is not None:
+                generate_iss_map._iss_cache.put(cache_key, cached_data)
+                logger.info("✓ 從磁碟快取載入 ISS 地圖數據")
+        cache_hit = cached_data is not None
         if cache_hit:
-            cached_data = generate_iss_map._iss_cache[cache_key]
             logger.info("✓ 使用快取的 ISS 地圖數據 - 設備位置未變更")
         else:
             logger.info("✗ 無快取數據或設備位置已變更，開始計算新的無線電地圖...")
@@ -2077,11 +2500,11 @@ async def generate_iss_map(
         # 快取邏輯分支
         if cache_hit:
             # 使用快取數據
-            cached_data = generate_iss_map._iss_cache[cache_key]
             iss_dbm = cached_data['iss_dbm']
+            TSS_dbm = cached_data['tss_dbm']
             x_unique = cached_data['x_unique']
             y_unique = cached_data['y_unique']
-            peak_coords = cached_data['peak_coords']
+            peak_coords = np.ascontiguousarray(cached_data['peak_coords'], dtype=np.int64).reshape(-1, 2)
             all_txs_info = cached_data['all_txs_info']
             # 檢查是否有GPS峰值數據，如果沒有則計算
             if 'peak_locations_gps' in cached_data:
@@ -2253,71 +2676,64 @@ async def generate_iss_map(
             logger.info("提取無線電地圖數據...")
             # 獲取cell中心座標
             cc = rm.cell_centers.numpy()
-            x_unique = cc[0, :, 0]
-            y_unique = cc[:, 0, 1]
+            # cc[0, :, 0] / cc[:, 0, 1] 為跨步 view，轉為連續陣列以利後續運算與快取
+            x_unique = np.ascontiguousarray(cc[0, :, 0])
+            y_unique = np.ascontiguousarray(cc[:, 0, 1])
 
             # 獲取所有發射器
             all_txs = [scene.get(name) for name in scene.transmitters]
 
-            # 分組：期望發射器和干擾器
-            idx_des = [i for i, tx in enumerate(all_txs) if tx.role == 'desired']
+            # 分組：干擾器索引
             idx_jam = [i for i, tx in enumerate(all_txs) if tx.role == 'jammer']
             logger.info(f"干擾器索引: {idx_jam}")
 
             # 獲取RSS（接收信號強度）
-            WSS = rm.rss[:].numpy()
-            TSS = np.sum(WSS, axis=0)  # 將所有發射器的RSS加總
-            logger.info(f"RSS形狀: {TSS.shape}")
-            DSS = np.sum(WSS[idx_des,:,:], axis=0) if idx_des else np.zeros_like(TSS)
-            ISS = np.sum(WSS[idx_jam,:,:], axis=0) if idx_jam else np.zeros_like(TSS)
+            # 加總與 dBm 轉換都在 GPU 上完成，只將 2-D 結果複製回主機，
+            # 避免整個 (num_tx, H, W) 張量的 host<->device 傳輸
+            WSS = _to_tf_tensor(rm.rss)
+            TSS = tf.reduce_sum(WSS, axis=0)  # 將所有發射器的RSS加總
+            logger.info(f"RSS形狀: {tuple(TSS.shape)}")
+            ISS = tf.reduce_sum(tf.gather(WSS, idx_jam), axis=0) if idx_jam else tf.zeros_like(TSS)
 
             # 使用改進的2D CFAR檢測干擾源位置
-            # 避免除零錯誤，設置最小值
-            ISS_safe = np.maximum(ISS, 1e-12)  # 設置最小值為 1e-12 (避免 log10(0))
-            iss_dbm = 10 * np.log10(ISS_safe / 1e-3)
-            logger.info(f"ISS 原始數據統計: min={np.min(ISS):.2e}, max={np.max(ISS):.2e}, 零值數量={np.sum(ISS == 0)}")
+            # 轉換為 dBm (內部截斷於 1e-12 W 以避免 log10(0))
+            # 地圖全程維持 float32 (後處理為記憶體頻寬瓶頸，避免升級為 float64)
+            iss_dbm = np.ascontiguousarray(_watts_to_dbm_tf(ISS).numpy())
+            logger.info(f"ISS 原始數據統計: min={float(tf.reduce_min(ISS)):.2e}, max={float(tf.reduce_max(ISS)):.2e}, 零值數量={int(tf.math.count_nonzero(ISS == 0))}")
             
             # 計算 TSS (Total Signal Strength) - 所有發射器的信號強度加總
-            TSS_safe = np.maximum(TSS, 1e-12)
-            TSS_dbm = 10 * np.log10(TSS_safe / 1e-3)
-            logger.info(f"TSS 原始數據統計: min={np.min(TSS):.2e}, max={np.max(TSS):.2e}, 零值數量={np.sum(TSS == 0)}")
+            TSS_dbm = np.ascontiguousarray(_watts_to_dbm_tf(TSS).numpy())
+            logger.info(f"TSS 原始數據統計: min={float(tf.reduce_min(TSS)):.2e}, max={float(tf.reduce_max(TSS)):.2e}, 零值數量={int(tf.math.count_nonzero(TSS == 0))}")
 
             # 準備 ISS 地圖數據和 CFAR 檢測
-            iss_smooth = gaussian_filter(iss_dbm, sigma=gaussian_sigma)
+            iss_dbm = np.ascontiguousarray(iss_dbm, dtype=np.float32)
+            iss_smooth = gaussian_filter(
+                iss_dbm, sigma=gaussian_sigma, output=_scratch_like(iss_dbm, "iss_smooth")
+            )
             logger.info(f"生成 ISS 地圖 - 執行 2D-CFAR 檢測")
             
             # 2D-CFAR 偵測 (僅對 ISS 執行)
-            # 先做最大值過濾 (局部最大值)
-            local_max = maximum_filter(iss_smooth, size=5)
-            peaks = (iss_smooth == local_max)
-
             # 簡化的CFAR檢測：直接找最大值峰值
-            iss_max = np.max(iss_smooth)
-            iss_mean = np.mean(iss_smooth)
+            # 最大值位置、平均與標準差一次取得 (numba 可用時為單次走訪)
+            iss_max, peak_row, peak_col, iss_mean, iss_std = _cfar_stats(iss_smooth)
             
             # 只有當最大值明顯高於平均值時才認為有峰值
             # 使用動態範圍的閾值：最大值需要超過平均值 + 2*標準差
-            iss_std = np.std(iss_smooth)
             threshold = iss_mean + 0.1 * iss_std
             
             logger.info(f"CFAR檢測統計: max={iss_max:.2f}, mean={iss_mean:.2f}, std={iss_std:.2f}")
             logger.info(f"CFAR閾值計算: {iss_mean:.2f} + 2×{iss_std:.2f} = {threshold:.2f}")
             
-            peak_coords = []
+            # 峰值座標統一為 (N, 2) int64 陣列 [row, col]
+            peak_coords = np.empty((0, 2), dtype=np.int64)
             if iss_max > threshold:
-                # 找到最大值的位置
-                max_indices = np.where(iss_smooth == iss_max)
-                if len(max_indices[0]) > 0:
-                    # 取第一個最大值位置 - 需要轉換為numpy陣列格式
-                    peak_coords = np.array([[max_indices[0][0], max_indices[1][0]]])
-                    logger.info(f"✓ 檢測到CFAR峰值: 位置({max_indices[0][0]}, {max_indices[1][0]}), 強度{iss_max:.2f}dBm > 閾值{threshold:.2f}dBm")
-                else:
-                    logger.info("✗ 無法定位最大值位置")
+                # 取第一個最大值位置
+                peak_coords = np.array([[peak_row, peak_col]], dtype=np.int64)
+                logger.info(f"✓ 檢測到CFAR峰值: 位置({peak_row}, {peak_col}), 強度{iss_max:.2f}dBm > 閾值{threshold:.2f}dBm")
             else:
                 logger.info(f"✗ 無CFAR峰值: 最大值{iss_max:.2f}dBm ≤ 閾值{threshold:.2f}dBm")
 
-            # 準備 TSS 地圖數據 (不需要 CFAR 檢測)
-            tss_smooth = gaussian_filter(TSS_dbm, sigma=gaussian_sigma)
+            # TSS 地圖不需要 CFAR 檢測，也不需平滑
             logger.info(f"生成 TSS 地圖 - 不執行 CFAR 檢測")
 
             # 保存發射器信息用於可視化
@@ -2334,51 +2750,15 @@ async def generate_iss_map(
             peak_locations_gps = []
             if len(peak_coords) > 0:
                 logger.info(f"計算 {len(peak_coords)} 個CFAR峰值的GPS座標...")
-                from app.api.v1.interference.routes_sparse_scan import frontend_coords_to_gps
-                
-                for i, coord in enumerate(peak_coords):
-                    # coord = [row, col] in the ISS map grid
-                    row_idx, col_idx = coord[0], coord[1]
-                    
-                    # 確保索引在有效範圍內
-                    if 0 <= row_idx < len(y_unique) and 0 <= col_idx < len(x_unique):
-                        # 從grid座標轉換為實際座標（Sionna座標系）
-                        x_sionna = float(x_unique[col_idx])
-                        y_sionna = float(y_unique[row_idx])
-                        
-                        # 從Sionna座標轉換為前端座標
-                        frontend_coords = to_frontend_coords([x_sionna, y_sionna, 0])
-                        x_frontend = frontend_coords[0]
-                        y_frontend = frontend_coords[1]
-                        
-                        # 轉換為GPS座標
-                        gps_coord = frontend_coords_to_gps(x_frontend, y_frontend, 0.0, scene_name)
-                        
-                        # 獲取該位置的ISS強度值
-                        iss_value = float(iss_dbm[row_idx, col_idx]) if row_idx < iss_dbm.shape[0] and col_idx < iss_dbm.shape[1] else 0.0
-                        
-                        peak_info = {
-                            "peak_id": i + 1,
-                            "grid_coords": {"row": int(row_idx), "col": int(col_idx)},
-                            "sionna_coords": {"x": x_sionna, "y": y_sionna},
-                            "frontend_coords": {"x": x_frontend, "y": y_frontend},
-                            "gps_coords": {
-                                "latitude": gps_coord.latitude,
-                                "longitude": gps_coord.longitude,
-                                "altitude": gps_coord.altitude
-                            },
-                            "iss_strength_dbm": iss_value
-                        }
-                        peak_locations_gps.append(peak_info)
-                        
-                        logger.info(f"CFAR峰值 {i+1}: Grid({row_idx}, {col_idx}) -> Frontend({x_frontend:.1f}, {y_frontend:.1f}) -> GPS({gps_coord.latitude:.6f}, {gps_coord.longitude:.6f}), ISS: {iss_value:.1f} dBm")
-                    else:
-                        logger.warning(f"峰值索引 {coord} 超出grid範圍 {iss_dbm.shape}")
+                peak_locations_gps = _cfar_peaks_to_gps(
+                    peak_coords, x_unique, y_unique, iss_dbm, scene_name
+                )
             
             # 保存計算結果到快取
             logger.info("保存計算結果到快取...")
-            generate_iss_map._iss_cache[cache_key] = {
+            cached_data = {
                 'iss_dbm': iss_dbm,
+                'tss_dbm': TSS_dbm,
                 'x_unique': x_unique,
                 'y_unique': y_unique,
                 'peak_coords': peak_coords,
@@ -2386,10 +2766,28 @@ async def generate_iss_map(
                 'all_txs_info': all_txs_info,
                 'timestamp': time.time()
             }
+            generate_iss_map._iss_cache.put(cache_key, cached_data)
             logger.info(f"快取已更新 - 快取大小: {len(generate_iss_map._iss_cache)}")
+            # force_refresh 的 key 含時間戳，不會再次命中，無需寫入磁碟
+            if not force_refresh:
+                await asyncio.to_thread(_save_iss_cache_to_disk, cache_key, cached_data)
 
         # 在此處，不管是從快取還是新計算的數據都已準備好
 
+        # 呼叫端只需要峰值資料時，跳過所有繪圖與存檔
+        if not render:
+            logger.info(f"render=False - 跳過地圖繪製，直接回傳 {len(peak_locations_gps)} 個 CFAR 峰值")
+            return {
+                "success": True,
+                "cfar_peaks_gps": peak_locations_gps,
+                "total_peaks": len(peak_locations_gps)
+            }
+
+        # 設備位置 (Sionna 座標) 只整理一次，繪圖時每種角色各呼叫一次 scatter
+        des_xy = _device_xy_by_role(all_txs_info, "desired")
+        jam_xy = _device_xy_by_role(all_txs_info, "jammer")
+        rx_xy = to_sionna_coords(rx_config[1])
+
         # ====== [新增] UAV 稀疏點抽樣與預覽 ======
         sparse_done = False
         if sparse_first_then_full and (uav_points or num_random_samples > 0):
@@ -2407,7 +2805,7 @@ async def generate_iss_map(
                 rng = np.random.default_rng(1234)
                 xs_rand = rng.uniform(xmin, xmax, size=num_random_samples)
                 ys_rand_front = rng.uniform(y_front_min, y_front_max, size=num_random_samples)
-                pts_frontend = list(zip(xs_rand, ys_rand_front))
+                pts_frontend = np.column_stack((xs_rand, ys_rand_front))
 
             # 2) 在這些點上取樣 ISS(dBm)
             sparse_x_sionna, sparse_y_sionna, sparse_vals_dbm = sample_iss_at_points(
@@ -2415,31 +2813,26 @@ async def generate_iss_map(
             )
 
             # 3) 繪製稀疏預覽圖（只顯示量測點）
-            fig_s, ax_s = plt.subplots(figsize=(7, 5))
+            fig_s, ax_s = plt.subplots(figsize=(7, 5), layout="constrained")
+            open_figures.append(fig_s)
             sc = ax_s.scatter(
                 sparse_x_sionna, sparse_y_sionna,
                 c=sparse_vals_dbm, s=22, marker='o'
             )
-            cbar_s = plt.colorbar(sc, ax=ax_s, label="Measured ISS (dBm)")
+            cbar_s = fig_s.colorbar(sc, ax=ax_s, label="Measured ISS (dBm)")
             ax_s.set_xlabel("x (m)")
             ax_s.set_ylabel("y (m)")
             ax_s.set_title("UAV Sparse ISS Samples")
 
             # 畫設備位置（用 Sionna 座標）
-            for tx_info in all_txs_info:
-                if tx_info['role'] == 'desired':
-                    ax_s.scatter(tx_info['position'][0], tx_info['position'][1],
-                                 c='blue', marker='^', s=80, label='Desired Tx')
-            for tx_info in all_txs_info:
-                if tx_info['role'] == 'jammer':
-                    ax_s.scatter(tx_info['position'][0], tx_info['position'][1],
-                                 c='red', marker='x', s=80, label='Jammer')
-            # 獲取接收器位置
-            rx_name, rx_pos = rx_config
-            rx_obj = scene.get(rx_name)
-            if rx_obj:
-                ax_s.scatter(rx_obj.position[0], rx_obj.position[1],
-                             c='green', marker='o', s=50, label='Rx')
+            if len(des_xy) > 0:
+                ax_s.scatter(des_xy[:, 0], des_xy[:, 1],
+                             c='blue', marker='^', s=80, label='Desired Tx')
+            if len(jam_xy) > 0:
+                ax_s.scatter(jam_xy[:, 0], jam_xy[:, 1],
+                             c='red', marker='x', s=80, label='Jammer')
+            ax_s.scatter(rx_xy[0], rx_xy[1],
+                         c='green', marker='o', s=50, label='Rx')
 
             # 去重 legend
             handles, labels = ax_s.get_legend_handles_labels()
@@ -2447,15 +2840,14 @@ async def generate_iss_map(
             if len(uniq) > 0:
                 ax_s.legend(uniq.values(), uniq.keys(), loc="best")
 
-            plt.tight_layout()
-
             # 是否另存檔（可與完整圖同資料夾，檔名自動加 _sparse）
             sparse_path = sparse_output_path or (
                 os.path.splitext(output_path)[0] + "_sparse.png"
             )
             prepare_output_file(sparse_path, "ISS 稀疏預覽圖檔")
-            plt.savefig(sparse_path, dpi=300, bbox_inches="tight")
+            await _save_map_figure(fig_s, sparse_path)
             plt.close(fig_s)
+            open_figures.remove(fig_s)
             logger.info(f"UAV 稀疏 ISS 預覽已保存: {sparse_path}")
             sparse_done = True
         # ====== [新增結束] ======
@@ -2468,72 +2860,73 @@ async def generate_iss_map(
         
         # Use meshgrid like SINR map for consistent coordinate handling
         X, Y = np.meshgrid(x_unique, y_unique)
+
+        # ISS / TSS / UAV Sparse 三張地圖共用同一個 Figure，
+        # 每張繪製前以 clear() 重置，全部完成後才關閉。
+        # savefig (PNG 編碼) 交由執行緒執行，避免阻塞事件迴圈；
+        # 因 Figure 共用，三次保存依序等待完成後才繪製下一張
+        map_fig = plt.figure(figsize=(8, 6), layout="constrained")
+        open_figures.append(map_fig)
         
         # 生成 ISS 地圖
         def generate_map_visualization(data_dbm, map_title, output_path, include_peaks=False, peak_coords_data=None):
-            plt.figure(figsize=(8, 6))
+            map_fig.clear()
+            ax = map_fig.add_subplot()
             
-            # 檢查是否有有效數據
-            if np.all(np.isnan(data_dbm)) or np.all(data_dbm == -np.inf):
+            # 有限值遮罩只計算一次，後續檢查與顏色範圍都重用；
+            # 原始資料的顏色範圍回傳給呼叫端 (UAV Sparse 地圖沿用 TSS 範圍)
+            finite_vals = data_dbm[np.isfinite(data_dbm)]
+            vmin, vmax = color_range = _color_range_dbm(finite_vals)
+
+            # 檢查是否有有效數據 (有任何有限值時不必再掃描整張地圖)
+            if finite_vals.size == 0 and (np.all(np.isnan(data_dbm)) or np.all(data_dbm == -np.inf)):
                 logger.warning(f"{map_title} 地圖數據全為 NaN 或 -inf，將使用全零數據")
                 data_dbm = np.zeros_like(data_dbm)
+                vmin, vmax = _color_range_dbm(data_dbm.ravel())
             
-            # 設置顏色範圍來改善可視化效果
-            vmin = np.percentile(data_dbm[np.isfinite(data_dbm)], 5) if np.any(np.isfinite(data_dbm)) else -80
-            vmax = np.percentile(data_dbm[np.isfinite(data_dbm)], 95) if np.any(np.isfinite(data_dbm)) else -20
-            
-            plt.pcolormesh(X, Y, data_dbm, shading='nearest', cmap='viridis', vmin=vmin, vmax=vmax)
-            plt.colorbar(label=f"{map_title} (dBm)")
-            plt.title(map_title)
+            mesh = ax.pcolormesh(X, Y, data_dbm, shading='nearest', cmap='viridis', vmin=vmin, vmax=vmax)
+            map_fig.colorbar(mesh, ax=ax, label=f"{map_title} (dBm)")
+            ax.set_title(map_title)
             
             # 標記檢測到的峰值 (僅限 ISS 模式)
             if include_peaks and peak_coords_data is not None and len(peak_coords_data) > 0:
                 peak_x = x_unique[peak_coords_data[:, 1]]
                 peak_y = y_unique[peak_coords_data[:, 0]]
-                plt.scatter(peak_x, peak_y, color='r', marker='+', s=100, label='2D-CFAR Peaks')
+                ax.scatter(peak_x, peak_y, color='r', marker='+', s=100, label='2D-CFAR Peaks')
                 
-            return plt
+            return ax, color_range
             
         # 添加設備位置繪製的共用函數
-        def add_device_positions(rx_config, all_txs_info, scene):
+        def add_device_positions(ax):
             # 期望發射器（藍色三角形）
-            for tx_info in all_txs_info:
-                if tx_info['role'] == 'desired':
-                    plt.scatter(tx_info['position'][0], tx_info['position'][1], c='blue', marker='^', s=100, label='Desired Tx')
+            if len(des_xy) > 0:
+                ax.scatter(des_xy[:, 0], des_xy[:, 1], c='blue', marker='^', s=100, label='Desired Tx')
             
             # 干擾器（紅色X）
-            for tx_info in all_txs_info:
-                if tx_info['role'] == 'jammer':
-                    plt.scatter(tx_info['position'][0], tx_info['position'][1], c='red', marker='x', s=100, label='Jammer')
+            if len(jam_xy) > 0:
+                ax.scatter(jam_xy[:, 0], jam_xy[:, 1], c='red', marker='x', s=100, label='Jammer')
             
             # 接收器（綠色圓圈）
-            rx_name, rx_pos = rx_config
-            rx_obj = scene.get(rx_name)
-            if rx_obj:
-                plt.scatter(rx_obj.position[0], rx_obj.position[1], c='green', marker='o', s=50, label='Rx')
+            ax.scatter(rx_xy[0], rx_xy[1], c='green', marker='o', s=50, label='Rx')
 
         # 1. 生成 ISS 地圖 
-        generate_map_visualization(iss_dbm, "ISS Map with 2D-CFAR Peak Detection", str(ISS_MAP_IMAGE_PATH), 
-                                   include_peaks=True, peak_coords_data=peak_coords)
-        add_device_positions(rx_config, all_txs_info, scene)
-        plt.tight_layout()
-        plt.legend()
+        ax, _ = generate_map_visualization(iss_dbm, "ISS Map with 2D-CFAR Peak Detection", str(ISS_MAP_IMAGE_PATH), 
+                                           include_peaks=True, peak_coords_data=peak_coords)
+        add_device_positions(ax)
+        ax.legend()
         logger.info(f"保存 ISS 地圖到 {ISS_MAP_IMAGE_PATH}")
-        plt.savefig(str(ISS_MAP_IMAGE_PATH), dpi=300, bbox_inches="tight")
-        plt.close()
+        await _save_map_figure(map_fig, str(ISS_MAP_IMAGE_PATH))
 
         # 2. 生成 TSS 地圖
-        generate_map_visualization(TSS_dbm, "TSS Map - Total Signal Strength", str(TSS_MAP_IMAGE_PATH), 
-                                   include_peaks=False)
-        add_device_positions(rx_config, all_txs_info, scene)
-        plt.tight_layout()
-        plt.legend()
+        ax, tss_color_range = generate_map_visualization(TSS_dbm, "TSS Map - Total Signal Strength", str(TSS_MAP_IMAGE_PATH), 
+                                                         include_peaks=False)
+        add_device_positions(ax)
+        ax.legend()
         logger.info(f"保存 TSS 地圖到 {TSS_MAP_IMAGE_PATH}")
-        plt.savefig(str(TSS_MAP_IMAGE_PATH), dpi=300, bbox_inches="tight")
-        plt.close()
+        await _save_map_figure(map_fig, str(TSS_MAP_IMAGE_PATH))
 
         # 3. 生成 UAV Sparse 地圖 (如果有 UAV 點資料)
-        uav_sparse_success = True
+        output_paths = [ISS_MAP_IMAGE_PATH, TSS_MAP_IMAGE_PATH]
         if uav_points and len(uav_points) > 0:
             logger.info(f"生成 UAV Sparse 地圖 - 使用 {len(uav_points)} 個 UAV 掃描點")
             
@@ -2543,110 +2936,79 @@ async def generate_iss_map(
             )
             
             # 創建 UAV Sparse 地圖可視化
-            plt.figure(figsize=(8, 6))
+            map_fig.clear()
+            ax = map_fig.add_subplot()
             
-            # 使用和 TSS 相同的顏色範圍
-            vmin = np.percentile(TSS_dbm[np.isfinite(TSS_dbm)], 5) if np.any(np.isfinite(TSS_dbm)) else -80
-            vmax = np.percentile(TSS_dbm[np.isfinite(TSS_dbm)], 95) if np.any(np.isfinite(TSS_dbm)) else -20
+            # 使用和 TSS 相同的顏色範圍 (繪製 TSS 地圖時已算好)
+            vmin, vmax = tss_color_range
             
-            # 繪製稀疏點
-            sc = plt.scatter(
-                sparse_x_sionna, sparse_y_sionna,
-                c=sparse_vals_dbm, s=50, marker='o', cmap='viridis', 
-                vmin=vmin, vmax=vmax, alpha=0.8
-            )
+            # 繪製稀疏點：點數過多時以 hexbin 聚合，否則預先算好 RGBA
+            # 顏色，讓 scatter 跳過逐點的 colormap 對應
+            use_hexbin = len(sparse_x_sionna) > UAV_SPARSE_HEXBIN_THRESHOLD
+            if use_hexbin:
+                sc = ax.hexbin(
+                    sparse_x_sionna, sparse_y_sionna, C=sparse_vals_dbm,
+                    reduce_C_function=np.mean, gridsize=80, cmap='viridis',
+                    vmin=vmin, vmax=vmax
+                )
+            else:
+                norm = Normalize(vmin=vmin, vmax=vmax)
+                cmap = colormaps['viridis']
+                rgba = cmap(norm(sparse_vals_dbm))
+                # 只對有效取樣設定透明度，NaN 點保留 colormap 的透明 "bad" 顏色
+                rgba[np.isfinite(sparse_vals_dbm), 3] = 0.8
+                ax.scatter(sparse_x_sionna, sparse_y_sionna, c=rgba, s=50, marker='o')
+                sc = ScalarMappable(norm=norm, cmap=cmap)
             
-            plt.colorbar(sc, label="UAV Sparse TSS (dBm)")
-            plt.title("UAV Sparse Map - UAV Trajectory TSS Sampling")
-            plt.xlabel("x (m)")
-            plt.ylabel("y (m)")
+            map_fig.colorbar(sc, ax=ax, label="UAV Sparse TSS (dBm)")
+            ax.set_title("UAV Sparse Map - UAV Trajectory TSS Sampling")
+            ax.set_xlabel("x (m)")
+            ax.set_ylabel("y (m)")
             
             # 添加設備位置
-            add_device_positions(rx_config, all_txs_info, scene)
+            add_device_positions(ax)
             
             # 添加 UAV 軌跡線（連接稀疏點）
-            if len(sparse_x_sionna) > 1:
-                plt.plot(sparse_x_sionna, sparse_y_sionna, 'k--', alpha=0.3, linewidth=1, label='UAV Trajectory')
+            if len(sparse_x_sionna) > 1 and not use_hexbin:
+                step = -(-len(sparse_x_sionna) // UAV_TRAJECTORY_MAX_POINTS)
+                ax.plot(
+                    sparse_x_sionna[::step], sparse_y_sionna[::step], 'k--',
+                    alpha=0.3, linewidth=1, rasterized=True, label='UAV Trajectory'
+                )
             
-            plt.tight_layout()
-            plt.legend()
+            ax.legend()
             logger.info(f"保存 UAV Sparse 地圖到 {UAV_SPARSE_MAP_IMAGE_PATH}")
-            plt.savefig(str(UAV_SPARSE_MAP_IMAGE_PATH), dpi=300, bbox_inches="tight")
-            plt.close()
-            
-            # 檢查 UAV Sparse 地圖文件是否生成成功
-            uav_sparse_success = verify_output_file(str(UAV_SPARSE_MAP_IMAGE_PATH))
-            logger.info(f"UAV Sparse 地圖生成 {'成功' if uav_sparse_success else '失敗'}")
+            await _save_map_figure(map_fig, str(UAV_SPARSE_MAP_IMAGE_PATH))
+            output_paths.append(UAV_SPARSE_MAP_IMAGE_PATH)
         else:
             logger.info("未提供 UAV 點資料，跳過 UAV Sparse 地圖生成")
+        plt.close(map_fig)
+        open_figures.remove(map_fig)
 
         # 記錄檢測結果
-        logger.info(f"檢測到 {len(peak_coords)} 個干擾源峰值")
-        for i, coord in enumerate(peak_coords):
-            logger.info(f"峰值 {i+1}: 行={coord[0]}, 列={coord[1]}")
+        logger.info("檢測到 %d 個干擾源峰值", len(peak_coords))
+        if len(peak_coords) > 0 and logger.isEnabledFor(logging.INFO):
+            logger.info("\n".join(
+                f"峰值 {i+1}: 行={coord[0]}, 列={coord[1]}" for i, coord in enumerate(peak_coords)
+            ))
         logger.info("ISS, TSS 和 UAV Sparse 地圖都已生成完成")
 
-        # 檢查所有文件是否都生成成功
-        iss_success = verify_output_file(str(ISS_MAP_IMAGE_PATH))
-        tss_success = verify_output_file(str(TSS_MAP_IMAGE_PATH))
-        
-        # 將峰值數據轉換為GPS座標（用於直接返回）
-        cfar_peaks_gps = []
-        if len(peak_coords) > 0:
-            logger.info(f"轉換 {len(peak_coords)} 個CFAR峰值為GPS座標...")
-            from app.api.v1.interference.routes_sparse_scan import frontend_coords_to_gps
-            
-            for i, coord in enumerate(peak_coords):
-                # coord = [row, col] in the ISS map grid
-                row_idx, col_idx = coord[0], coord[1]
-                
-                # 確保索引在有效範圍內
-                if 0 <= row_idx < len(y_unique) and 0 <= col_idx < len(x_unique):
-                    # 從grid座標轉換為實際座標（Sionna座標系）
-                    x_sionna = float(x_unique[col_idx])
-                    y_sionna = float(y_unique[row_idx])
-                    
-                    # 從Sionna座標轉換為前端座標
-                    frontend_coords = to_frontend_coords([x_sionna, y_sionna, 0])
-                    x_frontend = frontend_coords[0]
-                    y_frontend = frontend_coords[1]
-                    
-                    # 轉換為GPS座標
-                    gps_coord = frontend_coords_to_gps(x_frontend, y_frontend, 0.0, scene_name)
-                    
-                    # 獲取該位置的ISS強度值
-                    iss_value = float(iss_dbm[row_idx, col_idx]) if row_idx < iss_dbm.shape[0] and col_idx < iss_dbm.shape[1] else 0.0
-                    
-                    peak_info = {
-                        "peak_id": i + 1,
-                        "grid_coords": {"row": int(row_idx), "col": int(col_idx)},
-                        "sionna_coords": {"x": x_sionna, "y": y_sionna},
-                        "frontend_coords": {"x": x_frontend, "y": y_frontend},
-                        "gps_coords": {
-                            "latitude": gps_coord.latitude,
-                            "longitude": gps_coord.longitude,
-                            "altitude": gps_coord.altitude
-                        },
-                        "iss_strength_dbm": iss_value
-                    }
-                    cfar_peaks_gps.append(peak_info)
-                    
-                    logger.info(f"CFAR峰值 {i+1}: Grid({row_idx}, {col_idx}) -> Frontend({x_frontend:.1f}, {y_frontend:.1f}) -> GPS({gps_coord.latitude:.6f}, {gps_coord.longitude:.6f}), ISS: {iss_value:.1f} dBm")
-                else:
-                    logger.warning(f"峰值索引 {coord} 超出grid範圍 {iss_dbm.shape}")
+        # 檢查所有文件是否都生成成功 (每個檔案各一次 stat，最後統一判斷)
+        file_checks = [verify_output_file(str(path)) for path in output_paths]
         
-        # 返回成功狀態和峰值數據
-        overall_success = iss_success and tss_success and uav_sparse_success
+        # 返回成功狀態和峰值數據 (GPS 座標已於計算或載入快取時取得)
+        overall_success = all(file_checks)
         return {
             "success": overall_success,
-            "cfar_peaks_gps": cfar_peaks_gps,
-            "total_peaks": len(cfar_peaks_gps)
+            "cfar_peaks_gps": peak_locations_gps,
+            "total_peaks": len(peak_locations_gps)
         }
 
     except Exception as e:
         logger.exception(f"生成 ISS 地圖時發生錯誤: {e}")
-        # 確保關閉所有打開的圖表
-        plt.close("all")
+        # 只關閉本次呼叫建立的圖表
+        for fig in open_figures:
+            plt.close(fig)
         return {
             "success": False,
             "cfar_peaks_gps": [],
@@ -2655,14 +3017,26 @@ async def generate_iss_map(
         }
 
 
+# ISS 地圖記憶體快取 (以函數屬性保存，與既有呼叫方式相容)
+generate_iss_map._iss_cache = _IssCache(ISS_MEMORY_CACHE_MAX_ENTRIES)
+
+
 # --- 主服務類 ---
 class SionnaSimulationService(SimulationServiceInterface):
     """Sionna模擬服務實現"""
 
     def __init__(self):
         """初始化服務"""
-        # 可根據需要在這裡添加初始化邏輯
-        pass
+        # 模擬類型 -> (輸出路徑, 模擬方法, 參數建構函數)
+        self._dispatch = {
+            "cfr": (CFR_PLOT_IMAGE_PATH, self.generate_cfr_plot, self._no_kwargs),
+            "sinr_map": (SINR_MAP_IMAGE_PATH, self.generate_sinr_map, self._sinr_map_kwargs),
+            "doppler": (DOPPLER_IMAGE_PATH, self.generate_doppler_plots, self._no_kwargs),
+            "channel_response": (
+                CHANNEL_RESPONSE_IMAGE_PATH, self.generate_channel_response_plots, self._no_kwargs
+            ),
+            "iss_map": (ISS_MAP_IMAGE_PATH, self.generate_iss_map, self._iss_map_kwargs),
+        }
 
     # --- 實現接口定義的方法 ---
 
@@ -2808,6 +3182,7 @@ class SionnaSimulationService(SimulationServiceInterface):
         sparse_noise_std_db: float = 0.0,
         sparse_first_then_full: bool = True,
         sparse_output_path: Optional[str] = None,
+        render: bool = True,
     ) -> bool:
         """生成干擾信號強度 (ISS) 地圖並進行 2D-CFAR 檢測"""
         logger.info(
@@ -2835,6 +3210,7 @@ class SionnaSimulationService(SimulationServiceInterface):
             sparse_noise_std_db=sparse_noise_std_db,
             sparse_first_then_full=sparse_first_then_full,
             sparse_output_path=sparse_output_path,
+            render=render,
         )
 
     async def run_simulation(
@@ -2845,62 +3221,19 @@ class SionnaSimulationService(SimulationServiceInterface):
 
         result = {"success": False, "result_path": None, "error_message": None}
 
-        try:
-            # 根據模擬類型執行不同的模擬
-            if params.simulation_type == "cfr":
-                output_path = str(CFR_PLOT_IMAGE_PATH)
-                success = await self.generate_cfr_plot(session, output_path)
-                result["result_path"] = output_path
-                result["success"] = success
-
-            elif params.simulation_type == "sinr_map":
-                output_path = str(SINR_MAP_IMAGE_PATH)
-                success = await self.generate_sinr_map(
-                    session,
-                    output_path,
-                    params.sinr_vmin or -40.0,
-                    params.sinr_vmax or 0.0,
-                    params.cell_size or 1.0,
-                    params.samples_per_tx or 10**7,
-                )
-                result["result_path"] = output_path
-                result["success"] = success
-
-            elif params.simulation_type == "doppler":
-                output_path = str(DOPPLER_IMAGE_PATH)
-                success = await self.generate_doppler_plots(session, output_path)
-                result["result_path"] = output_path
-                result["success"] = success
-
-            elif params.simulation_type == "channel_response":
-                output_path = str(CHANNEL_RESPONSE_IMAGE_PATH)
-                success = await self.generate_channel_response_plots(
-                    session, output_path
-                )
-                result["result_path"] = output_path
-                result["success"] = success
-
-            elif params.simulation_type == "iss_map":
-                output_path = str(ISS_MAP_IMAGE_PATH)
-                success = await self.generate_iss_map(
-                    session,
-                    output_path,
-                    scene_name="nycu",
-                    scene_size=params.scene_size or 128.0,
-                    altitude=params.altitude or 30.0,
-                    resolution=params.resolution or 4.0,
-                    cfar_threshold_percentile=params.cfar_threshold_percentile or 99.5,
-                    gaussian_sigma=params.gaussian_sigma or 1.0,
-                    min_distance=params.min_distance or 3,
-                    cell_size=params.cell_size or 1.0,
-                    samples_per_tx=params.samples_per_tx or 10**7,
-                )
-                result["result_path"] = output_path
-                result["success"] = success
+        entry = self._dispatch.get(params.simulation_type)
+        if entry is None:
+            logger.error(f"不支援的模擬類型: {params.simulation_type}")
+            result["error_message"] = f"不支援的模擬類型: {params.simulation_type}"
+            return result
 
-            else:
-                logger.error(f"不支援的模擬類型: {params.simulation_type}")
-                result["error_message"] = f"不支援的模擬類型: {params.simulation_type}"
+        output_path, runner, build_kwargs = entry
+        output_path = str(output_path)
+        try:
+            # 根據模擬類型執行對應的模擬
+            success = await runner(session, output_path, **build_kwargs(params))
+            result["result_path"] = output_path
+            result["success"] = success
 
         except Exception as e:
             logger.error(f"執行模擬時發生錯誤: {str(e)}", exc_info=True)
@@ -2908,6 +3241,35 @@ class SionnaSimulationService(SimulationServiceInterface):
 
         return result
 
+    # --- run_simulation 各模擬類型的參數建構 (未提供的參數使用預設值) ---
+
+    @staticmethod
+    def _no_kwargs(params: SimulationParameters) -> Dict[str, Any]:
+        return {}
+
+    @staticmethod
+    def _sinr_map_kwargs(params: SimulationParameters) -> Dict[str, Any]:
+        return {
+            "sinr_vmin": params.sinr_vmin or -40.0,
+            "sinr_vmax": params.sinr_vmax or 0.0,
+            "cell_size": params.cell_size or 1.0,
+            "samples_per_tx": params.samples_per_tx or 10**7,
+        }
+
+    @staticmethod
+    def _iss_map_kwargs(params: SimulationParameters) -> Dict[str, Any]:
+        return {
+            "scene_name": "nycu",
+            "scene_size": params.scene_size or 128.0,
+            "altitude": params.altitude or 30.0,
+            "resolution": params.resolution or 4.0,
+            "cfar_threshold_percentile": params.cfar_threshold_percentile or 99.5,
+            "gaussian_sigma": params.gaussian_sigma or 1.0,
+            "min_distance": params.min_distance or 3,
+            "cell_size": params.cell_size or 1.0,
+            "samples_per_tx": params.samples_per_tx or 10**7,
+        }
+
 
 # 創建服務實例
 sionna_service = SionnaSimulationService()
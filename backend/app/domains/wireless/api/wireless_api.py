@@ -3,12 +3,17 @@ Wireless Domain API
 提供 Sionna 無線通道模擬和 UERANSIM 轉換的 API 端點
 """
 
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 from typing import List, Dict, Any, Optional
+from collections import Counter
 from datetime import datetime
-import uuid
+import secrets
 import logging
 
+import orjson
+
 from ..models.channel_models import (
     ChannelSimulationRequest,
     SionnaChannelResponse,
@@ -23,12 +28,163 @@ from ..services.channel_conversion_service import ChannelToRANConversionService
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+# 字典型回應 (/metrics, /statistics, /health ...) 預設以 orjson 序列化
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # 服務實例 (在實際部署中應該透過依賴注入)
 sionna_service = SionnaChannelSimulationService()
 conversion_service = ChannelToRANConversionService()
 
+# 快速模擬 / 衛星 NTN 的請求模板 (只驗證一次，每次請求以 model_copy 覆寫變動欄位)
+_QUICK_SIMULATION_TEMPLATE = ChannelSimulationRequest(
+    simulation_id="_template_",
+    environment_type="urban",
+    carrier_frequency_hz=2.1e9,
+    bandwidth_hz=20e6,
+    transmitters=[{"position": [0, 0, 30]}],
+    receivers=[{"position": [1000, 0, 1.5]}],
+)
+_SATELLITE_SIMULATION_TEMPLATE = ChannelSimulationRequest(
+    simulation_id="_template_",
+    environment_type="satellite",
+    carrier_frequency_hz=20e9,
+    bandwidth_hz=100e6,
+    transmitters=[{"position": [0, 0, 550_000]}],
+    receivers=[{"position": [0, 0, 0]}],
+    max_reflections=0,  # 衛星通信主要是直射路徑
+    diffraction_enabled=False,
+    scattering_enabled=False,
+)
+
+# 列表回應的序列化器 (模組載入時建立一次，直接輸出 JSON bytes)
+_CHANNEL_RESPONSES_ADAPTER = TypeAdapter(List[SionnaChannelResponse])
+_CONVERSION_RESULTS_ADAPTER = TypeAdapter(List[ChannelToRANConversionResult])
+
+
+# 轉換歷史預設省略的大型欄位 (原始通道的打包通道矩陣)
+_HISTORY_MATRIX_EXCLUDE = {
+    "__all__": {"source_channel": {"channel_matrix", "channel_matrix_shape"}}
+}
+
+
+def _json_list_response(
+    adapter: TypeAdapter,
+    items: List[Any],
+    exclude: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """以 TypeAdapter 一次序列化整個列表，略過 FastAPI 逐項的 response_model 驗證"""
+    return Response(
+        content=adapter.dump_json(items, exclude=exclude),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+# 支援的通道類型為靜態資料，模組載入時建立並預先序列化一次
+_CHANNEL_TYPES_PAYLOAD: Dict[str, Any] = {
+    "supported_environments": [
+        {
+            "type": "urban",
+            "description": "密集城市環境",
+            "typical_path_loss_db": 128.1,
+            "max_reflections": 3,
+            "frequency_range_ghz": [0.7, 6.0],
+            "use_cases": ["5G城市部署", "密集基站覆蓋"],
+        },
+        {
+            "type": "suburban",
+            "description": "郊區環境",
+            "typical_path_loss_db": 120.9,
+            "max_reflections": 2,
+            "frequency_range_ghz": [0.7, 6.0],
+            "use_cases": ["郊區覆蓋", "中密度部署"],
+        },
+        {
+            "type": "rural",
+            "description": "鄉村環境",
+            "typical_path_loss_db": 113.2,
+            "max_reflections": 1,
+            "frequency_range_ghz": [0.7, 6.0],
+            "use_cases": ["廣域覆蓋", "低密度部署"],
+        },
+        {
+            "type": "indoor",
+            "description": "室內環境",
+            "typical_path_loss_db": 89.5,
+            "max_reflections": 5,
+            "frequency_range_ghz": [2.4, 60.0],
+            "use_cases": ["室內覆蓋", "企業網路", "WiFi 6E"],
+        },
+        {
+            "type": "satellite",
+            "description": "衛星通信環境",
+            "typical_path_loss_db": 162.4,
+            "max_reflections": 0,
+            "frequency_range_ghz": [10.0, 30.0],
+            "use_cases": ["衛星通信", "NTN", "回程連線"],
+        },
+    ],
+    "supported_features": [
+        "多路徑傳播建模",
+        "Ray tracing 支援",
+        "GPU 加速計算",
+        "3GPP 標準 CQI 映射",
+        "動態通道更新",
+        "批次處理支援",
+    ],
+    "frequency_bands": {
+        "sub6_ghz": {"range": [0.7, 6.0], "description": "Sub-6GHz 頻段"},
+        "mmwave": {"range": [24.0, 40.0], "description": "毫米波頻段"},
+        "satellite": {"range": [10.0, 30.0], "description": "衛星通信頻段"},
+    },
+}
+_CHANNEL_TYPES_JSON = orjson.dumps(_CHANNEL_TYPES_PAYLOAD)
+
+# UERANSIM gNodeB YAML 配置模板 (以 str.format_map 填入參數)
+_UERANSIM_GNB_YAML_TEMPLATE = """# UERANSIM gNodeB Configuration for {gnb_id}
+# Generated at: {generated_at}
+
+mcc: '{mcc}'
+mnc: '{mnc}'
+nci: {cell_id}
+idLength: 32
+tac: {tac}
+
+linkIp: 127.0.0.1
+ngapIp: 127.0.0.1  
+gtpIp: 127.0.0.1
+
+# List of AMF address information
+amfConfigs:
+  - address: 127.0.0.1
+    port: 38412
+
+# List of supported PLMNs
+plmns:
+  - mcc: '{mcc}'
+    mnc: '{mnc}'
+    sst: 1
+    sd: 0x010203
+
+# List of supported S-NSSAIs
+slices:
+  - sst: 1
+    sd: 0x010203
+    default: true
+
+# Radio configuration
+frequency: {frequency_mhz}
+bandwidth: {bandwidth_mhz}
+txPower: {tx_power_dbm}
+
+# Position
+position:
+  x: {position_x}
+  y: {position_y}
+  z: {position_z}
+"""
+
 
 @router.post("/simulate", response_model=List[SionnaChannelResponse], tags=["通道模擬"])
 async def simulate_wireless_channel(
@@ -62,7 +218,7 @@ async def simulate_wireless_channel(
         logger.info(
             f"通道模擬完成: {request.simulation_id}, 產生 {len(results)} 個響應"
         )
-        return results
+        return _json_list_response(_CHANNEL_RESPONSES_ADAPTER, results)
 
     except Exception as e:
         logger.error(f"通道模擬失敗: {e}")
@@ -78,6 +234,7 @@ async def convert_channel_to_ran(
     gnb_id: str = Query(..., description="gNodeB ID"),
     noise_figure_db: float = Query(7.0, description="噪音指數 (dB)"),
     antenna_gain_db: float = Query(15.0, description="天線增益 (dB)"),
+    include_debug: bool = Query(False, description="是否附上除錯資訊"),
 ) -> ChannelToRANConversionResult:
     """
     將 Sionna 通道響應轉換為 UERANSIM 可用的 RAN 參數
@@ -97,6 +254,7 @@ async def convert_channel_to_ran(
             gnb_id=gnb_id,
             noise_figure_db=noise_figure_db,
             antenna_gain_db=antenna_gain_db,
+            include_debug=include_debug,
         )
 
         logger.info(f"通道轉換完成: {result.conversion_id}")
@@ -114,22 +272,38 @@ async def convert_channel_to_ran(
 )
 async def batch_convert_channels_to_ran(
     request: BatchChannelConversionRequest,
+    include_debug: bool = Query(False, description="是否附上除錯資訊"),
 ) -> List[ChannelToRANConversionResult]:
     """
     批次轉換多個通道響應為 RAN 參數
 
-    適用於大規模模擬或多個 UE 的同時處理
+    適用於大規模模擬或多個 UE 的同時處理；
+    轉換失敗的通道數以 X-Failed-Channel-Count 回應標頭回報
     """
     try:
         logger.info(
             f"開始批次轉換: {request.batch_id}, 通道數: {len(request.channels)}"
         )
 
-        results = await conversion_service.batch_convert_channels(request)
+        failed_channel_ids: List[str] = []
+        results = await conversion_service.batch_convert_channels(
+            request,
+            include_debug=include_debug,
+            failed_channel_ids=failed_channel_ids,
+        )
 
-        logger.info(f"批次轉換完成: {request.batch_id}, 成功: {len(results)}")
-        return results
+        logger.info(
+            f"批次轉換完成: {request.batch_id}, 成功: {len(results)}, "
+            f"失敗: {len(failed_channel_ids)}"
+        )
+        return _json_list_response(
+            _CONVERSION_RESULTS_ADAPTER,
+            results,
+            headers={"X-Failed-Channel-Count": str(len(failed_channel_ids))},
+        )
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"批次轉換請求無效: {str(e)}")
     except Exception as e:
         logger.error(f"批次轉換失敗: {e}")
         raise HTTPException(status_code=500, detail=f"批次轉換失敗: {str(e)}")
@@ -191,13 +365,18 @@ async def get_channel_model_metrics() -> ChannelModelMetrics:
 async def get_conversion_history(
     limit: int = Query(100, ge=1, le=1000, description="返回記錄數量"),
     since: Optional[datetime] = Query(None, description="起始時間"),
+    include_matrix: bool = Query(False, description="是否包含原始通道矩陣"),
 ) -> List[ChannelToRANConversionResult]:
-    """獲取轉換歷史記錄"""
+    """獲取轉換歷史記錄 (預設省略通道矩陣)"""
     try:
         history = await conversion_service.get_conversion_history(
             limit=limit, since=since
         )
-        return history
+        return _json_list_response(
+            _CONVERSION_RESULTS_ADAPTER,
+            history,
+            exclude=None if include_matrix else _HISTORY_MATRIX_EXCLUDE,
+        )
 
     except Exception as e:
         logger.error(f"獲取轉換歷史失敗: {e}")
@@ -225,34 +404,39 @@ async def quick_simulation_and_conversion(
     """
     try:
         # 建立模擬請求
-        simulation_id = f"quick_{uuid.uuid4().hex[:8]}"
-        simulation_request = ChannelSimulationRequest(
-            simulation_id=simulation_id,
-            environment_type=environment_type,
-            carrier_frequency_hz=frequency_ghz * 1e9,
-            bandwidth_hz=bandwidth_mhz * 1e6,
-            transmitters=[{"position": tx_position}],
-            receivers=[{"position": rx_position}],
+        simulation_id = f"quick_{secrets.token_hex(4)}"
+        simulation_request = _QUICK_SIMULATION_TEMPLATE.model_copy(
+            update={
+                "simulation_id": simulation_id,
+                "environment_type": environment_type,
+                "carrier_frequency_hz": frequency_ghz * 1e9,
+                "bandwidth_hz": bandwidth_mhz * 1e6,
+                "transmitters": [{"position": tx_position}],
+                "receivers": [{"position": rx_position}],
+            }
         )
 
         # 執行模擬
         logger.info(f"執行快速模擬: {simulation_id}")
         channel_responses = await sionna_service.simulate_channel(simulation_request)
 
-        # 轉換所有通道響應
-        conversion_results = []
-        for channel_response in channel_responses:
-            result = await conversion_service.convert_channel_to_ran(
-                channel_response=channel_response, ue_id=ue_id, gnb_id=gnb_id
-            )
-            # 添加環境類型到調試信息
+        # 一次批次轉換所有通道響應
+        conversion_results = await conversion_service.batch_convert_channels(
+            BatchChannelConversionRequest(
+                batch_id=simulation_id,
+                channels=channel_responses,
+                target_ue_ids=[ue_id],
+            ),
+            gnb_id=gnb_id,
+        )
+        # 添加環境類型到調試信息
+        for result in conversion_results:
             result.debug_info["environment_type"] = environment_type
-            conversion_results.append(result)
 
         logger.info(
             f"快速模擬完成: {simulation_id}, 產生 {len(conversion_results)} 個轉換結果"
         )
-        return conversion_results
+        return _json_list_response(_CONVERSION_RESULTS_ADAPTER, conversion_results)
 
     except Exception as e:
         logger.error(f"快速模擬失敗: {e}")
@@ -279,43 +463,42 @@ async def satellite_ntn_simulation(
     專門針對衛星通信場景進行最佳化的模擬和轉換
     """
     try:
-        simulation_id = f"ntn_{uuid.uuid4().hex[:8]}"
+        simulation_id = f"ntn_{secrets.token_hex(4)}"
 
         # 計算衛星位置 (簡化為直接在地面站上方)
         satellite_position = [0, 0, satellite_altitude_km * 1000]  # 轉換為米
         ground_position = [0, 0, 0]  # 地面參考點
 
-        simulation_request = ChannelSimulationRequest(
-            simulation_id=simulation_id,
-            environment_type="satellite",
-            carrier_frequency_hz=frequency_ghz * 1e9,
-            bandwidth_hz=bandwidth_mhz * 1e6,
-            transmitters=[{"position": satellite_position}],
-            receivers=[{"position": ground_position}],
-            max_reflections=0,  # 衛星通信主要是直射路徑
-            diffraction_enabled=False,
-            scattering_enabled=False,
+        simulation_request = _SATELLITE_SIMULATION_TEMPLATE.model_copy(
+            update={
+                "simulation_id": simulation_id,
+                "carrier_frequency_hz": frequency_ghz * 1e9,
+                "bandwidth_hz": bandwidth_mhz * 1e6,
+                "transmitters": [{"position": satellite_position}],
+                "receivers": [{"position": ground_position}],
+            }
         )
 
         logger.info(f"執行衛星 NTN 模擬: {simulation_id}")
         channel_responses = await sionna_service.simulate_channel(simulation_request)
 
-        # 轉換為 RAN 參數，考慮衛星通信的特殊性
-        conversion_results = []
-        for channel_response in channel_responses:
-            result = await conversion_service.convert_channel_to_ran(
-                channel_response=channel_response,
-                ue_id=ue_id,
-                gnb_id=gnb_id,
-                noise_figure_db=3.0,  # 衛星接收機通常有更低的噪音指數
-                antenna_gain_db=35.0,  # 衛星天線增益較高
-            )
-            # 添加環境類型到調試信息
+        # 轉換為 RAN 參數，考慮衛星通信的特殊性 (一次批次轉換)
+        conversion_results = await conversion_service.batch_convert_channels(
+            BatchChannelConversionRequest(
+                batch_id=simulation_id,
+                channels=channel_responses,
+                target_ue_ids=[ue_id],
+            ),
+            gnb_id=gnb_id,
+            noise_figure_db=3.0,  # 衛星接收機通常有更低的噪音指數
+            antenna_gain_db=35.0,  # 衛星天線增益較高
+        )
+        # 添加環境類型到調試信息
+        for result in conversion_results:
             result.debug_info["environment_type"] = "satellite"
-            conversion_results.append(result)
 
         logger.info(f"衛星 NTN 模擬完成: {simulation_id}")
-        return conversion_results
+        return _json_list_response(_CONVERSION_RESULTS_ADAPTER, conversion_results)
 
     except Exception as e:
         logger.error(f"衛星 NTN 模擬失敗: {e}")
@@ -369,26 +552,29 @@ async def get_wireless_statistics() -> Dict[str, Any]:
         # 獲取轉換歷史統計
         conversion_history = await conversion_service.get_conversion_history(limit=1000)
 
-        # 計算統計信息
+        # 單次走訪轉換歷史，同時累計成功數、環境類型 / CQI 分佈與最近 100 筆的平均值
         total_conversions = len(conversion_history)
-        successful_conversions = sum(
-            1 for conv in conversion_history if conv.ran_parameters.cqi > 0
-        )
-
-        # 計算環境類型分佈
-        environment_distribution = {}
-        for conv in conversion_history:
+        recent_start = total_conversions - 100
+        successful_conversions = 0
+        environment_distribution: Counter = Counter()
+        cqi_distribution: Counter = Counter()
+        recent_sinr_sum = 0.0
+        recent_throughput_sum = 0.0
+        recent_count = 0
+        for i, conv in enumerate(conversion_history):
+            ran_parameters = conv.ran_parameters
+            cqi = ran_parameters.cqi
+            if cqi > 0:
+                successful_conversions += 1
             # 從調試信息中獲取環境類型，或使用默認值
-            env_type = conv.debug_info.get("environment_type", "unknown")
-            environment_distribution[env_type] = (
-                environment_distribution.get(env_type, 0) + 1
-            )
-
-        # 計算 CQI 分佈
-        cqi_distribution = {}
-        for conv in conversion_history:
-            cqi = conv.ran_parameters.cqi
-            cqi_distribution[str(cqi)] = cqi_distribution.get(str(cqi), 0) + 1
+            environment_distribution[
+                conv.debug_info.get("environment_type", "unknown")
+            ] += 1
+            cqi_distribution[str(cqi)] += 1
+            if i >= recent_start:
+                recent_sinr_sum += ran_parameters.sinr_db
+                recent_throughput_sum += ran_parameters.throughput_mbps
+                recent_count += 1
 
         statistics = {
             "timestamp": datetime.utcnow().isoformat(),
@@ -405,29 +591,17 @@ async def get_wireless_statistics() -> Dict[str, Any]:
                 "memory_usage_mb": metrics.memory_usage_mb,
             },
             "distributions": {
-                "environment_types": environment_distribution,
-                "cqi_levels": cqi_distribution,
+                "environment_types": dict(environment_distribution),
+                "cqi_levels": dict(cqi_distribution),
             },
             "performance": {
                 "active_simulations": len(sionna_service.active_simulations),
                 "cache_hit_rate": conversion_service.get_cache_hit_rate(),
                 "average_sinr_db": (
-                    sum(
-                        conv.ran_parameters.sinr_db
-                        for conv in conversion_history[-100:]
-                    )
-                    / min(100, len(conversion_history))
-                    if conversion_history
-                    else 0.0
+                    recent_sinr_sum / recent_count if recent_count else 0.0
                 ),
                 "average_throughput_mbps": (
-                    sum(
-                        conv.ran_parameters.throughput_mbps
-                        for conv in conversion_history[-100:]
-                    )
-                    / min(100, len(conversion_history))
-                    if conversion_history
-                    else 0.0
+                    recent_throughput_sum / recent_count if recent_count else 0.0
                 ),
             },
         }
@@ -440,72 +614,9 @@ async def get_wireless_statistics() -> Dict[str, Any]:
 
 
 @router.get("/channel-types", tags=["通道管理"])
-async def get_supported_channel_types() -> Dict[str, Any]:
+async def get_supported_channel_types() -> Response:
     """獲取支援的通道類型列表"""
-    try:
-        channel_types = {
-            "supported_environments": [
-                {
-                    "type": "urban",
-                    "description": "密集城市環境",
-                    "typical_path_loss_db": 128.1,
-                    "max_reflections": 3,
-                    "frequency_range_ghz": [0.7, 6.0],
-                    "use_cases": ["5G城市部署", "密集基站覆蓋"],
-                },
-                {
-                    "type": "suburban",
-                    "description": "郊區環境",
-                    "typical_path_loss_db": 120.9,
-                    "max_reflections": 2,
-                    "frequency_range_ghz": [0.7, 6.0],
-                    "use_cases": ["郊區覆蓋", "中密度部署"],
-                },
-                {
-                    "type": "rural",
-                    "description": "鄉村環境",
-                    "typical_path_loss_db": 113.2,
-                    "max_reflections": 1,
-                    "frequency_range_ghz": [0.7, 6.0],
-                    "use_cases": ["廣域覆蓋", "低密度部署"],
-                },
-                {
-                    "type": "indoor",
-                    "description": "室內環境",
-                    "typical_path_loss_db": 89.5,
-                    "max_reflections": 5,
-                    "frequency_range_ghz": [2.4, 60.0],
-                    "use_cases": ["室內覆蓋", "企業網路", "WiFi 6E"],
-                },
-                {
-                    "type": "satellite",
-                    "description": "衛星通信環境",
-                    "typical_path_loss_db": 162.4,
-                    "max_reflections": 0,
-                    "frequency_range_ghz": [10.0, 30.0],
-                    "use_cases": ["衛星通信", "NTN", "回程連線"],
-                },
-            ],
-            "supported_features": [
-                "多路徑傳播建模",
-                "Ray tracing 支援",
-                "GPU 加速計算",
-                "3GPP 標準 CQI 映射",
-                "動態通道更新",
-                "批次處理支援",
-            ],
-            "frequency_bands": {
-                "sub6_ghz": {"range": [0.7, 6.0], "description": "Sub-6GHz 頻段"},
-                "mmwave": {"range": [24.0, 40.0], "description": "毫米波頻段"},
-                "satellite": {"range": [10.0, 30.0], "description": "衛星通信頻段"},
-            },
-        }
-
-        return channel_types
-
-    except Exception as e:
-        logger.error(f"獲取通道類型失敗: {e}")
-        raise HTTPException(status_code=500, detail=f"通道類型查詢失敗: {str(e)}")
+    return Response(content=_CHANNEL_TYPES_JSON, media_type="application/json")
 
 
 @router.post("/generate-ueransim-config", tags=["配置生成"])
@@ -529,17 +640,21 @@ async def generate_ueransim_config(
     try:
         logger.info(f"生成 UERANSIM 配置: gNodeB {gnb_id}")
 
+        # PLMN 只切分一次；時間戳只取一次，讓 JSON 與 YAML 內容一致
+        mcc, mnc = plmn[:3], plmn[3:]
+        now_iso = datetime.utcnow().isoformat()
+
         # 生成 gNodeB 配置
         gnb_config = {
-            "mcc": plmn[:3],
-            "mnc": plmn[3:],
+            "mcc": mcc,
+            "mnc": mnc,
             "nci": cell_id,
             "idLength": 32,
             "tac": tac,
             "linkIp": "127.0.0.1",
             "ngapIp": "127.0.0.1",
             "gtpIp": "127.0.0.1",
-            "plmns": [{"mcc": plmn[:3], "mnc": plmn[3:], "sst": 1, "sd": "0x010203"}],
+            "plmns": [{"mcc": mcc, "mnc": mnc, "sst": 1, "sd": "0x010203"}],
             "slices": [{"sst": 1, "sd": "0x010203", "default": True}],
             "amfConfigs": [{"address": "127.0.0.1", "port": 38412}],
         }
@@ -559,52 +674,26 @@ async def generate_ueransim_config(
 
         # 生成完整配置
         full_config = {
-            "config_id": f"gnb_{gnb_id}_{uuid.uuid4().hex[:8]}",
+            "config_id": f"gnb_{gnb_id}_{secrets.token_hex(4)}",
             "gnb_id": gnb_id,
-            "generated_at": datetime.utcnow().isoformat(),
+            "generated_at": now_iso,
             "config": {"gnb": gnb_config, "radio": radio_config},
-            "config_yaml": f"""# UERANSIM gNodeB Configuration for {gnb_id}
-# Generated at: {datetime.utcnow().isoformat()}
-
-mcc: '{plmn[:3]}'
-mnc: '{plmn[3:]}'
-nci: {cell_id}
-idLength: 32
-tac: {tac}
-
-linkIp: 127.0.0.1
-ngapIp: 127.0.0.1  
-gtpIp: 127.0.0.1
-
-# List of AMF address information
-amfConfigs:
-  - address: 127.0.0.1
-    port: 38412
-
-# List of supported PLMNs
-plmns:
-  - mcc: '{plmn[:3]}'
-    mnc: '{plmn[3:]}'
-    sst: 1
-    sd: 0x010203
-
-# List of supported S-NSSAIs
-slices:
-  - sst: 1
-    sd: 0x010203
-    default: true
-
-# Radio configuration
-frequency: {frequency_mhz}
-bandwidth: {bandwidth_mhz}
-txPower: {tx_power_dbm}
-
-# Position
-position:
-  x: {position_x}
-  y: {position_y}
-  z: {position_z}
-""",
+            "config_yaml": _UERANSIM_GNB_YAML_TEMPLATE.format_map(
+                {
+                    "gnb_id": gnb_id,
+                    "generated_at": now_iso,
+                    "mcc": mcc,
+                    "mnc": mnc,
+                    "cell_id": cell_id,
+                    "tac": tac,
+                    "frequency_mhz": frequency_mhz,
+                    "bandwidth_mhz": bandwidth_mhz,
+                    "tx_power_dbm": tx_power_dbm,
+                    "position_x": position_x,
+                    "position_y": position_y,
+                    "position_z": position_z,
+                }
+            ),
             "notes": [
                 "此配置基於提供的 Sionna 通道模擬參數生成",
                 "請根據實際部署環境調整 IP 地址",
@@ -3,14 +3,30 @@ Wireless Channel Domain Models
 包含 Sionna 無線通道模型的實體定義
 """
 
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+import math
+from functools import cached_property
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Tuple
+from pydantic import BaseModel, ConfigDict, Field, computed_field
+from pydantic.dataclasses import dataclass
 from datetime import datetime
-import numpy as np
 
+if TYPE_CHECKING:  # ChannelPaths 依賴 NumPy，只在實際需要時載入
+    from .channel_paths import ChannelPaths
 
-class ChannelPathComponent(BaseModel):
-    """通道路徑分量"""
+
+class WirelessBaseModel(BaseModel):
+    """無線通道模型的基類：忽略多餘欄位、賦值時不重新驗證"""
+
+    model_config = ConfigDict(
+        extra="ignore",
+        arbitrary_types_allowed=True,
+        validate_assignment=False,
+    )
+
+
+@dataclass(frozen=True, slots=True, config=ConfigDict(extra="ignore"))
+class ChannelPathComponent:
+    """通道路徑分量 (不可變、以 __slots__ 儲存，每個通道可能有數百條)"""
 
     delay_ns: float = Field(..., description="路徑延遲（奈秒）")
     power_db: float = Field(..., description="路徑功率（dB）")
@@ -19,9 +35,12 @@ class ChannelPathComponent(BaseModel):
     doppler_hz: float = Field(default=0.0, description="多普勒頻移（Hz）")
 
 
-class SionnaChannelResponse(BaseModel):
+class SionnaChannelResponse(WirelessBaseModel):
     """Sionna 無線通道響應"""
 
+    # bytes 欄位在 JSON 中以 base64 字串表示
+    model_config = ConfigDict(ser_json_bytes="base64", val_json_bytes="base64")
+
     channel_id: str = Field(..., description="通道 ID")
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
@@ -46,21 +65,45 @@ class SionnaChannelResponse(BaseModel):
     # 多路徑分量
     paths: List[ChannelPathComponent] = Field(default=[], description="多路徑分量")
 
-    # 通道矩陣（複數形式，序列化為實數+虛數）
-    channel_matrix_real: List[List[float]] = Field(
-        default=[], description="通道矩陣實部"
+    # 通道矩陣（complex64 little-endian、row-major 打包為 bytes）
+    channel_matrix: bytes = Field(
+        default=b"", description="通道矩陣 (complex64, row-major)"
     )
-    channel_matrix_imag: List[List[float]] = Field(
-        default=[], description="通道矩陣虛部"
+    channel_matrix_shape: Tuple[int, int] = Field(
+        default=(0, 0), description="通道矩陣形狀 (rows, cols)"
     )
 
-    # 統計特性
-    rms_delay_spread_ns: float = Field(default=0.0, description="RMS 延遲擴散（ns）")
-    coherence_bandwidth_hz: float = Field(default=0.0, description="相干頻寬（Hz）")
-    coherence_time_ms: float = Field(default=0.0, description="相干時間（ms）")
-
-
-class UERANSIMChannelParams(BaseModel):
+    @cached_property
+    def path_arrays(self) -> "ChannelPaths":
+        """多路徑分量的 SoA 視圖 (首次存取時建立)"""
+        from .channel_paths import ChannelPaths
+
+        return ChannelPaths.from_components(self.paths)
+
+    # 統計特性：由路徑與速度推導，首次存取時計算一次並隨回應序列化
+    @computed_field(description="RMS 延遲擴散（ns）")
+    @cached_property
+    def rms_delay_spread_ns(self) -> float:
+        return self.path_arrays.rms_delay_spread_ns
+
+    @computed_field(description="相干頻寬（Hz）")
+    @cached_property
+    def coherence_bandwidth_hz(self) -> float:
+        rms_delay_spread_ns = self.rms_delay_spread_ns
+        return 1 / (5 * rms_delay_spread_ns / 1e9) if rms_delay_spread_ns > 0 else 1e6
+
+    @computed_field(description="相干時間（ms）")
+    @cached_property
+    def coherence_time_ms(self) -> float:
+        relative_velocity = math.dist(self.tx_velocity, self.rx_velocity)
+        doppler_max = relative_velocity * (self.frequency_hz / 1e9) / 3e8
+        coherence_time_s = (
+            9 / (16 * math.pi * doppler_max) if doppler_max > 0 else 1000
+        )
+        return coherence_time_s * 1000
+
+
+class UERANSIMChannelParams(WirelessBaseModel):
     """UERANSIM 通道參數"""
 
     ue_id: str = Field(..., description="UE ID")
@@ -82,7 +125,7 @@ class UERANSIMChannelParams(BaseModel):
     valid_until: datetime = Field(..., description="參數有效期")
 
 
-class ChannelSimulationRequest(BaseModel):
+class ChannelSimulationRequest(WirelessBaseModel):
     """通道模擬請求"""
 
     simulation_id: str = Field(..., description="模擬 ID")
@@ -109,7 +152,7 @@ class ChannelSimulationRequest(BaseModel):
     scattering_enabled: bool = Field(default=True, description="啟用散射")
 
 
-class ChannelToRANConversionResult(BaseModel):
+class ChannelToRANConversionResult(WirelessBaseModel):
     """通道到 RAN 參數轉換結果"""
 
     conversion_id: str = Field(..., description="轉換 ID")
@@ -133,7 +176,7 @@ class ChannelToRANConversionResult(BaseModel):
     debug_info: Dict[str, Any] = Field(default={}, description="除錯資訊")
 
 
-class ChannelUpdateEvent(BaseModel):
+class ChannelUpdateEvent(WirelessBaseModel):
     """通道更新事件"""
 
     event_id: str = Field(..., description="事件 ID")
@@ -150,7 +193,7 @@ class ChannelUpdateEvent(BaseModel):
     requires_immediate_update: bool = Field(default=False, description="需要立即更新")
 
 
-class BatchChannelConversionRequest(BaseModel):
+class BatchChannelConversionRequest(WirelessBaseModel):
     """批次通道轉換請求"""
 
     batch_id: str = Field(..., description="批次 ID")
@@ -160,7 +203,7 @@ class BatchChannelConversionRequest(BaseModel):
     callback_url: Optional[str] = Field(None, description="回調 URL")
 
 
-class ChannelModelMetrics(BaseModel):
+class ChannelModelMetrics(WirelessBaseModel):
     """通道模型指標"""
 
     total_channels_processed: int = Field(default=0, description="處理的通道總數")
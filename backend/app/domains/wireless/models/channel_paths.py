@@ -0,0 +1,75 @@
+"""
+Channel Path Arrays
+多路徑分量的 SoA (Structure of Arrays) 表示，供服務層做向量化統計
+"""
+
+import math
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Iterable
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class ChannelPaths:
+    """多路徑分量，每個欄位為長度 N 的連續 float64 陣列"""
+
+    delay_ns: np.ndarray
+    power_db: np.ndarray
+    azimuth_deg: np.ndarray
+    elevation_deg: np.ndarray
+    doppler_hz: np.ndarray
+
+    @classmethod
+    def from_components(cls, paths: Iterable) -> "ChannelPaths":
+        """由 ChannelPathComponent 序列建立 (AoS -> SoA)"""
+        paths = list(paths)
+        n = len(paths)
+        fields = np.empty((5, n), dtype=np.float64)
+        for i, path in enumerate(paths):
+            fields[:, i] = (
+                path.delay_ns,
+                path.power_db,
+                path.azimuth_deg,
+                path.elevation_deg,
+                path.doppler_hz,
+            )
+        return cls(*fields)
+
+    def __len__(self) -> int:
+        return self.delay_ns.shape[0]
+
+    @cached_property
+    def power_lin(self) -> np.ndarray:
+        """線性功率"""
+        return 10 ** (self.power_db / 10)
+
+    @cached_property
+    def total_power_linear(self) -> float:
+        """所有路徑的線性功率總和"""
+        return float(self.power_lin.sum())
+
+    @cached_property
+    def max_power_db(self) -> float:
+        """最強路徑功率 (dB)，沒有路徑時為 0"""
+        return float(self.power_db.max()) if len(self) else 0.0
+
+    @cached_property
+    def mean_delay_ns(self) -> float:
+        """功率加權的平均延遲 (ns)"""
+        total_power = self.total_power_linear
+        if total_power == 0:
+            return 0.0
+        return float(self.power_lin @ self.delay_ns) / total_power
+
+    @cached_property
+    def rms_delay_spread_ns(self) -> float:
+        """功率加權的 RMS 延遲擴散 (ns)"""
+        total_power = self.total_power_linear
+        if total_power == 0:
+            return 0.0
+
+        # 先扣除平均延遲再平方，避免大延遲 (如衛星鏈路) 時的相消誤差
+        centered = self.delay_ns - self.mean_delay_ns
+        return math.sqrt(float(self.power_lin @ (centered * centered)) / total_power)
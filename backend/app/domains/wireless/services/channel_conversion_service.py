@@ -5,7 +5,10 @@ Channel Conversion Service
 
 import asyncio
 import logging
-import uuid
+import secrets
+import time
+from collections import OrderedDict, deque
+from itertools import islice
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import numpy as np
@@ -18,19 +21,38 @@ from ..models.channel_models import (
     BatchChannelConversionRequest,
     ChannelUpdateEvent,
 )
+from ..models.channel_paths import ChannelPaths
+from .conversion_kernels import (
+    INTERFERENCE_COMBINE_DB,
+    compute_ran_params,
+    estimate_error_rate_batch,
+)
 
 logger = logging.getLogger(__name__)
 
+# 環境類型標籤，依 _assess_environment 的判斷順序排列
+_ENVIRONMENT_LABELS = np.array(
+    ["deep_indoor_or_blocked", "dense_urban", "urban", "suburban", "rural_or_los"],
+    dtype=object,
+)
+
 
 class ChannelToRANConversionService:
     """通道到 RAN 參數轉換服務"""
 
     def __init__(self, conversion_cache_size: int = 1000):
-        self.conversion_cache: Dict[str, ChannelToRANConversionResult] = {}
+        # 插入順序即建立順序，滿了從最舊的一端 O(1) 淘汰
+        self.conversion_cache: "OrderedDict[str, ChannelToRANConversionResult]" = (
+            OrderedDict()
+        )
         self.conversion_cache_size = conversion_cache_size
-        self.conversion_history: List[ChannelToRANConversionResult] = []
+        # 環形緩衝：超過上限時自動丟棄最舊的記錄
+        self.conversion_history: "deque[ChannelToRANConversionResult]" = deque(
+            maxlen=10000
+        )
 
         # 轉換參數設定
+        self.tx_power_dbm = 43.0  # gNodeB 傳輸功率 20W = 43dBm (典型 macro cell)
         self.noise_floor_dbm = -104  # 標準噪音基底
         self.thermal_noise_power_dbm = -174  # dBm/Hz
         self.implementation_margin_db = 2.0  # 實現損失
@@ -89,6 +111,23 @@ class ChannelToRANConversionService:
             },
         ]
 
+        # CQI 表的 SoA 形式 (門檻遞增)，以 np.searchsorted 二分查表
+        self._cqi_min_sinr_db = np.array(
+            [item["min_sinr_db"] for item in self.cqi_table], dtype=np.float64
+        )
+        # 頻譜效率以 CQI 值直接索引 (索引 0 不使用)
+        self._cqi_efficiency = np.zeros(len(self.cqi_table) + 1, dtype=np.float64)
+        for item in self.cqi_table:
+            self._cqi_efficiency[item["cqi"]] = item["efficiency"]
+
+        # 批次轉換每塊的通道數
+        self._batch_chunk_size = 512
+
+        # 相同通道簽章的轉換結果 (LRU，上限同 conversion_cache_size)
+        self._result_lut: "OrderedDict[tuple, ChannelToRANConversionResult]" = (
+            OrderedDict()
+        )
+
         # 快取命中率統計
         self.cache_hits = 0
         self.cache_misses = 0
@@ -100,44 +139,82 @@ class ChannelToRANConversionService:
         gnb_id: str,
         noise_figure_db: float = 7.0,
         antenna_gain_db: float = 15.0,
+        include_debug: bool = False,
     ) -> ChannelToRANConversionResult:
-        """將單一通道響應轉換為 RAN 參數"""
+        """
+        將單一通道響應轉換為 RAN 參數
 
-        conversion_start = datetime.utcnow()
-        conversion_id = f"conv_{uuid.uuid4().hex[:8]}"
+        include_debug 為 False 且未開啟 DEBUG 日誌時不計算 debug_info
+        """
 
-        try:
-            logger.debug(
-                f"開始通道轉換: {conversion_id}, 通道: {channel_response.channel_id}"
-            )
-
-            # 計算接收功率
-            rsrp_dbm = await self._calculate_rsrp(channel_response, antenna_gain_db)
+        conversion_start_ns = time.perf_counter_ns()
+        conversion_id = f"conv_{secrets.token_hex(4)}"
 
-            # 計算 SINR
-            sinr_db = await self._calculate_sinr(
-                channel_response, rsrp_dbm, noise_figure_db
+        # 通道與轉換參數完全相同時直接重用先前的結果
+        signature = self._conversion_signature(
+            channel_response, noise_figure_db, antenna_gain_db, include_debug
+        )
+        cached = self._result_lut.get(signature)
+        if cached is not None:
+            self.cache_hits += 1
+            self._result_lut.move_to_end(signature)
+            result = self._reuse_conversion_result(
+                cached, conversion_id, channel_response, ue_id, gnb_id
             )
+            self._cache_conversion_result(result)
+            return result
+        self.cache_misses += 1
 
-            # 計算 RSRQ
-            rsrq_db = await self._calculate_rsrq(sinr_db, channel_response)
-
-            # 計算 CQI
-            cqi = await self._calculate_cqi(sinr_db)
-
-            # 計算吞吐量
-            throughput_mbps = await self._estimate_throughput(
-                cqi, channel_response.bandwidth_hz
+        try:
+            logger.debug(
+                "開始通道轉換: %s, 通道: %s", conversion_id, channel_response.channel_id
             )
 
-            # 計算延遲
-            latency_ms = await self._estimate_latency(channel_response)
+            bandwidth_hz = channel_response.bandwidth_hz
+            if bandwidth_hz <= 0:
+                raise ValueError(f"頻寬必須為正值: {bandwidth_hz}")
+
+            # 路徑統計只走一次 SoA 陣列：總功率、最強路徑與延遲擴散共用同一份線性功率
+            path_arrays = channel_response.path_arrays
+
+            # 多路徑增益 (考慮建設性干涉)
+            multipath_gain_db = self._calculate_multipath_gain(path_arrays)
+
+            # 計算 RSRP / SINR / RSRQ / CQI / 吞吐量 / 錯誤率 (數值核心)
+            (
+                rsrp_dbm,
+                sinr_db,
+                rsrq_db,
+                cqi,
+                throughput_mbps,
+                error_rate,
+            ) = compute_ran_params(
+                self.tx_power_dbm,
+                antenna_gain_db,
+                channel_response.path_loss_db,
+                channel_response.shadowing_db,
+                multipath_gain_db,
+                bandwidth_hz,
+                noise_figure_db,
+                self.thermal_noise_power_dbm,
+                channel_response.rms_delay_spread_ns,
+                channel_response.coherence_bandwidth_hz,
+                self._cqi_min_sinr_db,
+                self._cqi_efficiency,
+            )
+            rsrp_dbm = float(rsrp_dbm)
+            sinr_db = float(sinr_db)
+            rsrq_db = float(rsrq_db)
+            cqi = int(cqi)
+            throughput_mbps = float(throughput_mbps)
+            error_rate = float(error_rate)
 
-            # 計算錯誤率
-            error_rate = await self._estimate_error_rate(sinr_db)
+            # 計算延遲 (距離只算一次，除錯資訊共用)
+            distance_m = self._estimate_distance(channel_response)
+            latency_ms = self._estimate_latency(channel_response, distance_m)
 
             # 計算參數有效期
-            valid_duration = await self._calculate_validity_duration(channel_response)
+            valid_duration = self._calculate_validity_duration(channel_response)
             valid_until = datetime.utcnow() + valid_duration
 
             # 建立 UERANSIM 參數
@@ -155,27 +232,27 @@ class ChannelToRANConversionService:
             )
 
             # 計算轉換品質
-            conversion_time_ms = (
-                datetime.utcnow() - conversion_start
-            ).total_seconds() * 1000
-            conversion_accuracy = await self._assess_conversion_accuracy(
+            conversion_accuracy = self._assess_conversion_accuracy(
                 channel_response, ran_params
             )
-            confidence_level = await self._calculate_confidence_level(channel_response)
-
-            # 除錯資訊
-            debug_info = {
-                "conversion_time_ms": conversion_time_ms,
-                "path_count": len(channel_response.paths),
-                "dominant_path_power_db": max(
-                    (p.power_db for p in channel_response.paths), default=0
-                ),
-                "frequency_ghz": channel_response.frequency_hz / 1e9,
-                "distance_km": self._estimate_distance(channel_response) / 1000,
-                "environment_assessment": await self._assess_environment(
-                    channel_response
-                ),
-            }
+            confidence_level = self._calculate_confidence_level(channel_response)
+
+            # 除錯資訊 (僅在需要時計算)
+            debug_info: Dict[str, Any] = {}
+            if include_debug or logger.isEnabledFor(logging.DEBUG):
+                debug_info = {
+                    "conversion_time_ms": (
+                        time.perf_counter_ns() - conversion_start_ns
+                    )
+                    / 1e6,
+                    "path_count": len(path_arrays),
+                    "dominant_path_power_db": path_arrays.max_power_db,
+                    "frequency_ghz": channel_response.frequency_hz / 1e9,
+                    "distance_km": distance_m / 1000,
+                    "environment_assessment": self._assess_environment(
+                        channel_response
+                    ),
+                }
 
             result = ChannelToRANConversionResult(
                 conversion_id=conversion_id,
@@ -187,139 +264,92 @@ class ChannelToRANConversionService:
             )
 
             # 快取結果
-            await self._cache_conversion_result(result)
+            self._cache_conversion_result(result)
+            self._result_lut[signature] = result
+            if len(self._result_lut) > self.conversion_cache_size:
+                self._result_lut.popitem(last=False)
 
             logger.debug(
-                f"通道轉換完成: {conversion_id}, "
-                f"SINR: {sinr_db:.1f}dB, CQI: {cqi}, 吞吐量: {throughput_mbps:.1f}Mbps"
+                "通道轉換完成: %s, SINR: %.1fdB, CQI: %d, 吞吐量: %.1fMbps",
+                conversion_id,
+                sinr_db,
+                cqi,
+                throughput_mbps,
             )
 
             return result
 
         except Exception as e:
-            logger.error(f"通道轉換失敗: {conversion_id}, 錯誤: {e}")
+            logger.exception("通道轉換失敗: %s", conversion_id)
             raise
 
-    async def _calculate_rsrp(
-        self, channel_response: SionnaChannelResponse, antenna_gain_db: float
-    ) -> float:
-        """計算 RSRP (Reference Signal Received Power)"""
-
-        # 基本傳輸功率 (假設 gNodeB 傳輸功率)
-        tx_power_dbm = 43.0  # 20W = 43dBm (典型 macro cell)
-
-        # 路徑損耗
-        path_loss_db = channel_response.path_loss_db
-
-        # 陰影衰落
-        shadowing_db = channel_response.shadowing_db
-
-        # 多路徑增益 (考慮建設性干涉)
-        multipath_gain_db = await self._calculate_multipath_gain(channel_response.paths)
-
-        # RSRP 計算
-        rsrp_dbm = (
-            tx_power_dbm
-            + antenna_gain_db
-            - path_loss_db
-            - shadowing_db
-            + multipath_gain_db
-        )
-
-        return float(rsrp_dbm)
-
-    async def _calculate_sinr(
-        self,
+    @staticmethod
+    def _conversion_signature(
         channel_response: SionnaChannelResponse,
-        rsrp_dbm: float,
         noise_figure_db: float,
-    ) -> float:
-        """計算 SINR (Signal-to-Interference-plus-Noise Ratio)"""
-
-        # 噪音功率計算
-        bandwidth_hz = channel_response.bandwidth_hz
-        noise_power_dbm = (
-            self.thermal_noise_power_dbm
-            + 10 * math.log10(bandwidth_hz)
-            + noise_figure_db
+        antenna_gain_db: float,
+        include_debug: bool,
+    ) -> tuple:
+        """轉換結果 LUT 的鍵，涵蓋轉換過程讀取的所有通道欄位
+
+        路徑功率/延遲以陣列位元組表示 (長度同時反映路徑數)，
+        位置與速度決定距離 (延遲) 與相干時間 (有效期)
+        """
+        path_arrays = channel_response.path_arrays
+        return (
+            channel_response.channel_id,
+            channel_response.frequency_hz,
+            channel_response.bandwidth_hz,
+            channel_response.path_loss_db,
+            channel_response.shadowing_db,
+            tuple(channel_response.tx_position),
+            tuple(channel_response.rx_position),
+            tuple(channel_response.tx_velocity),
+            tuple(channel_response.rx_velocity),
+            path_arrays.power_db.tobytes(),
+            path_arrays.delay_ns.tobytes(),
+            noise_figure_db,
+            antenna_gain_db,
+            include_debug,
         )
 
-        # 干擾功率 (簡化模型，實際應考慮同頻干擾)
-        interference_dbm = noise_power_dbm - 10  # 假設干擾比噪音低 10dB
-
-        # 總噪音+干擾功率
-        total_noise_interference_dbm = 10 * math.log10(
-            10 ** (noise_power_dbm / 10) + 10 ** (interference_dbm / 10)
-        )
-
-        # SINR 計算
-        sinr_db = rsrp_dbm - total_noise_interference_dbm
-
-        return float(sinr_db)
-
-    async def _calculate_rsrq(
-        self, sinr_db: float, channel_response: SionnaChannelResponse
-    ) -> float:
-        """計算 RSRQ (Reference Signal Received Quality)"""
-
-        # RSRQ 主要反映信號品質，與 SINR 相關但考慮更多因素
-        # 簡化模型：RSRQ ≈ SINR - 載波間干擾修正
-
-        # 載波間干擾估計 (基於多路徑延遲擴散)
-        ici_penalty_db = min(3.0, channel_response.rms_delay_spread_ns / 100)
-
-        # 頻率選擇性衰落影響
-        frequency_selectivity_penalty = min(
-            2.0,
-            (channel_response.coherence_bandwidth_hz / channel_response.bandwidth_hz)
-            * 2,
+    @staticmethod
+    def _reuse_conversion_result(
+        cached: ChannelToRANConversionResult,
+        conversion_id: str,
+        channel_response: SionnaChannelResponse,
+        ue_id: str,
+        gnb_id: str,
+    ) -> ChannelToRANConversionResult:
+        """以新的 ID、UE / gNodeB 與有效期複製快取的轉換結果"""
+
+        now = datetime.utcnow()
+        cached_params = cached.ran_parameters
+        ran_params = cached_params.model_copy(
+            update={
+                "ue_id": ue_id,
+                "gnb_id": gnb_id,
+                "timestamp": now,
+                "valid_until": now
+                + (cached_params.valid_until - cached_params.timestamp),
+            }
         )
-
-        rsrq_db = sinr_db - ici_penalty_db - frequency_selectivity_penalty
-
-        # RSRQ 通常在 -19.5 到 -3 dB 範圍內
-        rsrq_db = max(-19.5, min(-3.0, rsrq_db))
-
-        return float(rsrq_db)
-
-    async def _calculate_cqi(self, sinr_db: float) -> int:
-        """計算 CQI (Channel Quality Indicator)"""
-
-        # 根據 SINR 查找對應的 CQI
-        for i in range(len(self.cqi_table) - 1, -1, -1):
-            if sinr_db >= self.cqi_table[i]["min_sinr_db"]:
-                return self.cqi_table[i]["cqi"]
-
-        # 如果 SINR 太低，返回最低 CQI
-        return 1
-
-    async def _estimate_throughput(self, cqi: int, bandwidth_hz: float) -> float:
-        """估計吞吐量"""
-
-        # 獲取 CQI 對應的頻譜效率
-        efficiency = next(
-            (item["efficiency"] for item in self.cqi_table if item["cqi"] == cqi),
-            0.1523,  # 預設最低效率
+        return cached.model_copy(
+            update={
+                "conversion_id": conversion_id,
+                "timestamp": now,
+                "source_channel": channel_response,
+                "ran_parameters": ran_params,
+                "debug_info": dict(cached.debug_info),
+            }
         )
 
-        # 頻寬轉換為 MHz
-        bandwidth_mhz = bandwidth_hz / 1e6
-
-        # 理論吞吐量 = 頻譜效率 × 頻寬
-        theoretical_throughput_mbps = efficiency * bandwidth_mhz
-
-        # 考慮實際因素 (協議開銷、控制通道等)
-        overhead_factor = 0.75  # 25% 開銷
-
-        actual_throughput_mbps = theoretical_throughput_mbps * overhead_factor
-
-        return float(actual_throughput_mbps)
-
-    async def _estimate_latency(self, channel_response: SionnaChannelResponse) -> float:
+    def _estimate_latency(
+        self, channel_response: SionnaChannelResponse, distance_m: float
+    ) -> float:
         """估計延遲"""
 
         # 基本傳播延遲
-        distance_m = self._estimate_distance(channel_response)
         propagation_delay_ms = distance_m / 3e8 * 1000
 
         # 多路徑延遲擴散的影響
@@ -338,50 +368,31 @@ class ChannelToRANConversionService:
 
         return float(total_latency_ms)
 
-    async def _estimate_error_rate(self, sinr_db: float) -> float:
-        """估計錯誤率"""
-
-        # 簡化的 AWGN 通道 BER 模型
-        # 實際應根據調製方式和編碼使用更精確的模型
-
-        if sinr_db > 20:
-            ber = 1e-6  # 極低錯誤率
-        elif sinr_db > 15:
-            ber = 1e-5
-        elif sinr_db > 10:
-            ber = 1e-4
-        elif sinr_db > 5:
-            ber = 1e-3
-        elif sinr_db > 0:
-            ber = 1e-2
-        else:
-            ber = 1e-1  # 高錯誤率
-
-        return float(ber)
-
     def _estimate_distance(self, channel_response: SionnaChannelResponse) -> float:
         """估計傳輸距離"""
 
         tx_pos = channel_response.tx_position
         rx_pos = channel_response.rx_position
 
-        distance = math.sqrt(sum((tx_pos[i] - rx_pos[i]) ** 2 for i in range(3)))
-        return distance
+        dx = tx_pos[0] - rx_pos[0]
+        dy = tx_pos[1] - rx_pos[1]
+        dz = tx_pos[2] - rx_pos[2]
+        return math.sqrt(dx * dx + dy * dy + dz * dz)
 
-    async def _calculate_multipath_gain(self, paths: List) -> float:
+    def _calculate_multipath_gain(self, path_arrays: ChannelPaths) -> float:
         """計算多路徑增益"""
 
-        if not paths:
+        if not len(path_arrays):
             return 0.0
 
         # 相干合成的功率增益 (簡化模型)
-        total_power_linear = sum(10 ** (path.power_db / 10) for path in paths)
+        total_power_linear = path_arrays.total_power_linear
         multipath_gain_db = 10 * math.log10(total_power_linear)
 
         # 限制最大增益
         return min(6.0, multipath_gain_db)
 
-    async def _calculate_validity_duration(
+    def _calculate_validity_duration(
         self, channel_response: SionnaChannelResponse
     ) -> timedelta:
         """計算參數有效時間"""
@@ -396,7 +407,7 @@ class ChannelToRANConversionService:
 
         return timedelta(seconds=validity_seconds)
 
-    async def _assess_conversion_accuracy(
+    def _assess_conversion_accuracy(
         self, channel_response: SionnaChannelResponse, ran_params: UERANSIMChannelParams
     ) -> float:
         """評估轉換準確度"""
@@ -418,7 +429,7 @@ class ChannelToRANConversionService:
 
         return accuracy
 
-    async def _calculate_confidence_level(
+    def _calculate_confidence_level(
         self, channel_response: SionnaChannelResponse
     ) -> float:
         """計算信心度"""
@@ -436,12 +447,11 @@ class ChannelToRANConversionService:
 
         return confidence
 
-    async def _assess_environment(self, channel_response: SionnaChannelResponse) -> str:
+    def _assess_environment(self, channel_response: SionnaChannelResponse) -> str:
         """評估環境類型"""
 
         path_loss = channel_response.path_loss_db
         delay_spread = channel_response.rms_delay_spread_ns
-        path_count = len(channel_response.paths)
 
         if path_loss > 160:
             return "deep_indoor_or_blocked"
@@ -454,66 +464,304 @@ class ChannelToRANConversionService:
         else:
             return "rural_or_los"
 
-    async def _cache_conversion_result(self, result: ChannelToRANConversionResult):
+    @staticmethod
+    def _assess_environment_batch(
+        path_loss_db: np.ndarray, rms_delay_spread_ns: np.ndarray
+    ) -> np.ndarray:
+        """批次評估環境類型 (規則與 _assess_environment 相同)，先算類別索引再一次查表"""
+
+        category = np.select(
+            [
+                path_loss_db > 160,
+                (path_loss_db > 140) & (rms_delay_spread_ns > 200),
+                (path_loss_db > 130) & (rms_delay_spread_ns > 100),
+                path_loss_db > 120,
+            ],
+            [0, 1, 2, 3],
+            default=4,
+        )
+        return _ENVIRONMENT_LABELS[category]
+
+    def _cache_conversion_result(self, result: ChannelToRANConversionResult):
         """快取轉換結果"""
 
         # 如果快取已滿，移除最舊的項目
         if len(self.conversion_cache) >= self.conversion_cache_size:
-            oldest_key = min(
-                self.conversion_cache.keys(),
-                key=lambda k: self.conversion_cache[k].timestamp,
-            )
-            del self.conversion_cache[oldest_key]
+            self.conversion_cache.popitem(last=False)
 
         self.conversion_cache[result.conversion_id] = result
         self.conversion_history.append(result)
 
-        # 限制歷史記錄長度
-        if len(self.conversion_history) > 10000:
-            self.conversion_history = self.conversion_history[-5000:]
-
     async def batch_convert_channels(
-        self, request: BatchChannelConversionRequest
+        self,
+        request: BatchChannelConversionRequest,
+        gnb_id: Optional[str] = None,
+        noise_figure_db: float = 7.0,
+        antenna_gain_db: float = 15.0,
+        include_debug: bool = False,
+        failed_channel_ids: Optional[List[str]] = None,
     ) -> List[ChannelToRANConversionResult]:
-        """批次轉換通道"""
+        """
+        批次轉換通道
+
+        未指定 gnb_id 時，依通道順序分配 gnb_1, gnb_2, ...；
+        include_debug 的意義與 convert_channel_to_ran 相同。
+        單一通道轉換失敗不會中止整批，失敗的通道 ID 會附加到 failed_channel_ids (若有提供)；
+        target_ue_ids 為空時拋出 ValueError
+        """
+
+        if request.channels and not request.target_ue_ids:
+            raise ValueError("target_ue_ids 不可為空")
+        if failed_channel_ids is None:
+            failed_channel_ids = []
 
         logger.info(
-            f"開始批次轉換: {request.batch_id}, 通道數: {len(request.channels)}"
+            "開始批次轉換: %s, 通道數: %d", request.batch_id, len(request.channels)
         )
 
-        # 平行處理轉換
-        tasks = []
-        for i, channel in enumerate(request.channels):
-            ue_id = request.target_ue_ids[i % len(request.target_ue_ids)]
-            gnb_id = f"gnb_{i // len(request.target_ue_ids) + 1}"
+        # 分塊向量化轉換：限制每塊的暫存陣列大小，並在塊之間讓出事件迴圈
+        successful_results = []
+        channels = request.channels
+        chunk_size = self._batch_chunk_size
+        for start in range(0, len(channels), chunk_size):
+            if start:
+                await asyncio.sleep(0)
+            successful_results.extend(
+                self._batch_convert_vectorized(
+                    channels[start : start + chunk_size],
+                    request.target_ue_ids,
+                    gnb_id=gnb_id,
+                    noise_figure_db=noise_figure_db,
+                    antenna_gain_db=antenna_gain_db,
+                    index_offset=start,
+                    include_debug=include_debug,
+                    failed_channel_ids=failed_channel_ids,
+                )
+            )
 
-            task = self.convert_channel_to_ran(channel, ue_id, gnb_id)
-            tasks.append(task)
+        logger.info(
+            "批次轉換完成: %s, 成功: %d/%d, 失敗: %d",
+            request.batch_id,
+            len(successful_results),
+            len(request.channels),
+            len(failed_channel_ids),
+        )
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return successful_results
 
-        # 過濾成功的結果
-        successful_results = [
-            r for r in results if isinstance(r, ChannelToRANConversionResult)
-        ]
+    def _batch_convert_vectorized(
+        self,
+        channels: List[SionnaChannelResponse],
+        target_ue_ids: List[str],
+        gnb_id: Optional[str] = None,
+        noise_figure_db: float = 7.0,
+        antenna_gain_db: float = 15.0,
+        index_offset: int = 0,
+        include_debug: bool = False,
+        failed_channel_ids: Optional[List[str]] = None,
+    ) -> List[ChannelToRANConversionResult]:
+        """
+        以 NumPy 向量運算批次轉換通道 (與 convert_channel_to_ran 相同的模型)
+
+        先將各通道欄位收集為連續的 float64 陣列 (SoA)，
+        一次計算所有通道的 RSRP / SINR / RSRQ / CQI 等參數，最後才建立結果物件；
+        index_offset 為此塊第一個通道在整個批次中的位置 (用於分配 UE / gNodeB)；
+        轉換失敗的通道 ID 附加到 failed_channel_ids
+        """
+        if failed_channel_ids is None:
+            failed_channel_ids = []
+        conversion_start_ns = time.perf_counter_ns()
+        n = len(channels)
+        with_debug = include_debug or logger.isEnabledFor(logging.DEBUG)
+
+        # AoS -> SoA：每個欄位一個連續陣列
+        path_loss_db = np.empty(n, dtype=np.float64)
+        shadowing_db = np.empty(n, dtype=np.float64)
+        bandwidth_hz = np.empty(n, dtype=np.float64)
+        frequency_hz = np.empty(n, dtype=np.float64)
+        rms_delay_spread_ns = np.empty(n, dtype=np.float64)
+        coherence_bandwidth_hz = np.empty(n, dtype=np.float64)
+        coherence_time_ms = np.empty(n, dtype=np.float64)
+        path_count = np.empty(n, dtype=np.int64)
+        tx_rx_delta = np.empty((n, 3), dtype=np.float64)
+        path_power_db_chunks = []
+        for i, channel in enumerate(channels):
+            path_loss_db[i] = channel.path_loss_db
+            shadowing_db[i] = channel.shadowing_db
+            bandwidth_hz[i] = channel.bandwidth_hz
+            frequency_hz[i] = channel.frequency_hz
+            rms_delay_spread_ns[i] = channel.rms_delay_spread_ns
+            coherence_bandwidth_hz[i] = channel.coherence_bandwidth_hz
+            coherence_time_ms[i] = channel.coherence_time_ms
+            path_count[i] = len(channel.paths)
+            tx_rx_delta[i] = [
+                channel.tx_position[k] - channel.rx_position[k] for k in range(3)
+            ]
+            path_power_db_chunks.append(channel.path_arrays.power_db)
+
+        # 頻寬非正值無法計算噪音功率，這些通道視為轉換失敗 (與單一轉換拋出例外一致)
+        valid = bandwidth_hz > 0
+        safe_bandwidth_hz = np.where(valid, bandwidth_hz, 1.0)
+        for i in np.flatnonzero(~valid).tolist():
+            logger.warning(
+                "通道轉換失敗: %s, 頻寬必須為正值: %s",
+                channels[i].channel_id,
+                bandwidth_hz[i],
+            )
+            failed_channel_ids.append(channels[i].channel_id)
 
-        logger.info(
-            f"批次轉換完成: {request.batch_id}, 成功: {len(successful_results)}/{len(request.channels)}"
+        # 多路徑增益與最強路徑功率 (依通道分組加總 / 取最大值)
+        path_power_db = (
+            np.concatenate(path_power_db_chunks)
+            if path_power_db_chunks
+            else np.empty(0, dtype=np.float64)
+        )
+        channel_index = np.repeat(np.arange(n), path_count)
+        total_power_linear = np.bincount(
+            channel_index, weights=10 ** (path_power_db / 10), minlength=n
+        )
+        has_paths = path_count > 0
+        multipath_gain_db = np.zeros(n, dtype=np.float64)
+        multipath_gain_db[has_paths] = np.minimum(
+            6.0, 10 * np.log10(total_power_linear[has_paths])
         )
+        dominant_path_power_db = np.zeros(n, dtype=np.float64)
+        if with_debug and path_power_db.size:
+            offsets = np.concatenate(([0], np.cumsum(path_count)[:-1]))
+            dominant_path_power_db[has_paths] = np.maximum.reduceat(
+                path_power_db, offsets[has_paths]
+            )
 
-        return successful_results
+        # RSRP
+        rsrp_dbm = (
+            self.tx_power_dbm + antenna_gain_db - path_loss_db - shadowing_db + multipath_gain_db
+        )
+
+        # SINR：噪音 + 干擾 (干擾假設比噪音低 10dB)
+        total_noise_interference_dbm = (
+            self.thermal_noise_power_dbm
+            + 10 * np.log10(safe_bandwidth_hz)
+            + noise_figure_db
+            + INTERFERENCE_COMBINE_DB
+        )
+        sinr_db = rsrp_dbm - total_noise_interference_dbm
+
+        # RSRQ
+        ici_penalty_db = np.minimum(3.0, rms_delay_spread_ns / 100)
+        frequency_selectivity_penalty = np.minimum(
+            2.0, (coherence_bandwidth_hz / safe_bandwidth_hz) * 2
+        )
+        rsrq_db = np.clip(
+            sinr_db - ici_penalty_db - frequency_selectivity_penalty, -19.5, -3.0
+        )
+
+        # CQI 查表 (SINR 低於最低門檻時為 1) 與吞吐量
+        cqi = np.maximum(
+            np.searchsorted(self._cqi_min_sinr_db, sinr_db, side="right"), 1
+        )
+        throughput_mbps = self._cqi_efficiency[cqi] * (bandwidth_hz / 1e6) * 0.75
+
+        # 延遲
+        distance_m = np.sqrt((tx_rx_delta ** 2).sum(axis=1))
+        latency_ms = (
+            distance_m / 3e8 * 1000
+            + rms_delay_spread_ns / 1e6
+            + 1.0
+            + np.where(path_loss_db > 150, 2.0, 0.0)
+        )
+
+        # 錯誤率
+        error_rate = estimate_error_rate_batch(sinr_db)
+
+        # 參數有效期 (秒)
+        validity_seconds = np.where(
+            coherence_time_ms > 1000,
+            np.minimum(300, coherence_time_ms / 1000 * 0.5),
+            np.minimum(60, coherence_time_ms / 1000 * 0.3),
+        )
+
+        # 轉換準確度與信心度
+        conversion_accuracy = (
+            np.where(path_loss_db > 160, 0.8, 1.0)
+            * np.where(rms_delay_spread_ns > 500, 0.9, 1.0)
+            * np.where(path_count > 10, 0.85, 1.0)
+        )
+        frequency_ghz = frequency_hz / 1e9
+        confidence_level = np.where(has_paths, 1.0, 0.5) * np.where(
+            (frequency_ghz < 1) | (frequency_ghz > 100), 0.8, 1.0
+        )
+
+        # 環境評估 (只用於除錯資訊)
+        if with_debug:
+            environment_assessment = self._assess_environment_batch(
+                path_loss_db, rms_delay_spread_ns
+            )
+
+        conversion_time_ms = (time.perf_counter_ns() - conversion_start_ns) / 1e6 / n
+        now = datetime.utcnow()
+        n_ue = len(target_ue_ids)
+
+        results = []
+        for i in np.flatnonzero(valid).tolist():
+            channel = channels[i]
+            batch_index = index_offset + i
+            try:
+                ran_params = UERANSIMChannelParams(
+                    ue_id=target_ue_ids[batch_index % n_ue],
+                    gnb_id=gnb_id or f"gnb_{batch_index // n_ue + 1}",
+                    sinr_db=float(sinr_db[i]),
+                    rsrp_dbm=float(rsrp_dbm[i]),
+                    rsrq_db=float(rsrq_db[i]),
+                    cqi=int(cqi[i]),
+                    throughput_mbps=float(throughput_mbps[i]),
+                    latency_ms=float(latency_ms[i]),
+                    error_rate=float(error_rate[i]),
+                    valid_until=now + timedelta(seconds=float(validity_seconds[i])),
+                )
+                result = ChannelToRANConversionResult(
+                    conversion_id=f"conv_{secrets.token_hex(4)}",
+                    source_channel=channel,
+                    ran_parameters=ran_params,
+                    conversion_accuracy=float(conversion_accuracy[i]),
+                    confidence_level=float(confidence_level[i]),
+                    debug_info=(
+                        {
+                            "conversion_time_ms": conversion_time_ms,
+                            "path_count": int(path_count[i]),
+                            "dominant_path_power_db": float(
+                                dominant_path_power_db[i]
+                            ),
+                            "frequency_ghz": float(frequency_ghz[i]),
+                            "distance_km": float(distance_m[i]) / 1000,
+                            "environment_assessment": str(environment_assessment[i]),
+                        }
+                        if with_debug
+                        else {}
+                    ),
+                )
+            except Exception:
+                logger.exception("通道轉換失敗: %s", channel.channel_id)
+                failed_channel_ids.append(channel.channel_id)
+                continue
+
+            self._cache_conversion_result(result)
+            results.append(result)
+
+        return results
 
     async def get_conversion_history(
         self, limit: int = 100, since: Optional[datetime] = None
     ) -> List[ChannelToRANConversionResult]:
         """獲取轉換歷史"""
 
-        history = self.conversion_history
-
         if since:
-            history = [r for r in history if r.timestamp >= since]
+            history = [r for r in self.conversion_history if r.timestamp >= since]
+            return history[-limit:]
 
-        return history[-limit:]
+        # 從尾端只取 limit 筆，不複製整個緩衝
+        recent = list(islice(reversed(self.conversion_history), limit))
+        recent.reverse()
+        return recent
 
     def get_cache_hit_rate(self) -> float:
         """獲取快取命中率"""
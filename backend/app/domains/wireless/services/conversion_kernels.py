@@ -0,0 +1,125 @@
+"""
+Channel Conversion Kernels
+通道模擬與通道到 RAN 參數轉換的純數值核心 (有安裝 numba 時以 JIT 編譯，否則使用 NumPy 實作)
+"""
+
+import math
+
+import numpy as np
+
+# 嘗試導入 numba，如果失敗則使用 NumPy 實作
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+# 干擾假設比噪音低 10dB：10*log10(10^(N/10) + 10^((N-10)/10)) = N + 10*log10(1.1)
+INTERFERENCE_COMBINE_DB = 10 * math.log10(1 + 10**-1)
+
+# 簡化的 AWGN 通道錯誤率表：SINR 超過第 k 個門檻 (嚴格大於) 時錯誤率為第 k+1 項
+ERROR_RATE_SINR_THRESHOLDS_DB = np.array([0.0, 5.0, 10.0, 15.0, 20.0])
+ERROR_RATE_VALUES = np.array([1e-1, 1e-2, 1e-3, 1e-4, 1e-5, 1e-6])
+
+
+def estimate_error_rate_batch(sinr_db):
+    """以查表一次估計整個 SINR 陣列的錯誤率"""
+    return ERROR_RATE_VALUES[
+        np.searchsorted(ERROR_RATE_SINR_THRESHOLDS_DB, sinr_db, side="left")
+    ]
+
+
+def _compute_ran_params(
+    tx_power_dbm,
+    antenna_gain_db,
+    path_loss_db,
+    shadowing_db,
+    multipath_gain_db,
+    bandwidth_hz,
+    noise_figure_db,
+    thermal_noise_power_dbm,
+    rms_delay_spread_ns,
+    coherence_bandwidth_hz,
+    cqi_min_sinr_db,
+    cqi_efficiency,
+):
+    """
+    由通道特性計算 RAN 參數
+
+    回傳 (rsrp_dbm, sinr_db, rsrq_db, cqi, throughput_mbps, error_rate)；
+    bandwidth_hz 必須為正值 (由呼叫端檢查)，cqi_efficiency 以 CQI 值直接索引
+    """
+    # RSRP
+    rsrp_dbm = (
+        tx_power_dbm
+        + antenna_gain_db
+        - path_loss_db
+        - shadowing_db
+        + multipath_gain_db
+    )
+
+    # SINR：噪音 + 干擾 (干擾比噪音低 10dB，合成後為固定的 dB 偏移)
+    total_noise_interference_dbm = (
+        thermal_noise_power_dbm
+        + 10 * math.log10(bandwidth_hz)
+        + noise_figure_db
+        + INTERFERENCE_COMBINE_DB
+    )
+    sinr_db = rsrp_dbm - total_noise_interference_dbm
+
+    # RSRQ：SINR 扣除載波間干擾與頻率選擇性衰落修正，限制在 -19.5 到 -3 dB
+    ici_penalty_db = min(3.0, rms_delay_spread_ns / 100)
+    frequency_selectivity_penalty = min(
+        2.0, (coherence_bandwidth_hz / bandwidth_hz) * 2
+    )
+    rsrq_db = max(
+        -19.5, min(-3.0, sinr_db - ici_penalty_db - frequency_selectivity_penalty)
+    )
+
+    # CQI：在遞增的門檻陣列上二分搜尋 SINR 達到的最高等級，太低時為 1
+    cqi = max(1, int(np.searchsorted(cqi_min_sinr_db, sinr_db, side="right")))
+
+    # 吞吐量 = 頻譜效率 × 頻寬 (MHz) × (1 - 25% 開銷)
+    throughput_mbps = cqi_efficiency[cqi] * (bandwidth_hz / 1e6) * 0.75
+
+    # 簡化的 AWGN 通道錯誤率模型 (查表)
+    error_rate = ERROR_RATE_VALUES[
+        np.searchsorted(ERROR_RATE_SINR_THRESHOLDS_DB, sinr_db, side="left")
+    ]
+
+    return rsrp_dbm, sinr_db, rsrq_db, cqi, throughput_mbps, error_rate
+
+
+# 純純量運算，沒有 numba 時直接以 Python 執行即可
+compute_ran_params = (
+    njit(cache=True)(_compute_ran_params) if njit is not None else _compute_ran_params
+)
+
+
+def _accumulate_channel_numpy(power_db, delay_ns, frequency_hz):
+    """
+    疊加所有路徑的複數通道係數
+
+    回傳 (real, imag)；以向量運算計算各路徑的 amplitude * e^(j*phase) 後加總
+    """
+    amplitude = 10.0 ** (power_db * 0.05)
+    phase = 2 * math.pi * frequency_hz * delay_ns * 1e-9
+    return float(amplitude @ np.cos(phase)), float(amplitude @ np.sin(phase))
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _accumulate_channel_jit(power_db, delay_ns, frequency_hz):
+        """_accumulate_channel_numpy 的單次走訪版本：不配置中間陣列，逐條路徑累加"""
+        real = 0.0
+        imag = 0.0
+        for i in range(power_db.shape[0]):
+            amplitude = 10.0 ** (power_db[i] * 0.05)
+            phase = 2 * math.pi * frequency_hz * delay_ns[i] * 1e-9
+            real += amplitude * math.cos(phase)
+            imag += amplitude * math.sin(phase)
+        return real, imag
+
+    accumulate_channel = _accumulate_channel_jit
+else:
+    accumulate_channel = _accumulate_channel_numpy
@@ -5,6 +5,8 @@ Sionna Channel Simulation Service
 
 import asyncio
 import logging
+import math
+import time
 import uuid
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
@@ -17,6 +19,8 @@ from ..models.channel_models import (
     ChannelPathComponent,
     ChannelModelMetrics,
 )
+from ..models.channel_paths import ChannelPaths
+from .conversion_kernels import accumulate_channel
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +44,9 @@ class SionnaChannelSimulationService:
             # 在實際部署中，這裡會初始化 Sionna 和 TensorFlow
             logger.info("初始化 Sionna 模擬環境...")
 
+            # 服務專用的亂數產生器 (PCG64)，不經過 np.random 全域狀態
+            self._rng = np.random.default_rng()
+
             # 檢查 GPU 可用性
             if self.enable_gpu:
                 try:
@@ -75,6 +82,7 @@ class SionnaChannelSimulationService:
 
         async with self.simulation_semaphore:
             simulation_start = datetime.utcnow()
+            simulation_start_ns = time.perf_counter_ns()
 
             try:
                 logger.info(f"開始通道模擬: {request.simulation_id}")
@@ -90,9 +98,7 @@ class SionnaChannelSimulationService:
                 results = await self._run_sionna_simulation(request)
 
                 # 更新統計
-                simulation_time = (
-                    datetime.utcnow() - simulation_start
-                ).total_seconds() * 1000
+                simulation_time = (time.perf_counter_ns() - simulation_start_ns) / 1e6
                 self._update_metrics(len(results), simulation_time, success=True)
 
                 # 清理活躍模擬
@@ -114,77 +120,112 @@ class SionnaChannelSimulationService:
     ) -> List[SionnaChannelResponse]:
         """執行實際的 Sionna 模擬"""
 
+        # 模擬 GPU 計算延遲
+        if self.gpu_available:
+            await asyncio.sleep(0.1)  # GPU 模擬 100ms
+        else:
+            await asyncio.sleep(0.5)  # CPU 模擬 500ms
+
+        # NumPy / TF 運算在執行緒池中進行，不阻塞事件迴圈
+        return await asyncio.to_thread(self._run_sionna_simulation_sync, request)
+
+    def _run_sionna_simulation_sync(
+        self, request: ChannelSimulationRequest
+    ) -> List[SionnaChannelResponse]:
+        """同步執行模擬運算 (由 _run_sionna_simulation 在執行緒池中呼叫)"""
+
         # 在實際部署中，這裡會調用 Sionna 的 RT 模組
         # 現在先實現一個高保真度的模擬版本
 
         results = []
+        # 沒有發送端或接收端時沒有任何鏈路 (空列表也無法組成 (M, N, 3) 的幾何陣列)
+        if not request.transmitters or not request.receivers:
+            return results
+
         environment_model = self.channel_models.get(
             request.environment_type, self.channel_models["urban"]
         )
 
-        # 模擬 GPU 計算延遲
-        if self.gpu_available:
-            await asyncio.sleep(0.1)  # GPU 模擬 100ms
-        else:
-            await asyncio.sleep(0.5)  # CPU 模擬 500ms
+        # 所有發送端-接收端配對的幾何量一次以廣播計算 (M 個發送端 × N 個接收端)
+        tx_positions = [
+            tx_info.get("position", [0, 0, 0]) for tx_info in request.transmitters
+        ]
+        rx_positions = [
+            rx_info.get("position", [1000, 0, 0]) for rx_info in request.receivers
+        ]
+        delta = (
+            np.asarray(rx_positions, dtype=np.float64)[np.newaxis, :, :]
+            - np.asarray(tx_positions, dtype=np.float64)[:, np.newaxis, :]
+        )  # (M, N, 3)，接收端 - 發送端
+        horizontal_m = np.hypot(delta[..., 0], delta[..., 1])
+        distance_3d = np.hypot(horizontal_m, delta[..., 2])
+
+        # 基本路徑損耗計算 (Free Space Path Loss + 環境修正)
+        frequency_ghz = request.carrier_frequency_hz / 1e9
+        fspl_db = 20 * np.log10(distance_3d) + 20 * math.log10(frequency_ghz) + 32.44
+        path_loss_db = fspl_db + environment_model["typical_path_loss"] - 32.44
+
+        # 直射路徑的延遲、方位角和仰角
+        los_delay_ns = distance_3d / 3e8 * 1e9
+        azimuth_deg = np.degrees(np.arctan2(delta[..., 1], delta[..., 0]))
+        elevation_deg = np.degrees(np.arctan2(delta[..., 2], horizontal_m))
+
+        num_reflections = max(
+            0, min(request.max_reflections, environment_model["max_reflections"])
+        )
+
+        # 所有鏈路的陰影衰落與多路徑分量一次抽樣
+        shadowing_db = self._rng.normal(0, 8, size=distance_3d.shape)
+        path_fields = self._generate_multipath_components(
+            los_delay_ns, azimuth_deg, elevation_deg, num_reflections
+        )
 
-        # 為每對發送端-接收端生成通道響應
+        # 只在組裝回應物件時逐對走訪
         for tx_idx, tx_info in enumerate(request.transmitters):
             for rx_idx, rx_info in enumerate(request.receivers):
-
-                channel_response = await self._simulate_link_channel(
-                    tx_info, rx_info, request, environment_model, tx_idx, rx_idx
+                path_arrays = ChannelPaths(
+                    *(field[tx_idx, rx_idx] for field in path_fields)
+                )
+                results.append(
+                    self._build_link_response(
+                        request,
+                        tx_info,
+                        rx_info,
+                        tx_positions[tx_idx],
+                        rx_positions[rx_idx],
+                        float(path_loss_db[tx_idx, rx_idx]),
+                        float(shadowing_db[tx_idx, rx_idx]),
+                        path_arrays,
+                        tx_idx,
+                        rx_idx,
+                    )
                 )
-                results.append(channel_response)
 
         return results
 
-    async def _simulate_link_channel(
+    def _build_link_response(
         self,
+        request: ChannelSimulationRequest,
         tx_info: Dict[str, Any],
         rx_info: Dict[str, Any],
-        request: ChannelSimulationRequest,
-        environment_model: Dict[str, Any],
+        tx_pos: List[float],
+        rx_pos: List[float],
+        path_loss_db: float,
+        shadowing_db: float,
+        path_arrays: ChannelPaths,
         tx_idx: int,
         rx_idx: int,
     ) -> SionnaChannelResponse:
-        """模擬單一鏈路的通道響應"""
-
-        # 計算距離和路徑損耗
-        tx_pos = tx_info.get("position", [0, 0, 0])
-        rx_pos = rx_info.get("position", [1000, 0, 0])
-
-        distance_3d = np.sqrt(sum((tx_pos[i] - rx_pos[i]) ** 2 for i in range(3)))
-
-        # 基本路徑損耗計算 (Free Space Path Loss + 環境修正)
-        frequency_ghz = request.carrier_frequency_hz / 1e9
-        fspl_db = 20 * np.log10(distance_3d) + 20 * np.log10(frequency_ghz) + 32.44
-        path_loss_db = fspl_db + environment_model["typical_path_loss"] - 32.44
-
-        # 生成多路徑分量
-        paths = await self._generate_multipath_components(
-            tx_pos, rx_pos, environment_model, request.max_reflections
-        )
+        """組裝單一鏈路的通道響應"""
 
         # 計算通道矩陣
-        channel_matrix_real, channel_matrix_imag = self._compute_channel_matrix(
-            paths, request.carrier_frequency_hz
-        )
-
-        # 計算統計特性
-        rms_delay_spread = self._calculate_rms_delay_spread(paths)
-        coherence_bandwidth = (
-            1 / (5 * rms_delay_spread / 1e9) if rms_delay_spread > 0 else 1e6
+        channel_matrix = self._compute_channel_matrix(
+            path_arrays, request.carrier_frequency_hz
         )
 
-        # 速度相關的計算
+        # 延遲擴散、相干頻寬與相干時間由回應模型依路徑與速度推導
         tx_velocity = tx_info.get("velocity", [0, 0, 0])
         rx_velocity = rx_info.get("velocity", [0, 0, 0])
-        relative_velocity = np.sqrt(
-            sum((tx_velocity[i] - rx_velocity[i]) ** 2 for i in range(3))
-        )
-        doppler_max = relative_velocity * frequency_ghz / 3e8
-        coherence_time = 9 / (16 * np.pi * doppler_max) if doppler_max > 0 else 1000
 
         channel_id = f"ch_{request.simulation_id}_{tx_idx}_{rx_idx}"
 
@@ -197,118 +238,97 @@ class SionnaChannelSimulationService:
             frequency_hz=request.carrier_frequency_hz,
             bandwidth_hz=request.bandwidth_hz,
             path_loss_db=path_loss_db,
-            shadowing_db=np.random.normal(0, 8),  # 陰影衰落
-            paths=paths,
-            channel_matrix_real=channel_matrix_real,
-            channel_matrix_imag=channel_matrix_imag,
-            rms_delay_spread_ns=rms_delay_spread,
-            coherence_bandwidth_hz=coherence_bandwidth,
-            coherence_time_ms=coherence_time * 1000,
+            shadowing_db=shadowing_db,  # 陰影衰落
+            paths=self._paths_to_components(path_arrays),
+            channel_matrix=channel_matrix.tobytes(),
+            channel_matrix_shape=channel_matrix.shape,
         )
 
-    async def _generate_multipath_components(
+    def _generate_multipath_components(
         self,
-        tx_pos: List[float],
-        rx_pos: List[float],
-        environment_model: Dict[str, Any],
-        max_reflections: int,
-    ) -> List[ChannelPathComponent]:
-        """生成多路徑分量"""
-
-        paths = []
-
-        # 直射路徑 (Line of Sight)
-        distance_3d = np.sqrt(sum((tx_pos[i] - rx_pos[i]) ** 2 for i in range(3)))
-        los_delay_ns = distance_3d / 3e8 * 1e9
-
-        # 計算方位角和仰角
-        dx, dy, dz = [rx_pos[i] - tx_pos[i] for i in range(3)]
-        azimuth = np.degrees(np.arctan2(dy, dx))
-        elevation = np.degrees(np.arctan2(dz, np.sqrt(dx**2 + dy**2)))
-
-        # LOS 路徑
-        los_path = ChannelPathComponent(
-            delay_ns=los_delay_ns,
-            power_db=0.0,  # 參考功率
-            azimuth_deg=azimuth,
-            elevation_deg=elevation,
-            doppler_hz=0.0,
+        los_delay_ns: np.ndarray,
+        azimuth_deg: np.ndarray,
+        elevation_deg: np.ndarray,
+        num_reflections: int,
+    ) -> Tuple[np.ndarray, ...]:
+        """
+        為所有鏈路生成多路徑分量
+
+        輸入為 (M, N) 的直射路徑幾何量；回傳依 ChannelPaths 欄位順序
+        (delay, power, azimuth, elevation, doppler) 的 (M, N, 1 + R) 陣列，
+        最後一軸第 0 條為 LOS，其餘為反射路徑
+        """
+
+        size = los_delay_ns.shape + (num_reflections,)
+        los_delay_ns = los_delay_ns[..., np.newaxis]
+        azimuth_deg = azimuth_deg[..., np.newaxis]
+        elevation_deg = elevation_deg[..., np.newaxis]
+
+        # 反射路徑：一次抽出所有鏈路、所有反射的隨機量
+        extra_delay_ns = self._rng.exponential(50, size) + 10  # 額外延遲
+        power_loss_db = (
+            -10 - np.arange(num_reflections) * 6 - self._rng.exponential(3, size)
+        )  # 功率損失
+        azimuth_offset = self._rng.normal(0, 15, size)  # 反射造成的角度偏移
+        elevation_offset = self._rng.normal(0, 10, size)
+        doppler_hz = self._rng.normal(0, 50, size)  # 多普勒頻移
+
+        # LOS 路徑 (參考功率 0 dB、無多普勒) 接在反射路徑之前
+        zeros = np.zeros_like(los_delay_ns)
+        return (
+            np.concatenate((los_delay_ns, los_delay_ns + extra_delay_ns), axis=-1),
+            np.concatenate((zeros, power_loss_db), axis=-1),
+            np.concatenate((azimuth_deg, azimuth_deg + azimuth_offset), axis=-1),
+            np.concatenate(
+                (elevation_deg, elevation_deg + elevation_offset), axis=-1
+            ),
+            np.concatenate((zeros, doppler_hz), axis=-1),
         )
-        paths.append(los_path)
-
-        # 反射路徑
-        num_reflections = min(max_reflections, environment_model["max_reflections"])
-        for i in range(num_reflections):
-            # 模擬反射造成的額外延遲和功率損失
-            extra_delay_ns = np.random.exponential(50) + 10  # 額外延遲
-            power_loss_db = -10 - i * 6 - np.random.exponential(3)  # 功率損失
-
-            # 反射造成的角度偏移
-            azimuth_offset = np.random.normal(0, 15)
-            elevation_offset = np.random.normal(0, 10)
-
-            reflected_path = ChannelPathComponent(
-                delay_ns=los_delay_ns + extra_delay_ns,
-                power_db=power_loss_db,
-                azimuth_deg=azimuth + azimuth_offset,
-                elevation_deg=elevation + elevation_offset,
-                doppler_hz=np.random.normal(0, 50),  # 多普勒頻移
-            )
-            paths.append(reflected_path)
 
-        return paths
+    @staticmethod
+    def _paths_to_components(path_arrays: ChannelPaths) -> List[ChannelPathComponent]:
+        """SoA 陣列轉回 API 回應使用的路徑清單"""
+
+        return [
+            ChannelPathComponent(
+                delay_ns=delay_ns,
+                power_db=power_db,
+                azimuth_deg=azimuth_deg,
+                elevation_deg=elevation_deg,
+                doppler_hz=doppler_hz,
+            )
+            for delay_ns, power_db, azimuth_deg, elevation_deg, doppler_hz in zip(
+                path_arrays.delay_ns.tolist(),
+                path_arrays.power_db.tolist(),
+                path_arrays.azimuth_deg.tolist(),
+                path_arrays.elevation_deg.tolist(),
+                path_arrays.doppler_hz.tolist(),
+            )
+        ]
 
     def _compute_channel_matrix(
-        self, paths: List[ChannelPathComponent], frequency_hz: float
-    ) -> Tuple[List[List[float]], List[List[float]]]:
-        """計算通道矩陣"""
+        self, path_arrays: ChannelPaths, frequency_hz: float
+    ) -> np.ndarray:
+        """計算通道矩陣 (C-contiguous complex64)"""
 
         # 簡化的 SISO 通道矩陣 (1x1)
         # 在實際實現中，這會是更複雜的 MIMO 矩陣
 
-        channel_complex = 0 + 0j
-
-        for path in paths:
-            # 路徑增益
-            amplitude = 10 ** (path.power_db / 20)
-
-            # 相位（基於延遲）
-            phase = 2 * np.pi * frequency_hz * path.delay_ns / 1e9
-
-            # 複數通道係數
-            path_coefficient = amplitude * np.exp(1j * phase)
-            channel_complex += path_coefficient
-
-        # 分離實部和虛部
-        real_part = [[float(channel_complex.real)]]
-        imag_part = [[float(channel_complex.imag)]]
-
-        return real_part, imag_part
-
-    def _calculate_rms_delay_spread(self, paths: List[ChannelPathComponent]) -> float:
-        """計算 RMS 延遲擴散"""
-
-        if not paths:
-            return 0.0
-
-        # 功率權重
-        powers = [10 ** (path.power_db / 10) for path in paths]
-        delays = [path.delay_ns for path in paths]
+        # 路徑增益與相位（基於延遲）疊加為複數通道係數
+        real, imag = accumulate_channel(
+            path_arrays.power_db, path_arrays.delay_ns, frequency_hz
+        )
 
-        total_power = sum(powers)
-        if total_power == 0:
-            return 0.0
+        return np.full((1, 1), complex(real, imag), dtype="<c8")
 
-        # 平均延遲
-        mean_delay = sum(p * d for p, d in zip(powers, delays)) / total_power
+    @staticmethod
+    def unpack_channel_matrix(response: SionnaChannelResponse) -> np.ndarray:
+        """將打包的通道矩陣還原為 complex64 陣列 (零複製、唯讀)"""
 
-        # RMS 延遲擴散
-        rms_delay_spread = np.sqrt(
-            sum(p * (d - mean_delay) ** 2 for p, d in zip(powers, delays)) / total_power
+        return np.frombuffer(response.channel_matrix, dtype="<c8").reshape(
+            response.channel_matrix_shape
         )
 
-        return float(rms_delay_spread)
-
     def _update_metrics(
         self, channels_processed: int, processing_time_ms: float, success: bool
     ):
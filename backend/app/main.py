@@ -1,39 +1,61 @@
 import logging
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, ORJSONResponse
+import asyncio
 import os
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 # Import lifespan manager and API router from their new locations
-from app.db.lifespan import lifespan
+from app.db.lifespan import lifespan as db_lifespan
 from app.api.v1.router import api_router
-from app.core.config import OUTPUT_DIR  # 導入設定的圖片目錄路徑
+from app.core.config import OUTPUT_DIR, STATIC_DIR  # 導入設定的靜態目錄路徑
+from app.core.cors import FastCORS
+from app.core.static_files import router as static_files_router
+from app.domains.satellite.services.cqrs_satellite_service import CQRSSatelliteService
+from app.domains.satellite.services.orbit_service import OrbitService
 
 logger = logging.getLogger(__name__)
 
+
+# --- Lifespan ---
+# 在資料庫 lifespan 內再啟動 CQRS 衛星服務，只傳一個 lifespan 給 FastAPI，
+# 避免兩個 lifespan 互相覆蓋而使 CQRS 服務從未啟動。
+# CQRS 服務在背景啟動，不阻塞 yield；完成後設定 cqrs_ready，由 /readyz 回報
+@asynccontextmanager
+async def merged_lifespan(app: FastAPI):
+    async with db_lifespan(app):
+        cqrs_service = CQRSSatelliteService(OrbitService())
+        app.state.cqrs_satellite_service = cqrs_service
+        app.state.cqrs_ready = asyncio.Event()
+
+        async def _start_cqrs_service():
+            await cqrs_service.start()
+            app.state.cqrs_ready.set()
+
+        start_task = asyncio.create_task(_start_cqrs_service())
+        try:
+            yield
+        finally:
+            start_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await start_task
+            await cqrs_service.stop()
+
+
 # Create FastAPI app instance using the lifespan manager
 app = FastAPI(
     title="Sionna RT Simulation API",
     description="API for running Sionna RT simulations and managing devices.",
     version="0.1.0",
-    lifespan=lifespan,  # Use the imported lifespan context manager
+    lifespan=merged_lifespan,  # DB 初始化 + CQRS 衛星服務
+    default_response_class=ORJSONResponse,  # 以 orjson 編碼所有 JSON 回應 (新版 FastAPI 已 deprecated，見 requirements.txt)
 )
 
-# --- Static Files Mount ---
-# 確保靜態文件目錄存在
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-logger.info(f"Static files directory set to: {OUTPUT_DIR}")
-
-# 掛載靜態文件目錄到 /rendered_images URL 路徑 (保持與前端組件兼容的 URL)
-app.mount("/rendered_images", StaticFiles(directory=OUTPUT_DIR), name="rendered_images")
-logger.info(f"Mounted static files directory '{OUTPUT_DIR}' at '/rendered_images'.")
-
-# 掛載 static 目錄
-STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
-os.makedirs(STATIC_DIR, exist_ok=True)
-app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
-logger.info(f"Mounted static directory '{STATIC_DIR}' at '/static'.")
+# --- Static Files Routes ---
+# /rendered_images 與 /static 由 static_files 路由提供 (FileResponse、記憶體快取、預壓縮檔)；
+# 目錄在 lifespan 啟動時由 ensure_static_dirs 建立
+app.include_router(static_files_router)
+logger.info(f"Serving '{OUTPUT_DIR}' at '/rendered_images' and '{STATIC_DIR}' at '/static'.")
 
 # --- CORS Middleware ---
 # 允許特定域名的跨域請求，包括生產環境中的IP地址
@@ -46,22 +68,41 @@ origins = [
     # 添加任何其他需要的域名
 ]
 
+# 來源清單固定，由 FastCORS 預先編碼標頭 (帶憑證、允許所有方法與頭部)
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,  # 使用明確的域名列表而不是 ["*"]
-    allow_credentials=True,
-    allow_methods=["*"],  # 允許所有方法
-    allow_headers=["*"],  # 允許所有頭部
+    FastCORS,
+    allow_origins=origins,
+    expose_headers=["X-Failed-Channel-Count"],  # 批次轉換失敗數，供前端讀取
 )
 logger.info("CORS middleware added with specific origins.")
 
 
+# --- Global Exception Handler ---
+# 未捕捉的例外統一在此記錄 (含 traceback) 並轉為不含內部細節的 500。
+# 注意：此 handler 在 ServerErrorMiddleware 執行，位於 CORS 中介層之外，
+# 回應不帶 CORS 標頭；瀏覽器端需要讀取錯誤內容的端點仍應自行拋出 HTTPException
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    logger.exception("未處理的例外: %s %s", request.method, request.url.path)
+    return JSONResponse(status_code=500, content={"detail": "伺服器內部錯誤"})
+
+
 # --- Test Endpoint (Before API v1 Router) ---
 @app.get("/ping", tags=["Test"])
 async def ping():
     return {"message": "pong"}
 
 
+# --- Readiness Probe ---
+# 背景服務 (CQRS 衛星服務) 尚未啟動完成前回 503
+@app.get("/readyz", tags=["Test"])
+async def readyz(request: Request):
+    cqrs_ready = getattr(request.app.state, "cqrs_ready", None)
+    if cqrs_ready is None or not cqrs_ready.is_set():
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "ready"}
+
+
 # --- Include API Routers ---
 # Include the router for API version 1
 app.include_router(api_router, prefix="/api/v1")  # Add a /api/v1 prefix
@@ -86,7 +127,16 @@ if __name__ == "__main__":
     )
     # This won't properly run the lifespan events like DB init unless configured differently.
     # Recommended to run via Docker Compose or `uvicorn app.main:app --reload` from the backend directory.
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop/httptools 由 uvicorn[standard] 提供；workers > 1 時需以匯入字串啟動
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+        workers=int(os.getenv("WORKERS", "1")),
+    )
 
 logger.info(
     "FastAPI application setup complete. Ready for Uvicorn via external command."
@@ -4,13 +4,17 @@ SimWorld 性能優化相關的 Pydantic 模型
 根據 TODO.md 第17項「系統性能優化」要求設計
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Dict, List, Optional, Any
-from datetime import datetime
-from enum import Enum
+from datetime import datetime, timezone
+from enum import StrEnum
 
 
-class SimulationOptimizationType(str, Enum):
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class SimulationOptimizationType(StrEnum):
     """仿真優化類型枚舉"""
 
     SIONNA_COMPUTATION = "sionna_computation"
@@ -20,7 +24,7 @@ class SimulationOptimizationType(str, Enum):
     COMPREHENSIVE = "comprehensive"
 
 
-class SimulationType(str, Enum):
+class SimulationType(StrEnum):
     """仿真類型枚舉"""
 
     SIONNA = "sionna"
@@ -44,15 +48,19 @@ class SimulationOptimizationRequest(BaseModel):
         default=None, description="目標改善百分比"
     )
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        use_enum_values=True,
+        json_schema_extra={
             "example": {
                 "optimization_type": "sionna_computation",
                 "simulation_parameters": {"frequency_ghz": 2.4, "antenna_count": 64},
                 "force_optimization": False,
                 "target_improvement_percent": 20.0,
             }
-        }
+        },
+    )
 
 
 class SimulationPerformanceMetric(BaseModel):
@@ -63,11 +71,13 @@ class SimulationPerformanceMetric(BaseModel):
     unit: str = Field(..., description="單位")
     category: str = Field(..., description="指標類別")
     simulation_type: str = Field(..., description="仿真類型")
-    timestamp: str = Field(..., description="時間戳")
+    timestamp: datetime = Field(default_factory=_utc_now, description="時間戳")
     target: Optional[float] = Field(None, description="目標值")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "name": "sionna_computation_ms",
                 "value": 250.5,
@@ -77,7 +87,8 @@ class SimulationPerformanceMetric(BaseModel):
                 "timestamp": "2024-12-19T10:30:00Z",
                 "target": 1000.0,
             }
-        }
+        },
+    )
 
 
 class SimulationPerformanceResponse(BaseModel):
@@ -90,8 +101,10 @@ class SimulationPerformanceResponse(BaseModel):
     time_range_minutes: int = Field(..., description="時間範圍（分鐘）")
     simulation_type: Optional[str] = Field(None, description="仿真類型過濾")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "simulation_metrics": [
                     {
@@ -108,7 +121,8 @@ class SimulationPerformanceResponse(BaseModel):
                 "time_range_minutes": 10,
                 "simulation_type": "sionna",
             }
-        }
+        },
+    )
 
 
 class SimulationOptimizationResult(BaseModel):
@@ -119,12 +133,15 @@ class SimulationOptimizationResult(BaseModel):
     after_value: float = Field(..., description="優化後數值")
     improvement_percent: float = Field(..., description="改善百分比")
     success: bool = Field(..., description="是否成功")
-    timestamp: str = Field(..., description="時間戳")
+    timestamp: datetime = Field(default_factory=_utc_now, description="時間戳")
     techniques_applied: List[str] = Field(default=[], description="應用的技術")
     details: Optional[Dict[str, Any]] = Field(None, description="詳細信息")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        use_enum_values=True,
+        json_schema_extra={
             "example": {
                 "optimization_type": "sionna_computation",
                 "before_value": 350.2,
@@ -135,7 +152,8 @@ class SimulationOptimizationResult(BaseModel):
                 "techniques_applied": ["result_caching", "parameter_optimization"],
                 "details": {"cache_size": 15},
             }
-        }
+        },
+    )
 
 
 class CacheStatus(BaseModel):
@@ -145,8 +163,10 @@ class CacheStatus(BaseModel):
     cache_categories: Dict[str, int] = Field(..., description="各類別緩存數量")
     cache_details: Dict[str, Any] = Field(default={}, description="緩存詳細信息")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "total_cached_items": 45,
                 "cache_categories": {
@@ -166,13 +186,14 @@ class CacheStatus(BaseModel):
                     }
                 },
             }
-        }
+        },
+    )
 
 
 class SimulationPerformanceSummary(BaseModel):
     """仿真性能摘要模型"""
 
-    timestamp: str = Field(..., description="摘要生成時間")
+    timestamp: datetime = Field(default_factory=_utc_now, description="摘要生成時間")
     total_optimizations: int = Field(..., description="總優化次數")
     successful_optimizations: int = Field(..., description="成功優化次數")
     last_optimization: Optional[str] = Field(None, description="上次優化時間")
@@ -182,8 +203,10 @@ class SimulationPerformanceSummary(BaseModel):
     component: str = Field(default="simworld", description="組件名稱")
     optimization_capabilities: List[str] = Field(default=[], description="優化能力列表")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "timestamp": "2024-12-19T10:30:00Z",
                 "total_optimizations": 8,
@@ -212,7 +235,8 @@ class SimulationPerformanceSummary(BaseModel):
                     "uav_position_update",
                 ],
             }
-        }
+        },
+    )
 
 
 class SimulationBenchmarkResult(BaseModel):
@@ -220,12 +244,14 @@ class SimulationBenchmarkResult(BaseModel):
 
     benchmark_results: Dict[str, float] = Field(..., description="基準測試結果")
     target_comparison: Dict[str, Any] = Field(..., description="與目標的比較")
-    timestamp: str = Field(..., description="測試時間戳")
+    timestamp: datetime = Field(default_factory=_utc_now, description="測試時間戳")
     summary: Dict[str, Any] = Field(..., description="結果摘要")
     message: str = Field(..., description="結果消息")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "benchmark_results": {
                     "sionna_computation_ms": 250.5,
@@ -249,7 +275,8 @@ class SimulationBenchmarkResult(BaseModel):
                 },
                 "message": "SimWorld 性能基準測試完成",
             }
-        }
+        },
+    )
 
 
 class SionnaComputationMetric(BaseModel):
@@ -260,10 +287,12 @@ class SionnaComputationMetric(BaseModel):
     antenna_count: int = Field(..., description="天線數量")
     cache_hit: bool = Field(..., description="是否緩存命中")
     memory_usage_mb: float = Field(..., description="內存使用量（MB）")
-    timestamp: str = Field(..., description="時間戳")
+    timestamp: datetime = Field(default_factory=_utc_now, description="時間戳")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "computation_time_ms": 250.5,
                 "frequency_ghz": 2.4,
@@ -272,7 +301,8 @@ class SionnaComputationMetric(BaseModel):
                 "memory_usage_mb": 128.5,
                 "timestamp": "2024-12-19T10:30:00Z",
             }
-        }
+        },
+    )
 
 
 class UAVPositionMetric(BaseModel):
@@ -283,10 +313,12 @@ class UAVPositionMetric(BaseModel):
     trajectory_cache_hit_rate: float = Field(..., description="軌跡緩存命中率")
     position_accuracy_m: float = Field(..., description="位置精度（米）")
     batch_size: int = Field(..., description="批處理大小")
-    timestamp: str = Field(..., description="時間戳")
+    timestamp: datetime = Field(default_factory=_utc_now, description="時間戳")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "update_time_ms": 85.2,
                 "uav_count": 10,
@@ -295,7 +327,8 @@ class UAVPositionMetric(BaseModel):
                 "batch_size": 5,
                 "timestamp": "2024-12-19T10:30:00Z",
             }
-        }
+        },
+    )
 
 
 class WirelessChannelMetric(BaseModel):
@@ -307,10 +340,12 @@ class WirelessChannelMetric(BaseModel):
     frequency_ghz: float = Field(..., description="頻率（GHz）")
     cache_hit: bool = Field(..., description="是否緩存命中")
     algorithm_type: str = Field(..., description="算法類型")
-    timestamp: str = Field(..., description="時間戳")
+    timestamp: datetime = Field(default_factory=_utc_now, description="時間戳")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "calculation_time_ms": 180.7,
                 "path_loss_db": 125.5,
@@ -320,7 +355,8 @@ class WirelessChannelMetric(BaseModel):
                 "algorithm_type": "free_space",
                 "timestamp": "2024-12-19T10:30:00Z",
             }
-        }
+        },
+    )
 
 
 class SimulationFrameRateMetric(BaseModel):
@@ -332,10 +368,12 @@ class SimulationFrameRateMetric(BaseModel):
     cpu_usage_percent: float = Field(..., description="CPU 使用率")
     gpu_usage_percent: Optional[float] = Field(None, description="GPU 使用率")
     rendering_quality: str = Field(..., description="渲染質量")
-    timestamp: str = Field(..., description="時間戳")
+    timestamp: datetime = Field(default_factory=_utc_now, description="時間戳")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "fps": 28.5,
                 "frame_time_ms": 35.1,
@@ -345,10 +383,11 @@ class SimulationFrameRateMetric(BaseModel):
                 "rendering_quality": "high",
                 "timestamp": "2024-12-19T10:30:00Z",
             }
-        }
+        },
+    )
 
 
-class OptimizationTechnique(str, Enum):
+class OptimizationTechnique(StrEnum):
     """優化技術枚舉"""
 
     RESULT_CACHING = "result_caching"
@@ -380,8 +419,10 @@ class OptimizationReport(BaseModel):
         None, description="下次優化計劃時間"
     )
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "report_id": "opt_report_20241219_001",
                 "generated_at": "2024-12-19T10:30:00Z",
@@ -400,4 +441,5 @@ class OptimizationReport(BaseModel):
                 ],
                 "next_optimization_schedule": "2024-12-19T16:00:00Z",
             }
-        }
+        },
+    )
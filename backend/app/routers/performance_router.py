@@ -11,7 +11,7 @@ SimWorld 性能優化 API 路由器
 """
 
 from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse  # orjson 直接序列化 datetime
 from typing import Dict, List, Optional
 import logging
 from datetime import datetime, timedelta
@@ -59,11 +59,11 @@ async def simulation_performance_health_check():
     try:
         summary = simworld_performance_optimizer.get_performance_summary()
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "status": "healthy",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.utcnow(),
                 "optimizer_initialized": len(
                     simworld_performance_optimizer._simulation_cache
                 )
@@ -113,13 +113,13 @@ async def get_simulation_metrics(
                 "unit": m.unit,
                 "category": m.category,
                 "simulation_type": m.simulation_type,
-                "timestamp": m.timestamp.isoformat(),
+                "timestamp": m.timestamp,
                 "target": m.target,
             }
             for m in filtered_metrics
         ]
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "simulation_metrics": metrics_data,
@@ -140,7 +140,7 @@ async def get_simulation_performance_summary():
     try:
         summary = simworld_performance_optimizer.get_performance_summary()
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 **summary,
@@ -169,7 +169,7 @@ async def optimize_sionna_computation(background_tasks: BackgroundTasks):
 
         result = await simworld_performance_optimizer.optimize_sionna_computation()
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "success": result.success,
@@ -178,7 +178,7 @@ async def optimize_sionna_computation(background_tasks: BackgroundTasks):
                 "after_value": result.after_value,
                 "improvement_percent": result.improvement_percent,
                 "techniques_applied": result.techniques_applied,
-                "timestamp": result.timestamp.isoformat(),
+                "timestamp": result.timestamp,
                 "details": result.details,
                 "message": f"Sionna 計算優化完成，改善: {result.improvement_percent:.1f}%",
             },
@@ -197,7 +197,7 @@ async def optimize_uav_position_updates(background_tasks: BackgroundTasks):
 
         result = await simworld_performance_optimizer.optimize_uav_position_updates()
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "success": result.success,
@@ -206,7 +206,7 @@ async def optimize_uav_position_updates(background_tasks: BackgroundTasks):
                 "after_value": result.after_value,
                 "improvement_percent": result.improvement_percent,
                 "techniques_applied": result.techniques_applied,
-                "timestamp": result.timestamp.isoformat(),
+                "timestamp": result.timestamp,
                 "details": result.details,
                 "message": f"UAV 位置更新優化完成，改善: {result.improvement_percent:.1f}%",
             },
@@ -227,7 +227,7 @@ async def optimize_wireless_channel_calculation(background_tasks: BackgroundTask
             await simworld_performance_optimizer.optimize_wireless_channel_calculation()
         )
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "success": result.success,
@@ -236,7 +236,7 @@ async def optimize_wireless_channel_calculation(background_tasks: BackgroundTask
                 "after_value": result.after_value,
                 "improvement_percent": result.improvement_percent,
                 "techniques_applied": result.techniques_applied,
-                "timestamp": result.timestamp.isoformat(),
+                "timestamp": result.timestamp,
                 "details": result.details,
                 "message": f"無線通道計算優化完成，改善: {result.improvement_percent:.1f}%",
             },
@@ -255,12 +255,12 @@ async def run_comprehensive_optimization(background_tasks: BackgroundTasks):
 
         result = await simworld_performance_optimizer.run_comprehensive_optimization()
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "success": "error" not in result,
                 "optimization_type": "comprehensive",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.utcnow(),
                 "optimization_summary": result,
                 "message": f"綜合優化完成，平均改善: {result.get('average_improvement_percent', 0):.1f}%",
             },
@@ -313,11 +313,11 @@ async def get_simulation_cache_status():
                     "recent_items": recent_items,
                 }
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "cache_status": cache_status,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.utcnow(),
                 "message": "仿真緩存狀態獲取成功",
             },
         )
@@ -359,13 +359,13 @@ async def clear_simulation_cache(category: Optional[str] = None, force: bool = F
                 simworld_performance_optimizer._simulation_cache[cat] = {}
             logger.info(f"清理所有緩存，共 {cleared_count} 項")
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "success": True,
                 "cleared_count": cleared_count,
                 "category": category or "all",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.utcnow(),
                 "message": f"緩存清理完成，清理了 {cleared_count} 項",
             },
         )
@@ -381,12 +381,12 @@ async def clear_simulation_cache(category: Optional[str] = None, force: bool = F
 async def get_simulation_performance_targets():
     """獲取SimWorld性能目標配置"""
     try:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "performance_targets": simworld_performance_optimizer.performance_targets,
                 "component": "simworld",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.utcnow(),
                 "description": "SimWorld 仿真性能目標配置",
                 "target_descriptions": {
                     "sionna_computation_ms": "Sionna 無線通道計算時間目標",
@@ -452,12 +452,12 @@ async def run_simulation_benchmark():
                     ),
                 }
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content={
                 "benchmark_results": benchmark_results,
                 "target_comparison": comparison,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.utcnow(),
                 "summary": {
                     "total_metrics": len(benchmark_results),
                     "targets_met": sum(
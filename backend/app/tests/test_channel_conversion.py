@@ -0,0 +1,138 @@
+"""
+Test suite for channel-to-RAN conversion (single vs. batch, result cache)
+"""
+
+import asyncio
+
+import pytest
+
+from app.domains.wireless.models.channel_models import (
+    BatchChannelConversionRequest,
+    ChannelPathComponent,
+    SionnaChannelResponse,
+)
+from app.domains.wireless.services.channel_conversion_service import (
+    ChannelToRANConversionService,
+)
+
+
+def make_channel(channel_id="ch_0", distance_m=1000.0, power_db=0.0, bandwidth_hz=100e6):
+    """Build a two-path channel response at the given distance"""
+    return SionnaChannelResponse(
+        channel_id=channel_id,
+        tx_position=[0.0, 0.0, 30.0],
+        rx_position=[distance_m, 0.0, 1.5],
+        frequency_hz=3.5e9,
+        bandwidth_hz=bandwidth_hz,
+        path_loss_db=100.0,
+        paths=[
+            ChannelPathComponent(delay_ns=10.0, power_db=power_db, azimuth_deg=0.0, elevation_deg=0.0),
+            ChannelPathComponent(delay_ns=50.0, power_db=power_db - 3.0, azimuth_deg=30.0, elevation_deg=5.0),
+        ],
+    )
+
+
+def test_batch_matches_single_conversion():
+    """Batch conversion should produce the same RAN parameters as single conversion
+
+    One UE ID per channel, so the batch assigns every channel to gnb_1.
+    """
+    channels = [
+        make_channel(f"ch_{i}", distance_m=500.0 + 700.0 * i, power_db=-4.0 * i)
+        for i in range(4)
+    ]
+
+    async def run():
+        single = [
+            await ChannelToRANConversionService().convert_channel_to_ran(
+                channel, f"ue_{i}", "gnb_1"
+            )
+            for i, channel in enumerate(channels)
+        ]
+        batch = await ChannelToRANConversionService().batch_convert_channels(
+            BatchChannelConversionRequest(
+                batch_id="batch_test",
+                channels=channels,
+                target_ue_ids=[f"ue_{i}" for i in range(len(channels))],
+            )
+        )
+        return single, batch
+
+    single, batch = asyncio.run(run())
+
+    assert len(batch) == len(single)
+    for s, b in zip(single, batch):
+        assert b.ran_parameters.ue_id == s.ran_parameters.ue_id
+        assert b.ran_parameters.gnb_id == s.ran_parameters.gnb_id
+        assert b.ran_parameters.cqi == s.ran_parameters.cqi
+        for field in ("rsrp_dbm", "sinr_db", "rsrq_db", "throughput_mbps", "latency_ms", "error_rate"):
+            assert getattr(b.ran_parameters, field) == pytest.approx(
+                getattr(s.ran_parameters, field), rel=1e-6, abs=1e-9
+            ), field
+
+
+def test_batch_reports_failed_channels():
+    """Channels that cannot be converted are reported instead of silently dropped"""
+    failed = []
+
+    async def run():
+        return await ChannelToRANConversionService().batch_convert_channels(
+            BatchChannelConversionRequest(
+                batch_id="batch_test",
+                channels=[make_channel("ok"), make_channel("bad", bandwidth_hz=0.0)],
+                target_ue_ids=["ue_0"],
+            ),
+            failed_channel_ids=failed,
+        )
+
+    results = asyncio.run(run())
+
+    assert [r.source_channel.channel_id for r in results] == ["ok"]
+    assert failed == ["bad"]
+
+
+def test_batch_rejects_empty_target_ue_ids():
+    """Empty target_ue_ids with non-empty channels is a ValueError"""
+    request = BatchChannelConversionRequest(
+        batch_id="batch_test", channels=[make_channel()], target_ue_ids=[]
+    )
+    with pytest.raises(ValueError):
+        asyncio.run(ChannelToRANConversionService().batch_convert_channels(request))
+
+
+def test_cache_hit_for_identical_channel():
+    """Converting an identical channel twice reuses the cached result"""
+    service = ChannelToRANConversionService()
+
+    async def run():
+        first = await service.convert_channel_to_ran(make_channel(), "ue_0", "gnb_1")
+        second = await service.convert_channel_to_ran(make_channel(), "ue_0", "gnb_1")
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert service.cache_hits == 1
+    assert second.ran_parameters.rsrp_dbm == first.ran_parameters.rsrp_dbm
+
+
+def test_cache_invalidated_when_paths_change():
+    """A channel with the same ID but different geometry/paths must not hit the cache"""
+    service = ChannelToRANConversionService()
+    changed = make_channel(distance_m=20000.0, power_db=-20.0)
+
+    async def run():
+        await service.convert_channel_to_ran(make_channel(), "ue_0", "gnb_1")
+        cached_service_result = await service.convert_channel_to_ran(changed, "ue_0", "gnb_1")
+        fresh_result = await ChannelToRANConversionService().convert_channel_to_ran(
+            changed, "ue_0", "gnb_1"
+        )
+        return cached_service_result, fresh_result
+
+    cached_service_result, fresh_result = asyncio.run(run())
+
+    assert service.cache_hits == 0
+    assert service.cache_misses == 2
+    for field in ("rsrp_dbm", "sinr_db", "latency_ms"):
+        assert getattr(cached_service_result.ran_parameters, field) == pytest.approx(
+            getattr(fresh_result.ran_parameters, field)
+        ), field
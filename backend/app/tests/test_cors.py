@@ -0,0 +1,91 @@
+"""
+Test suite for the FastCORS middleware
+"""
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.cors import FastCORS
+
+ALLOWED_ORIGIN = "http://localhost:5173"
+
+
+def homepage(request):
+    return PlainTextResponse("ok", headers={"X-Failed-Channel-Count": "0"})
+
+
+@pytest.fixture
+def client():
+    app = Starlette(routes=[Route("/", homepage, methods=["GET", "POST"])])
+    return TestClient(
+        FastCORS(
+            app,
+            allow_origins=[ALLOWED_ORIGIN],
+            expose_headers=["X-Failed-Channel-Count"],
+        )
+    )
+
+
+def test_preflight_allowed_origin(client):
+    """Preflight from an allowed origin is answered directly with CORS headers"""
+    response = client.options(
+        "/",
+        headers={
+            "Origin": ALLOWED_ORIGIN,
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "content-type, x-custom",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == ALLOWED_ORIGIN
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert "POST" in response.headers["access-control-allow-methods"]
+    assert response.headers["access-control-allow-headers"] == "content-type, x-custom"
+    assert response.headers["vary"] == "Origin"
+
+
+def test_preflight_disallowed_origin(client):
+    """Preflight from an unknown origin is rejected without allow-origin"""
+    response = client.options(
+        "/",
+        headers={
+            "Origin": "http://evil.example",
+            "Access-Control-Request-Method": "POST",
+        },
+    )
+
+    assert response.status_code == 400
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_simple_request_allowed_origin(client):
+    """Simple requests from an allowed origin get CORS and expose headers appended"""
+    response = client.get("/", headers={"Origin": ALLOWED_ORIGIN})
+
+    assert response.status_code == 200
+    assert response.text == "ok"
+    assert response.headers["access-control-allow-origin"] == ALLOWED_ORIGIN
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["access-control-expose-headers"] == "X-Failed-Channel-Count"
+    assert response.headers["vary"] == "Origin"
+
+
+def test_simple_request_disallowed_origin(client):
+    """Simple requests from an unknown origin pass through without CORS headers"""
+    response = client.get("/", headers={"Origin": "http://evil.example"})
+
+    assert response.status_code == 200
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_request_without_origin(client):
+    """Same-origin requests are untouched"""
+    response = client.get("/")
+
+    assert response.status_code == 200
+    assert "access-control-allow-origin" not in response.headers
+    assert "vary" not in response.headers
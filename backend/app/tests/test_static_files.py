@@ -0,0 +1,111 @@
+"""
+Test suite for the /rendered_images and /static file routes
+"""
+
+import gzip
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import static_files
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Serve both routes from temporary directories"""
+    rendered_root = tmp_path / "rendered_images"
+    static_root = tmp_path / "static"
+    rendered_root.mkdir()
+    static_root.mkdir()
+    monkeypatch.setattr(static_files, "RENDERED_IMAGES_ROOT", os.path.realpath(rendered_root))
+    monkeypatch.setattr(static_files, "STATIC_ROOT", os.path.realpath(static_root))
+
+    app = FastAPI()
+    app.include_router(static_files.router)
+    test_client = TestClient(app)
+    test_client.rendered_root = rendered_root
+    test_client.static_root = static_root
+    return test_client
+
+
+def test_rendered_image_etag_and_304(client):
+    """A matching If-None-Match returns 304 without a body"""
+    (client.rendered_root / "map.png").write_bytes(b"png-data")
+
+    response = client.get("/rendered_images/map.png")
+    assert response.status_code == 200
+    assert response.content == b"png-data"
+    assert response.headers["content-type"] == "image/png"
+    etag = response.headers["etag"]
+
+    response = client.get("/rendered_images/map.png", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_rendered_image_changes_after_overwrite(client):
+    """Overwriting a file changes its ETag and the cached content is not served"""
+    image = client.rendered_root / "map.png"
+    image.write_bytes(b"old")
+    first = client.get("/rendered_images/map.png")
+
+    image.write_bytes(b"new-content")
+    second = client.get("/rendered_images/map.png", headers={"If-None-Match": first.headers["etag"]})
+
+    assert second.status_code == 200
+    assert second.content == b"new-content"
+    assert second.headers["etag"] != first.headers["etag"]
+
+
+def test_rendered_image_rejects_path_traversal(client, tmp_path):
+    """Paths that resolve outside the root are 404"""
+    (tmp_path / "secret.txt").write_text("secret")
+
+    assert client.get("/rendered_images/%2e%2e/secret.txt").status_code == 404
+    assert client.get("/rendered_images/missing.png").status_code == 404
+
+
+def test_static_prefers_brotli_then_gzip(client):
+    """Precompressed siblings are selected by Accept-Encoding preference
+
+    HEAD is used so the test client does not try to decode the fake payloads.
+    """
+    (client.static_root / "app.js").write_bytes(b"plain")
+    (client.static_root / "app.js.gz").write_bytes(b"gzip-bytes")
+    (client.static_root / "app.js.br").write_bytes(b"brotli-bytes")
+
+    response = client.head("/static/app.js", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["content-length"] == str(len(b"brotli-bytes"))
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert "javascript" in response.headers["content-type"]
+
+    response = client.head("/static/app.js", headers={"Accept-Encoding": "gzip, br;q=0"})
+    assert response.headers["content-encoding"] == "gzip"
+
+    response = client.get("/static/app.js", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.content == b"plain"
+
+
+def test_static_gzip_body_and_etag(client):
+    """The gzip sibling is sent as-is, with its own ETag that supports 304"""
+    (client.static_root / "app.css").write_bytes(b"body{}")
+    (client.static_root / "app.css.gz").write_bytes(gzip.compress(b"body{}"))
+
+    plain = client.get("/static/app.css", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/static/app.css", headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.content == b"body{}"
+    assert "text/css" in gzipped.headers["content-type"]
+    assert plain.headers["etag"] != gzipped.headers["etag"]
+
+    response = client.get(
+        "/static/app.css",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["etag"]},
+    )
+    assert response.status_code == 304
+    assert response.headers["content-encoding"] == "gzip"
@@ -0,0 +1,33 @@
+# backend/gunicorn.conf.py
+# 生產環境入口：gunicorn 管理多個 UvicornWorker 行程
+# 使用方式：gunicorn -c gunicorn.conf.py app.main:app  (或 ./start.sh)
+
+import os
+import subprocess
+import sys
+
+# 每個 worker 都會執行完整的 lifespan 並載入 TensorFlow/Sionna，GPU 記憶體
+# 與記憶體快取 (每 worker 64 MiB) 隨 worker 數倍增，因此預設只用 1 個 worker；
+# 確認資源足夠後再以 WEB_CONCURRENCY 調高
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = os.getenv("BIND", "0.0.0.0:8000")
+
+# 關閉 access log，錯誤日誌輸出到 stderr
+accesslog = None
+errorlog = "-"
+
+# 模擬請求可能耗時數秒，避免被當成卡住的 worker 重啟
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+
+def on_starting(server):
+    """在 fork worker 前於獨立行程執行一次資料庫初始化 (建表、種子資料、TLE 同步)
+
+    以子行程執行，master 不載入應用程式、也不持有資料庫連線；
+    完成後設定環境變數 (由 worker 繼承)，各 worker 的 lifespan 即略過初始化。
+    """
+    subprocess.run([sys.executable, "-m", "app.db.init_db"], check=True)
+    os.environ["SIMWORLD_DB_INIT_DONE"] = "1"
@@ -0,0 +1,46 @@
+#!/usr/bin/env bash
+# backend/start.sh
+# 生產環境啟動腳本
+#
+#   ./start.sh                 gunicorn + UvicornWorker (設定見 gunicorn.conf.py)
+#   ./start.sh --no-gunicorn   啟動 N (WEB_CONCURRENCY，預設 1) 個獨立 uvicorn 行程 (埠號 BASE_PORT..BASE_PORT+N-1)，
+#                              由 nginx upstream 分流；gunicorn 分配請求不均時使用
+#
+# --no-gunicorn 搭配的 nginx 設定範例 (N=3)：
+#   upstream simworld_backend {
+#       least_conn;
+#       server 127.0.0.1:8000;
+#       server 127.0.0.1:8001;
+#       server 127.0.0.1:8002;
+#   }
+set -euo pipefail
+
+cd "$(dirname "$0")"
+
+if [[ "${1:-}" != "--no-gunicorn" ]]; then
+    exec gunicorn -c gunicorn.conf.py app.main:app
+fi
+
+# 資料庫初始化只在啟動 uvicorn 行程前執行一次，各行程的 lifespan 略過
+python -m app.db.init_db
+export SIMWORLD_DB_INIT_DONE=1
+
+# 每個行程都載入 TensorFlow/Sionna，預設只啟動 1 個
+WORKERS="${WEB_CONCURRENCY:-1}"
+BASE_PORT="${BASE_PORT:-8000}"
+pids=()
+
+# 任一行程結束或收到訊號時，一併停止其他行程
+trap 'kill "${pids[@]}" 2>/dev/null || true' EXIT INT TERM
+
+for (( i = 0; i < WORKERS; i++ )); do
+    uvicorn app.main:app \
+        --host 127.0.0.1 \
+        --port $(( BASE_PORT + i )) \
+        --loop uvloop \
+        --http httptools \
+        --no-access-log &
+    pids+=("$!")
+done
+
+wait -n